@@ -0,0 +1,40 @@
+/* ========================================
+   COLUMNAR (V2) ELECTION DATA DECODER
+   ========================================
+   Decodes elections.v2.json (see scripts/columnar_export.py) back into the same
+   { lastUpdated, electionData, indexes } object as elections.json. Tables are
+   stored as parallel columns; repeated values are dictionary-encoded.
+*/
+
+const ColumnarData = (function () {
+  function decodeColumn(column) {
+    if (column.values) return column.values;
+    if (column.dict) return column.codes.map(code => column.dict[code]);
+    const nested = decodeTable(column.table);
+    let start = 0;
+    return column.counts.map(count => nested.slice(start, (start += count)));
+  }
+
+  function decodeTable(table) {
+    const columns = {};
+    const cursors = {};
+    for (const [key, column] of Object.entries(table.columns)) {
+      columns[key] = decodeColumn(column);
+      cursors[key] = 0;
+    }
+    return decodeColumn(table.shape).map(shape => {
+      const row = {};
+      for (const key of table.shapes[shape]) row[key] = columns[key][cursors[key]++];
+      return row;
+    });
+  }
+
+  function decode(doc) {
+    if (doc.format !== 2) throw new Error(`Unsupported election data format: ${doc.format}`);
+    const electionData = {};
+    decodeTable(doc.states).forEach((state, i) => { electionData[doc.codes[i]] = state; });
+    return { lastUpdated: doc.lastUpdated, cycle: doc.cycle, electionData, indexes: doc.indexes };
+  }
+
+  return { decode };
+})();
@@ -42,11 +42,50 @@ $(function () {
   // LOAD ELECTION DATA
   // ========================================
   // Fetches elections.json and builds the map
-  // Add timestamp to prevent caching of JSON file
-  fetch(`elections.json?v=${Date.now()}`)
+  const pageParams = new URLSearchParams(window.location.search);
+  // Add ?format=v2 to the page URL to load the columnar elections.v2.json instead
+  const useColumnar = pageParams.get('format') === 'v2';
+  // Only the current cycle is loaded by default; ?cycle=2025 shows an earlier one (listed in cycles.json)
+  const requestedCycle = pageParams.get('cycle');
+  let archivedCycle = null;
+  const cycleLookup = requestedCycle
+    ? fetch('cycles.json')
+        .then(r => r.json())
+        .then(manifest => manifest.cycles.find(c => c.id === requestedCycle && c.id !== manifest.current) || null)
+        .catch(() => null)
+    : Promise.resolve(null);
+
+  cycleLookup
+    .then(cycle => {
+      archivedCycle = cycle;
+      const dataFile = cycle ? cycle.data : 'elections.json';
+      if (cycle && typeof ElectionSearch !== 'undefined') ElectionSearch.setBase(cycle.search);
+      // Add timestamp to prevent caching of JSON file
+      return fetch(`${useColumnar ? dataFile.replace(/\.json$/, '.v2.json') : dataFile}?v=${Date.now()}`);
+    })
     .then(r => r.json())
+    .then(raw => (useColumnar ? ColumnarData.decode(raw) : raw))
     .then(data => {
       const electionData = data.electionData || {};
+      // Lookups precomputed by the build (scripts/indexes.py); older data has none
+      const indexes = data.indexes || {};
+      // Cycle the data belongs to (scripts/cycles.py); hand-edited data may not say
+      const cycleInfo = data.cycle || archivedCycle || {};
+      // Calendar feeds precomputed by the build (scripts/calendar_feeds.py); states listed in
+      // their manifest get an "Add to Calendar" link. Cycles published before feeds existed have none
+      const calendarBase = archivedCycle ? archivedCycle.calendar : 'calendar/';
+      let calendarStates = {};
+      if (calendarBase) {
+        fetch(`${calendarBase}manifest.json`)
+          .then(r => (r.ok ? r.json() : {}))
+          .then(manifest => { calendarStates = manifest.states || {}; })
+          .catch(() => {});
+      }
+
+      if (archivedCycle) {
+        $('header h1').text(`Elections to Watch: ${archivedCycle.label}`);
+        document.title = `EVC Elections to Watch: ${archivedCycle.label}`;
+      }
 
       // Stats are calculated after csvElectionData is defined (see STATE COLORS section below)
       
@@ -61,9 +100,9 @@ $(function () {
          2. States are colored based on whether they have elections
          3. You can add more complex logic (e.g., color by election type)
       */
-      // General election data per state from CSV
+      // General election data per state from CSV, for the current cycle
       // senate/gov/court = 1 or 0 | reg = registration deadline | primaryDate | generalDate
-      const csvElectionData = {
+      const currentCycleCsv = {
         AL: { senate:1, gov:1, court:0, reg:'2026-06-01', primaryDate:'2026-05-19', generalDate:'2026-11-03' },
         AK: { senate:1, gov:1, court:0, reg:'2026-07-19', primaryDate:'2026-08-18', generalDate:'2026-11-03' },
         AZ: { senate:0, gov:1, court:0, reg:'2026-06-22', primaryDate:'2026-07-21', generalDate:'2026-11-03' },
@@ -115,6 +154,19 @@ $(function () {
         WI: { senate:0, gov:1, court:1, reg:'2026-07-20', primaryDate:'2026-08-11', generalDate:'2026-11-03' },
         WY: { senate:1, gov:1, court:0, reg:'2026-08-04', primaryDate:'2026-08-18', generalDate:'2026-11-03' }
       };
+      // Earlier cycles only use their own published data
+      const csvElectionData = archivedCycle ? {} : currentCycleCsv;
+
+      // General election type labels per state, built once for the tooltip
+      // (from indexes.byType when available, otherwise from the CSV data above)
+      const typeLabels = { Senate: 'Senate', Governor: 'Gubernatorial', Court: 'Court' };
+      const csvTypeKeys = { Senate: 'senate', Governor: 'gov', Court: 'court' };
+      const generalTypesByState = {};
+      Object.keys(typeLabels).forEach(type => {
+        const codes = indexes.byType?.[type] ||
+          Object.keys(csvElectionData).filter(abbr => csvElectionData[abbr][csvTypeKeys[type]]);
+        codes.forEach(abbr => (generalTypesByState[abbr] = generalTypesByState[abbr] || []).push(typeLabels[type]));
+      });
 
       // ========================================
       // CALCULATE SUMMARY STATISTICS (from CSV general election data)
@@ -134,23 +186,39 @@ $(function () {
       setTimeout(() => animateNumber($('#sum-state'),     csvGov,     1000), 300);
       setTimeout(() => animateNumber($('#sum-federal'),   csvCourt,   1000), 400);
 
-      // Format YYYY-MM-DD → "Mon D, YYYY"; handles the same-day special value
+      // Format YYYY-MM-DD → "Mon D, YYYY"; handles the same-day special value.
+      // Results are memoized since the same few dates are formatted over and over.
+      const fmtDateCache = new Map();
       function fmtDate(d) {
         if (!d) return '—';
-        if (d === 'same-day') return 'Same-day registration';
-        const months = ['Jan','Feb','Mar','Apr','May','Jun','Jul','Aug','Sep','Oct','Nov','Dec'];
-        const [y, m, day] = d.split('-');
-        if (!y || !m || !day) return d;
-        return `${months[+m - 1]} ${+day}, ${y}`;
+        if (fmtDateCache.has(d)) return fmtDateCache.get(d);
+        let formatted = d;
+        if (d === 'same-day') {
+          formatted = 'Same-day registration';
+        } else {
+          const months = ['Jan','Feb','Mar','Apr','May','Jun','Jul','Aug','Sep','Oct','Nov','Dec'];
+          const [y, m, day] = d.split('-');
+          if (y && m && day) formatted = `${months[+m - 1]} ${+day}, ${y}`;
+        }
+        fmtDateCache.set(d, formatted);
+        return formatted;
+      }
+
+      // Prefer the display strings precomputed by the build (elections.json keyDates);
+      // fall back to formatting the CSV value for data built before keyDates existed
+      function keyDate(abbr, key, csvValue) {
+        const precomputed = electionData[abbr]?.keyDates?.[key]?.display;
+        return precomputed || fmtDate(csvValue);
       }
 
       // Builds the "Key Dates" registration block shared across modal branches
       function buildDatesSection(stateAbbr, stateData) {
         const csv = csvElectionData[stateAbbr] || {};
-        const regDeadline = fmtDate(csv.reg) || stateData?.registrationDeadline || '—';
-        const primaryDate  = fmtDate(csv.primaryDate);
-        const generalDate  = fmtDate(csv.generalDate);
-        const hasButtons   = stateData?.registrationWebsite || stateData?.electionInfoUrl;
+        const regDeadline = keyDate(stateAbbr, 'registrationDeadline', csv.reg) || stateData?.registrationDeadline || '—';
+        const primaryDate  = keyDate(stateAbbr, 'primary', csv.primaryDate);
+        const generalDate  = keyDate(stateAbbr, 'general', csv.generalDate);
+        const calendarFeed = calendarStates[stateAbbr] ? `${calendarBase}${stateAbbr}.ics` : '';
+        const hasButtons   = stateData?.registrationWebsite || stateData?.electionInfoUrl || calendarFeed;
         return `
           <div class="registration-info">
             <h4 style="margin: 0 0 0.75rem; font-size: 1rem; color: var(--berkeley-blue);">Key Dates</h4>
@@ -173,6 +241,7 @@ $(function () {
             ${hasButtons ? `<div style="display: flex; flex-wrap: wrap; gap: 0.5rem;">
               ${stateData?.registrationWebsite ? `<a href="${stateData.registrationWebsite}" target="_blank" rel="noopener" class="register-button">Register to Vote →</a>` : ''}
               ${stateData?.electionInfoUrl ? `<a href="${stateData.electionInfoUrl}" target="_blank" rel="noopener" class="register-button" style="background: white; color: var(--cerulean); border: 2px solid var(--cerulean);">More Election Info</a>` : ''}
+              ${calendarFeed ? `<a href="${calendarFeed}" download class="register-button" style="background: white; color: var(--cerulean); border: 2px solid var(--cerulean);">Add to Calendar</a>` : ''}
             </div>` : ''}
           </div>
         `;
@@ -284,11 +353,7 @@ $(function () {
           const s = electionData[data.name];
           let html = `<strong>${s ? s.stateName : data.name}</strong><br/>`;
           
-          const csv = csvElectionData[data.name] || { senate: 0, gov: 0, court: 0 };
-          const generalTypes = [];
-          if (csv.senate) generalTypes.push('Senate');
-          if (csv.gov) generalTypes.push('Gubernatorial');
-          if (csv.court) generalTypes.push('Court');
+          const generalTypes = generalTypesByState[data.name] || [];
 
           if (generalTypes.length > 0) {
             html += `<strong>${generalTypes.length} General Election${generalTypes.length !== 1 ? 's' : ''}</strong><br/>`;
@@ -335,7 +400,7 @@ $(function () {
       // Builds general election cards from CSV data for a state abbreviation
       function buildGeneralElectionCards(abbr) {
         const csv = csvElectionData[abbr] || { senate: 0, gov: 0, court: 0 };
-        const displayDate = fmtDate(csv.generalDate) || 'November 3, 2026';
+        const displayDate = keyDate(abbr, 'general', csv.generalDate) || cycleInfo.electionDay || '';
         const generalElections = [];
         if (csv.senate) generalElections.push({ title: 'U.S. Senate', badge: 'Senate', badgeStyle: 'background: linear-gradient(135deg, #2b7fc1, #03254c); color: white;' });
         if (csv.gov)    generalElections.push({ title: 'Governor', badge: 'Gubernatorial', badgeStyle: 'background: linear-gradient(135deg, #457b9d, #1d3557); color: white;' });
@@ -441,7 +506,7 @@ $(function () {
                       <span style="font-size: 1rem;">📅</span>
                       <div>
                         <span style="font-size: 0.7rem; text-transform: uppercase; font-weight: 600; color: var(--cerulean); letter-spacing: 0.05em;">Date</span>
-                        <p style="margin: 0; font-weight: 600; color: var(--berkeley-blue); font-size: 0.9rem;">${e.date}</p>
+                        <p style="margin: 0; font-weight: 600; color: var(--berkeley-blue); font-size: 0.9rem;">${e.dateDisplay || e.date}</p>
                       </div>
                     </div>
                     
@@ -508,7 +573,7 @@ $(function () {
                     <span style="font-size: 1rem;">📅</span>
                     <div>
                       <span style="font-size: 0.7rem; text-transform: uppercase; font-weight: 600; color: var(--cerulean); letter-spacing: 0.05em;">Date</span>
-                      <p style="margin: 0; font-weight: 600; color: var(--berkeley-blue); font-size: 0.9rem;">${e.date}</p>
+                      <p style="margin: 0; font-weight: 600; color: var(--berkeley-blue); font-size: 0.9rem;">${e.dateDisplay || e.date}</p>
                     </div>
                   </div>
                   
@@ -578,27 +643,25 @@ $(function () {
         const list = $('#modal-elections-list');
         list.empty();
 
-        // Build list of matching states from CSV data
-        const matchingStates = [];
-        for (const [abbr, csv] of Object.entries(csvElectionData)) {
-          const hasType = filterType === 'Senate'   ? csv.senate :
-                          filterType === 'Governor' ? csv.gov    :
-                          filterType === 'Court'    ? csv.court  : 0;
-          if (!hasType) continue;
-
+        // Matching state codes come presorted by name from indexes.byType;
+        // without it, scan the CSV data and sort by name here
+        const indexed = indexes.byType?.[filterType];
+        const codes = indexed || Object.keys(csvElectionData).filter(abbr => csvElectionData[abbr][csvTypeKeys[filterType]]);
+        const matchingStates = codes.map(abbr => {
+          const csv = csvElectionData[abbr] || {};
           const stateInfo = electionData[abbr];
-          matchingStates.push({
+          return {
             code: abbr,
             name: stateInfo ? stateInfo.stateName : abbr,
-            regDeadline: fmtDate(csv.reg),
-            primaryDate: fmtDate(csv.primaryDate),
-            generalDate: fmtDate(csv.generalDate),
+            regDeadline: keyDate(abbr, 'registrationDeadline', csv.reg),
+            primaryDate: keyDate(abbr, 'primary', csv.primaryDate),
+            generalDate: keyDate(abbr, 'general', csv.generalDate),
             registrationWebsite: stateInfo?.registrationWebsite,
             electionInfoUrl:     stateInfo?.electionInfoUrl
-          });
-        }
+          };
+        });
 
-        matchingStates.sort((a, b) => a.name.localeCompare(b.name));
+        if (!indexed) matchingStates.sort((a, b) => a.name.localeCompare(b.name));
 
         if (matchingStates.length === 0) {
           list.append('<p class="no-elections-message">No states currently have this type of election.</p>');
@@ -655,6 +718,46 @@ $(function () {
           showFilteredStates(filterType);
         }
       });
+
+      /* ========================================
+         SEARCH BOX
+         ========================================
+         Looks up candidates, offices and places in the prebuilt index (search.js)
+      */
+      const searchInput = $('#search-input');
+      const searchResults = $('#search-results');
+      let searchTimer = null;
+      let searchSeq = 0;
+
+      function openSearchResult(result) {
+        const s = electionData[result.state];
+        searchResults.attr('hidden', '');
+        openModal(s ? s.stateName : result.state, s, result.state);
+      }
+
+      searchInput.on('input', function () {
+        clearTimeout(searchTimer);
+        const query = this.value;
+        searchTimer = setTimeout(async () => {
+          const seq = ++searchSeq;
+          const results = typeof ElectionSearch !== 'undefined' ? await ElectionSearch.search(query) : [];
+          if (seq !== searchSeq) return;  // A newer query has already answered
+
+          searchResults.empty();
+          if (results.length === 0) {
+            searchResults.attr('hidden', '');
+            return;
+          }
+          results.forEach(result => {
+            $('<li role="option" tabindex="0"></li>')
+              .text(result.label)
+              .on('click', () => openSearchResult(result))
+              .on('keydown', e => { if (e.key === 'Enter') openSearchResult(result); })
+              .appendTo(searchResults);
+          });
+          searchResults.removeAttr('hidden');
+        }, 150);
+      });
     })
     .catch(() => console.error('Failed to load election data.'));
 });
@@ -0,0 +1,78 @@
+/* ========================================
+   ELECTION SEARCH CLIENT
+   ========================================
+   Queries the prebuilt search index in search/ (see scripts/search_index.py).
+   Only the manifest, the document table and the shard for each typed word are
+   downloaded, and each file is fetched at most once per page load.
+*/
+
+const ElectionSearch = (function () {
+  // Index directory of the cycle being shown (see scripts/cycles.py)
+  let base = 'search/';
+  const files = new Map();
+  // Must match STOP_WORDS in scripts/search_index.py
+  const stopWords = new Set(['and', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'a', 'an', 'at', 'by', 'is', 's']);
+
+  // Fetch a JSON file from the index directory once and reuse the promise
+  function load(name) {
+    if (!files.has(name)) {
+      files.set(name, fetch(`${base}${name}`).then(r => (r.ok ? r.json() : null)).catch(() => null));
+    }
+    return files.get(name);
+  }
+
+  // Same tokenization as the Python builder: lowercase, no accents, letters/digits
+  function tokenize(text) {
+    return (text || '')
+      .normalize('NFKD').replace(/[\u0300-\u036f]/g, '')
+      .toLowerCase()
+      .match(/[a-z0-9]+/g) || [];
+  }
+
+  // Doc ids for every indexed word starting with term (prefix search)
+  async function lookup(term, manifest) {
+    const prefix = term.slice(0, manifest.prefixLength);
+    if (!manifest.shards.includes(prefix)) return new Set();
+    const shard = await load(`${prefix}.json`) || {};
+    const ids = new Set();
+    for (const [token, postings] of Object.entries(shard)) {
+      if (token.startsWith(term)) postings.forEach(id => ids.add(id));
+    }
+    return ids;
+  }
+
+  /**
+   * Search the index.
+   * Every word must match (as a prefix of an indexed word).
+   * Resolves to [{ state, election, label }] where election is the index into
+   * electionData[state].elections, or -1 for the state itself.
+   */
+  async function search(query, limit = 20) {
+    const manifest = await load('manifest.json');
+    if (!manifest) return [];
+    const terms = tokenize(query).filter(t => t.length >= manifest.prefixLength && !stopWords.has(t));
+    if (terms.length === 0) return [];
+
+    const [docs, ...matches] = await Promise.all([load('docs.json'), ...terms.map(t => lookup(t, manifest))]);
+    if (!docs) return [];
+
+    matches.sort((a, b) => a.size - b.size);
+    const results = [];
+    for (const id of [...matches[0]].sort((a, b) => a - b)) {
+      if (matches.every(m => m.has(id))) {
+        const [state, election, label] = docs[id];
+        results.push({ state, election, label });
+        if (results.length >= limit) break;
+      }
+    }
+    return results;
+  }
+
+  // Switch to another cycle's index, e.g. 'cycles/2025/search/'
+  function setBase(path) {
+    base = path;
+    files.clear();
+  }
+
+  return { search, tokenize, setBase };
+})();
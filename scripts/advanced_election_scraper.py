@@ -10,56 +10,62 @@ Comprehensive scraper that gathers election data from multiple sources including
 
 import json
 import time
-import re
 import csv
-import requests
+import queue
+import threading
 from datetime import datetime, timedelta
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from bs4 import BeautifulSoup
+from pathlib import Path
 import logging
 
+from cycles import get_cycle, in_cycle, latest_input, publish_targets
+from run_metrics import RunMetrics
+from election_model import StateRecord, to_json
+from election_records import RecordWriter, merge_election_data, merge_records, read_records
+from page_parsers import parse_house_races_wikitext, parse_senate_races_wikitext
+from sharding import Shard, merge_shards
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+BASE_DIR = Path(__file__).parent.parent
+
+# Records are appended here as they are scraped, so a failed run keeps its partial results
+PARTIAL_OUTPUT = BASE_DIR / ".cache" / "partial" / "advanced_scraper.jsonl"
+
+# Sources in the order their records are merged (see merge_shard_results)
+SOURCE_ORDER = ["ballotpedia_senate", "ballotpedia_house"]
+
+# Time budget in seconds for each independent source when scraped concurrently
+SOURCE_TIMEOUTS = {
+    "ballotpedia_senate": 300,
+    "ballotpedia_house": 300,
+}
+
 class AdvancedElectionScraper:
-    def __init__(self, headless=True, logistics_csv=None):
-        """Initialize the advanced scraper."""
-        if logistics_csv is None:
-            from pathlib import Path
-            base_dir = Path(__file__).parent.parent
-            logistics_csv = base_dir / "data" / "2025 Off-Year Elections - Logistics.csv"
-        self.logistics_csv = logistics_csv
-        self.setup_driver(headless)
-        self.setup_data_sources()
-        self.load_logistics_data()
+    def __init__(self, logistics_csv=None, ballotpedia_api_url=None, cycle=None, shard=None):
+        """Initialize the advanced scraper.
         
-    def setup_driver(self, headless=True):
-        """Set up Chrome WebDriver with proper configuration."""
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
+        Every source is read through the Ballotpedia MediaWiki API, so no browser is used.
         
-        try:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.wait = WebDriverWait(self.driver, 15)
-            logger.info("Chrome WebDriver initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Chrome WebDriver: {e}")
-            raise
+        Args:
+            logistics_csv: State websites and deadlines (default: the cycle's, or the latest declared)
+            ballotpedia_api_url: MediaWiki API endpoint (default: ballotpedia.org's)
+            cycle: Election cycle id from cycles.py (default: the current cycle)
+            shard: Shard of the run to scrape (see sharding.py; default: everything)
+        """
+        self.cycle = get_cycle(cycle)
+        self.shard = shard or Shard()
+        self.logistics_csv = logistics_csv or latest_input("logistics_csv", self.cycle)
+        self.ballotpedia_api_url = ballotpedia_api_url
+        self.metrics = RunMetrics("advanced_scraper")
+        self.setup_data_sources()
+        self.load_logistics_data()
+
+    def new_client(self):
+        """Open a Ballotpedia API session, e.g. for one concurrently scraped source."""
+        from ballotpedia_api import API_URL, BallotpediaClient
+        return BallotpediaClient(api_url=self.ballotpedia_api_url or API_URL)
 
     def setup_data_sources(self):
         """Set up data sources and mappings."""
@@ -218,197 +224,85 @@ class AdvancedElectionScraper:
             logger.error(f"Error loading logistics data from CSV: {e}")
             logger.warning("Using hardcoded registration sites")
 
-    def scrape_ballotpedia_senate_races(self):
+    def scrape_ballotpedia_senate_races(self, client=None):
         """Scrape Senate race information from Ballotpedia."""
-        logger.info("Scraping Ballotpedia Senate races...")
-        
-        try:
-            self.driver.get("https://ballotpedia.org/United_States_Senate_elections,_2025")
-            time.sleep(3)
-            
-            senate_races = {}
-            
-            # Look for state-specific Senate race information
-            race_elements = self.driver.find_elements(By.XPATH, "//h3[contains(@id, '2024') or contains(text(), '2024')]")
-            
-            for element in race_elements[:10]:  # Limit for testing
-                try:
-                    state_text = element.text
-                    if "2024" in state_text:
-                        # Extract state name
-                        state_name = state_text.replace(" 2024", "").strip()
-                        state_code = self.get_state_code_by_name(state_name)
-                        
-                        if state_code:
-                            logger.info(f"Processing Senate race for {state_name}")
-                            
-                            # Get candidate information from the following content
-                            candidates = self.extract_senate_candidates(element)
-                            
-                            if candidates:
-                                election = {
-                                    "title": "U.S. Senate",
-                                    "date": "November 5, 2024",
-                                    "type": "General Election",
-                                    "candidates": candidates,
-                                    "stakes": f"Critical Senate race in {state_name} that could determine Senate control",
-                                    "chamberImpact": "Senate",
-                                    "competitive": True
-                                }
-                                
-                                senate_races[state_code] = {
-                                    "stateName": self.states[state_code]["name"],
-                                    "registrationWebsite": self.registration_sites.get(state_code, ""),
-                                    "registrationDeadline": self.calculate_registration_deadline(state_code),
-                                    "elections": [election]
-                                }
-                                
-                except Exception as e:
-                    logger.error(f"Error processing Senate race element: {e}")
-                    continue
-            
-            return senate_races
-            
-        except Exception as e:
-            logger.error(f"Error scraping Ballotpedia Senate races: {e}")
-            return {}
+        return merge_records(self.iter_ballotpedia_senate_races(client))
+
+    def iter_ballotpedia_senate_races(self, client=None):
+        """Yield (state_code, record) for each Ballotpedia Senate race on the overview page.
 
-    def extract_senate_candidates(self, element):
-        """Extract candidate information from a Senate race element."""
-        candidates = []
+        Errors propagate, so iter_election_data and queued jobs see the source fail.
+        """
+        logger.info("Scraping Ballotpedia Senate races...")
         
+        own_client = client is None
+        client = client or self.new_client()
         try:
-            # Look for candidate information in the following siblings
-            next_elements = element.find_elements(By.XPATH, "./following-sibling::*")
-            
-            for next_elem in next_elements[:5]:
-                text = next_elem.text
+            wikitext = client.page_wikitext([f"United States Senate elections, {self.cycle['year']}"])
+            for state_code, candidates in parse_senate_races_wikitext(
+                    "".join(wikitext.values()), self.state_codes_by_name()):
+                state_name = self.states[state_code]["name"]
+                logger.info(f"Processing Senate race for {state_name}")
                 
-                # Look for candidate patterns
-                candidate_patterns = [
-                    r'([A-Z][a-z]+ [A-Z][a-z]+(?: [A-Z][a-z]+)?)\s*\(([RDIG])\)',
-                    r'([A-Z][a-z]+ [A-Z][a-z]+(?: [A-Z][a-z]+)?)\s*-\s*([RDIG])',
-                ]
-                
-                for pattern in candidate_patterns:
-                    matches = re.findall(pattern, text)
-                    for name, party in matches:
-                        party_full = {
-                            'R': 'Republican',
-                            'D': 'Democratic',
-                            'I': 'Independent',
-                            'G': 'Green'
-                        }.get(party, party)
-                        
-                        candidates.append({
-                            "name": name.strip(),
-                            "party": party_full,
-                            "incumbent": "incumbent" in text.lower() or "re-election" in text.lower()
-                        })
-                
-                if candidates:
-                    break
-                    
-        except Exception as e:
-            logger.error(f"Error extracting Senate candidates: {e}")
-        
-        return candidates
+                election = {
+                    "title": "U.S. Senate",
+                    "date": self.cycle["electionDay"],
+                    "type": "General Election",
+                    "candidates": candidates,
+                    "stakes": f"Critical Senate race in {state_name} that could determine Senate control",
+                    "chamberImpact": "Senate",
+                    "competitive": True
+                }
+                yield state_code, self.state_record(state_code, election)
+        finally:
+            if own_client:
+                client.close()
 
-    def scrape_competitive_house_races(self):
-        """Scrape competitive House race information."""
-        logger.info("Scraping competitive House races...")
-        
-        try:
-            self.driver.get("https://ballotpedia.org/United_States_House_of_Representatives_elections,_2025")
-            time.sleep(3)
-            
-            house_races = {}
-            
-            # Look for competitive race indicators
-            competitive_elements = self.driver.find_elements(By.XPATH, "//span[contains(@class, 'competitive') or contains(text(), 'Competitive')]")
-            
-            for element in competitive_elements[:5]:  # Limit for testing
-                try:
-                    # Find the parent race information
-                    race_info = element.find_element(By.XPATH, "./ancestor::tr | ./ancestor::div[contains(@class, 'race')]")
-                    
-                    # Extract state and district information
-                    text = race_info.text
-                    
-                    # Look for state and district patterns
-                    state_match = re.search(r'([A-Z]{2})', text)
-                    district_match = re.search(r'District (\d+)', text)
-                    
-                    if state_match and district_match:
-                        state_code = state_match.group(1)
-                        district = district_match.group(1)
-                        
-                        candidates = self.extract_house_candidates(race_info)
-                        
-                        if candidates:
-                            election = {
-                                "title": f"U.S. House - District {district}",
-                                "date": "November 5, 2024",
-                                "type": "General Election",
-                                "candidates": candidates,
-                                "stakes": f"Competitive House race in {self.states[state_code]['name']} District {district}",
-                                "chamberImpact": "House",
-                                "competitive": True
-                            }
-                            
-                            if state_code not in house_races:
-                                house_races[state_code] = {
-                                    "stateName": self.states[state_code]["name"],
-                                    "registrationWebsite": self.registration_sites.get(state_code, ""),
-                                    "registrationDeadline": self.calculate_registration_deadline(state_code),
-                                    "elections": []
-                                }
-                            
-                            house_races[state_code]["elections"].append(election)
-                            
-                except Exception as e:
-                    logger.error(f"Error processing competitive House race: {e}")
-                    continue
-            
-            return house_races
-            
-        except Exception as e:
-            logger.error(f"Error scraping competitive House races: {e}")
-            return {}
+    def scrape_competitive_house_races(self, client=None):
+        """Scrape House race information."""
+        return merge_records(self.iter_competitive_house_races(client))
 
-    def extract_house_candidates(self, element):
-        """Extract candidate information from a House race element."""
-        candidates = []
+    def iter_competitive_house_races(self, client=None):
+        """Yield (state_code, record) for each House district race on the overview page.
+
+        Errors propagate, so iter_election_data and queued jobs see the source fail.
+        """
+        logger.info("Scraping House races...")
         
+        own_client = client is None
+        client = client or self.new_client()
         try:
-            text = element.text
-            
-            # Look for candidate patterns
-            candidate_patterns = [
-                r'([A-Z][a-z]+ [A-Z][a-z]+(?: [A-Z][a-z]+)?)\s*\(([RDIG])\)',
-                r'([A-Z][a-z]+ [A-Z][a-z]+(?: [A-Z][a-z]+)?)\s*-\s*([RDIG])',
-            ]
-            
-            for pattern in candidate_patterns:
-                matches = re.findall(pattern, text)
-                for name, party in matches:
-                    party_full = {
-                        'R': 'Republican',
-                        'D': 'Democratic',
-                        'I': 'Independent',
-                        'G': 'Green'
-                    }.get(party, party)
-                    
-                    candidates.append({
-                        "name": name.strip(),
-                        "party": party_full,
-                        "incumbent": "incumbent" in text.lower() or "re-election" in text.lower()
-                    })
-                    
-        except Exception as e:
-            logger.error(f"Error extracting House candidates: {e}")
-        
-        return candidates
+            wikitext = client.page_wikitext([f"United States House of Representatives elections, {self.cycle['year']}"])
+            for state_code, district, candidates, competitive in parse_house_races_wikitext(
+                    "".join(wikitext.values()), self.state_codes_by_name()):
+                state_name = self.states[state_code]["name"]
+                election = {
+                    "title": f"U.S. House - District {district}",
+                    "date": self.cycle["electionDay"],
+                    "type": "General Election",
+                    "candidates": candidates,
+                    "stakes": f"{'Competitive House' if competitive else 'House'} race in {state_name} District {district}",
+                    "chamberImpact": "House",
+                    "competitive": competitive
+                }
+                # One record per district; merging groups them by state
+                yield state_code, self.state_record(state_code, election)
+        finally:
+            if own_client:
+                client.close()
+
+    def state_record(self, state_code, election):
+        """Wrap one election in the per-state record used in elections.json."""
+        return StateRecord(
+            stateName=self.states[state_code]["name"],
+            registrationWebsite=self.registration_sites.get(state_code, ""),
+            registrationDeadline=self.calculate_registration_deadline(state_code),
+            elections=[election]
+        )
+
+    def state_codes_by_name(self):
+        """Map lowercase state names to state codes."""
+        return {info["name"].lower(): code for code, info in self.states.items()}
 
     def get_state_code_by_name(self, state_name):
         """Get state code by state name."""
@@ -419,44 +313,26 @@ class AdvancedElectionScraper:
 
     def calculate_registration_deadline(self, state_code=None):
         """Get registration deadline from CSV data or calculate default."""
-        if state_code and state_code in self.registration_deadlines:
+        # A logistics CSV carried over from an earlier cycle has stale deadlines
+        if state_code and in_cycle(self.cycle, self.registration_deadlines.get(state_code)):
             return self.registration_deadlines[state_code]
         
-        # Default calculation if not in CSV
-        election_date = datetime(2025, 11, 4)  # November 4, 2025
+        # Default calculation if not in CSV: 30 days before the cycle's election day
+        election_date = datetime.fromisoformat(self.cycle["electionDate"])
         deadline = election_date - timedelta(days=30)
         return deadline.strftime("%B %d, %Y")
 
     def merge_election_data(self, *data_sources):
         """Merge election data from multiple sources."""
-        merged_data = {}
-        
-        for data_source in data_sources:
-            for state_code, state_data in data_source.items():
-                if state_code not in merged_data:
-                    merged_data[state_code] = state_data
-                else:
-                    # Merge elections
-                    existing_elections = merged_data[state_code]["elections"]
-                    new_elections = state_data["elections"]
-                    
-                    # Add new elections that don't already exist
-                    for new_election in new_elections:
-                        if not any(existing["title"] == new_election["title"] for existing in existing_elections):
-                            existing_elections.append(new_election)
-        
-        return merged_data
+        return merge_election_data(*data_sources)
 
     def update_elections_json(self, new_data):
         """Update the elections.json file with new data."""
         try:
-            from pathlib import Path
-            base_dir = Path(__file__).parent.parent
-            docs_json = base_dir / "docs" / "elections.json"
-            web_json = base_dir / "web" / "elections.json"
+            output_files = publish_targets(self.cycle)
             
             # Load existing data
-            with open(docs_json, 'r') as f:
+            with open(output_files[0], 'r') as f:
                 existing_data = json.load(f)
             
             # Update with new data
@@ -467,9 +343,9 @@ class AdvancedElectionScraper:
             existing_data['lastUpdated'] = datetime.now().isoformat() + 'Z'
             
             # Save updated data to both locations
-            for output_file in [docs_json, web_json]:
+            for output_file in output_files:
                 with open(output_file, 'w') as f:
-                    json.dump(existing_data, f, indent=2)
+                    json.dump(existing_data, f, indent=2, default=to_json)
                 logger.info(f"Updated {output_file}")
             
             logger.info(f"Updated elections.json with data for {len(new_data)} states")
@@ -477,35 +353,168 @@ class AdvancedElectionScraper:
         except Exception as e:
             logger.error(f"Error updating elections.json: {e}")
 
+    def scrape_sources(self):
+        """Independent scrape sources, by name. Each is a generator taking the API client it should use."""
+        return {
+            "ballotpedia_senate": self.iter_ballotpedia_senate_races,
+            "ballotpedia_house": self.iter_competitive_house_races,
+        }
+
+    def collect_election_data(self, sources=None, timeouts=None):
+        """Scrape every source concurrently and return the merged per-state data."""
+        return merge_records(self.iter_election_data(sources, timeouts))
+
+    def iter_election_data(self, sources=None, timeouts=None, with_source=False):
+        """Scrape every source concurrently, yielding (state_code, record) as each state is done.
+        
+        Each source runs in its own thread with its own API session, so the run
+        takes as long as the slowest source. A source that fails or exceeds its time
+        budget stops contributing; records it already produced are kept, and the
+        other sources are unaffected.
+        
+        Each source reads one overview page, so a sharded run splits whole sources
+        between shards rather than states.
+        
+        Args:
+            sources: Names of sources to scrape (default: all of scrape_sources())
+            timeouts: Per-source time budgets in seconds (default: SOURCE_TIMEOUTS)
+            with_source: Yield (source, state_code, record) instead
+        """
+        available = self.scrape_sources()
+        names = [name for name in (sources or available) if name in available and self.shard.owns(name)]
+        timeouts = {**SOURCE_TIMEOUTS, **(timeouts or {})}
+        budgets = {name: timeouts.get(name, 300) for name in names}
+        records = queue.Queue()
+        clients = {}
+        clients_lock = threading.Lock()
+        
+        def run_source(name):
+            started = time.time()
+            client = None
+            try:
+                client = self.new_client()
+                with clients_lock:
+                    clients[name] = client
+                for state_code, record in available[name](client=client):
+                    records.put((name, state_code, record))
+                records.put((name, None, None))
+            except Exception as e:
+                records.put((name, None, e))
+            finally:
+                self.metrics.record_timing(f"source:{name}", time.time() - started)
+                if client is not None:
+                    self.metrics.increment("api_requests", client.requests_made)
+                    client.close()
+        
+        started = time.time()
+        for name in names:
+            threading.Thread(target=run_source, args=(name,), name=f"source-{name}", daemon=True).start()
+        
+        # Every source started at the same time, so each deadline is measured from `started`
+        running = set(names)
+        while running:
+            deadline = min(started + budgets[name] for name in running)
+            try:
+                name, state_code, payload = records.get(timeout=max(0, deadline - time.time()))
+            except queue.Empty:
+                for name in [n for n in running if started + budgets[n] <= time.time()]:
+                    logger.error(f"Source {name} exceeded its {budgets[name]}s budget")
+                    self.metrics.increment("source_timeouts")
+                    running.discard(name)
+                    # Closing its session makes the stuck source fail fast instead of lingering
+                    with clients_lock:
+                        client = clients.get(name)
+                    if client is not None:
+                        client.close()
+                continue
+            
+            if name not in running:
+                continue  # Late output from a source that already timed out
+            if state_code is None:
+                running.discard(name)
+                if payload is not None:
+                    logger.error(f"Source {name} failed: {payload}")
+                    self.metrics.increment("source_failures")
+                else:
+                    logger.info(f"Source {name} finished")
+                continue
+            yield (name, state_code, payload) if with_source else (state_code, payload)
+
     def run_comprehensive_scraper(self):
-        """Run the comprehensive scraping process."""
+        """Run the comprehensive scraping process.
+        
+        Records are written to PARTIAL_OUTPUT as each state finishes rather than kept
+        in memory, and the file is merged at the end, so an error late in the run
+        still publishes everything scraped before it. A
+        sharded run writes its shard's partial file instead and leaves elections.json
+        alone; merge_shard_results() publishes once every shard is done.
+        """
         logger.info("Starting comprehensive election data scraping...")
+        output = PARTIAL_OUTPUT
+        if self.shard.is_sharded:
+            output = self.shard.path("advanced_scraper", self.cycle["id"])
+            logger.info(f"Scraping shard {self.shard}; records go to {output}")
         
+        scraped_states = set()
         try:
-            # Scrape from multiple sources
-            senate_data = self.scrape_ballotpedia_senate_races()
-            house_data = self.scrape_competitive_house_races()
-            
-            # Merge all data
-            all_data = self.merge_election_data(senate_data, house_data)
-            
-            # Update the JSON file
-            if all_data:
-                self.update_elections_json(all_data)
-                logger.info(f"Successfully scraped data for {len(all_data)} states")
-            else:
-                logger.warning("No data was scraped")
+            with RecordWriter(output) as writer:
+                for source, state_code, record in self.iter_election_data(with_source=True):
+                    writer.write(state_code, record, source)
+                    scraped_states.add(state_code)
             
         except Exception as e:
             logger.error(f"Error during comprehensive scraping: {e}")
+            if scraped_states:
+                logger.warning(f"Keeping partial results for {len(scraped_states)} states")
         
         finally:
-            self.driver.quit()
-            logger.info("Scraping completed")
+            logger.info(self.metrics.describe())
+            self.metrics.save()
+        
+        # Update the JSON file
+        if self.shard.is_sharded:
+            logger.info(f"Shard {self.shard} done: {len(scraped_states)} states "
+                        f"(merge with --merge-shards {self.shard.count})")
+        elif scraped_states:
+            self.update_elections_json(merge_records(read_records(output)))
+            logger.info(f"Successfully scraped data for {len(scraped_states)} states")
+        else:
+            logger.warning("No data was scraped")
+        logger.info("Scraping completed")
+
+    def merge_shard_results(self, count):
+        """Merge the partial files of a sharded run and update elections.json.
+        
+        Returns:
+            True if every shard's partial file was found and merged
+        """
+        merged, missing = merge_shards("advanced_scraper", count, self.cycle["id"], SOURCE_ORDER)
+        if missing:
+            logger.error(f"Missing shard results: {', '.join(str(path) for path in missing)}")
+            return False
+        if merged:
+            self.update_elections_json(merged)
+        else:
+            logger.warning("No data was scraped by any shard")
+        return True
 
 def main():
-    """Main function to run the advanced scraper."""
-    scraper = AdvancedElectionScraper(headless=True)
+    """Main function to run the advanced scraper.
+    
+    Options:
+        --shard i/N       Only scrape shard i of N (0 <= i < N), into a partial file
+        --merge-shards N  Merge the partial files of all N shards into elections.json
+    """
+    import sys
+    
+    if '--merge-shards' in sys.argv[:-1]:
+        scraper = AdvancedElectionScraper()
+        if not scraper.merge_shard_results(int(sys.argv[sys.argv.index('--merge-shards') + 1])):
+            sys.exit(1)
+        return
+    
+    shard = Shard.parse(sys.argv[sys.argv.index('--shard') + 1]) if '--shard' in sys.argv[:-1] else Shard()
+    scraper = AdvancedElectionScraper(shard=shard)
     scraper.run_comprehensive_scraper()
 
 if __name__ == "__main__":
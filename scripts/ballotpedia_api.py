@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Ballotpedia API Client
+Fetches Ballotpedia pages through the MediaWiki JSON API (api.php) instead of
+rendering them in Chrome. Page wikitext is requested in batches of up to 50
+titles per call over one pooled HTTP session, so covering every state takes a
+handful of requests rather than a browser visit per page.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_URL = "https://ballotpedia.org/wiki/api.php"
+USER_AGENT = "ElectionsToWatch/1.0 (+https://github.com/irenez03/elections-to-watch)"
+
+# MediaWiki accepts at most 50 titles per query for ordinary clients
+MAX_TITLES_PER_REQUEST = 50
+
+
+class MediaWikiError(Exception):
+    """An error response from the MediaWiki API."""
+
+
+class BallotpediaClient:
+    def __init__(self, api_url=API_URL, batch_size=MAX_TITLES_PER_REQUEST, timeout=30, retries=3, session=None):
+        """Create a client with a pooled, retrying HTTP session.
+
+        Args:
+            api_url: MediaWiki api.php endpoint (a local stand-in server in tests)
+            batch_size: Titles per query request (at most 50)
+            timeout: Seconds per HTTP request
+            retries: Retries for connection errors and 429/5xx responses
+            session: Existing requests.Session to use instead of creating one
+        """
+        self.api_url = api_url
+        self.batch_size = min(batch_size, MAX_TITLES_PER_REQUEST)
+        self.timeout = timeout
+        self.requests_made = 0
+
+        if session is None:
+            session = requests.Session()
+            retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=("GET",))
+            adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=4)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+        self.session = session
+
+    def call(self, **params):
+        """Make one API request and return the decoded JSON response."""
+        params = {"format": "json", "formatversion": "2", **params}
+        response = self.session.get(self.api_url, params=params, timeout=self.timeout)
+        self.requests_made += 1
+        response.raise_for_status()
+        data = response.json()
+        if "error" in data:
+            error = data["error"]
+            raise MediaWikiError(f"{error.get('code')}: {error.get('info')}")
+        return data
+
+    def query(self, **params):
+        """Run an action=query request, following "continue" until every result is in.
+
+        Yields:
+            The "query" part of each response
+        """
+        continuation = {}
+        while True:
+            data = self.call(action="query", **params, **continuation)
+            if "query" in data:
+                yield data["query"]
+            if "continue" not in data:
+                return
+            continuation = data["continue"]
+
+    def page_wikitext(self, titles):
+        """Fetch the current wikitext of many pages.
+
+        Returns:
+            Dict mapping each requested title to its wikitext; missing pages are left out
+        """
+        return dict(self.iter_page_wikitext(titles))
+
+    def iter_page_wikitext(self, titles):
+        """Yield (title, wikitext) for many pages, requesting them in batches.
+
+        Each batch is fetched only when the previous one has been consumed, so the
+        caller can parse one batch while the next is downloaded. Redirects are
+        followed and titles normalized by the wiki are mapped back to the titles
+        that were asked for; missing pages, and pages that match no requested
+        title, are skipped.
+        """
+        titles = list(dict.fromkeys(titles))
+
+        for start in range(0, len(titles), self.batch_size):
+            batch = titles[start:start + self.batch_size]
+            for result in self.query(prop="revisions", rvprop="content", rvslots="main",
+                                     redirects="1", titles="|".join(batch)):
+                # Map the wiki's final page titles back to the requested ones
+                requested = {title: title for title in batch}
+                for change in result.get("normalized", []) + result.get("redirects", []):
+                    for original, current in list(requested.items()):
+                        if current == change["from"]:
+                            requested[original] = change["to"]
+                by_final_title = {}
+                for original, current in requested.items():
+                    by_final_title.setdefault(current, []).append(original)
+
+                for page in result.get("pages", []):
+                    if page.get("missing") or not page.get("revisions"):
+                        continue
+                    revision = page["revisions"][0]
+                    content = revision.get("slots", {}).get("main", {}).get("content", revision.get("content"))
+                    if content is None:
+                        continue
+                    # Several requested titles can redirect to the same page; pages that map back
+                    # to none of them were not asked for and are skipped
+                    for original in by_final_title.get(page["title"], []):
+                        yield original, content
+
+    def links(self, title, namespace=0):
+        """Return the titles of the wiki pages a page links to."""
+        linked = []
+        for result in self.query(prop="links", titles=title, plnamespace=str(namespace),
+                                 pllimit="max", redirects="1"):
+            for page in result.get("pages", []):
+                linked.extend(link["title"] for link in page.get("links", []))
+        return linked
+
+    def section_html(self, title, section=None):
+        """Return the rendered HTML of a page, or of one section of it (action=parse)."""
+        params = {"page": title, "prop": "text", "redirects": "1", "disablelimitreport": "1"}
+        if section is not None:
+            params["section"] = str(section)
+        return self.call(action="parse", **params)["parse"]["text"]
+
+    def sections(self, title):
+        """Return the section list of a page (action=parse&prop=sections)."""
+        return self.call(action="parse", page=title, prop="sections", redirects="1")["parse"]["sections"]
+
+    def close(self):
+        """Close the pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
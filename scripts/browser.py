@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Browser Setup Helpers
+Shared Chrome WebDriver setup for the scrapers. Selenium and webdriver_manager are
+imported on first use, and the resolved chromedriver path is cached on disk so that
+later runs never go to the network just to locate the driver.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent.parent
+CACHE_DIR = BASE_DIR / ".cache"
+DRIVER_CACHE_FILE = CACHE_DIR / "chromedriver.json"
+
+# Places to look for a local Chrome install (checked in order)
+CHROME_BINARIES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"]
+MAC_CHROME = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+
+VERSION_PATTERN = re.compile(r"(\d+)\.\d+\.\d+(?:\.\d+)?")
+
+# Lean browser profile: we only read page text, so skip everything else.
+# Pass a dict of overrides (e.g. {"block_fonts": False}) to the scrapers to adjust it,
+# or {"enabled": False} for a plain Chrome session.
+LEAN_PROFILE = {
+    "enabled": True,
+    "page_load_strategy": "eager",
+    "block_images": True,
+    "block_fonts": True,
+    "block_media": True,
+    "block_trackers": True,
+}
+
+# URL patterns passed to CDP Network.setBlockedURLs, by resource type
+BLOCKED_URL_PATTERNS = {
+    "images": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.bmp*"],
+    "fonts": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*", "*fonts.googleapis.com*", "*fonts.gstatic.com*", "*use.typekit.net*"],
+    "media": ["*.mp4*", "*.webm*", "*.mp3*", "*.m3u8*", "*.mov*", "*youtube.com/embed*", "*player.vimeo.com*"],
+    "trackers": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*facebook.net*",
+        "*connect.facebook.com*", "*hotjar.com*", "*siteimproveanalytics*", "*nr-data.net*",
+        "*newrelic.com*", "*addthis.com*", "*sharethis.com*", "*clarity.ms*", "*quantserve.com*",
+    ],
+}
+
+# Typical transfer size of one blocked request, used to estimate bytes saved per page
+ESTIMATED_BLOCKED_BYTES = {"images": 60000, "fonts": 40000, "media": 500000, "trackers": 25000}
+
+
+def find_chrome_binary():
+    """Return the path of the local Chrome/Chromium binary, or None."""
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return path
+    if os.path.exists(MAC_CHROME):
+        return MAC_CHROME
+    return None
+
+
+def binary_version(binary):
+    """Run `<binary> --version` and return the version string, or None."""
+    try:
+        result = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(result.stdout)
+    return match.group(0) if match else None
+
+
+def major_version(version):
+    """Return the major component of a version string ('120.0.6099.109' -> '120')."""
+    return version.split(".")[0] if version else None
+
+
+def load_driver_cache(cache_file=DRIVER_CACHE_FILE):
+    """Load the cached chromedriver entry, or an empty dict."""
+    try:
+        with open(cache_file, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_driver_cache(entry, cache_file=DRIVER_CACHE_FILE):
+    """Persist the resolved chromedriver entry."""
+    try:
+        Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, 'w') as f:
+            json.dump(entry, f, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not write chromedriver cache: {e}")
+
+
+def cached_driver_is_valid(entry, chrome_binary):
+    """Check that a cached entry still points at a driver matching the installed Chrome.
+
+    The Chrome binary's mtime is compared first so the common case costs a single
+    stat() call; only when Chrome was updated do we ask it for its version. If the
+    updated Chrome still matches the driver, the entry is restamped in place so
+    the next run takes the fast path again.
+    """
+    driver_path = entry.get("driver_path")
+    if not driver_path or not os.path.exists(driver_path):
+        return False
+    if not chrome_binary:
+        # No local Chrome to compare against - trust the cache
+        return True
+    try:
+        chrome_mtime = os.path.getmtime(chrome_binary)
+    except OSError:
+        return False
+    if entry.get("chrome_binary") == chrome_binary and entry.get("chrome_mtime") == chrome_mtime:
+        return True
+
+    chrome_version = binary_version(chrome_binary)
+    if major_version(chrome_version) != major_version(entry.get("driver_version")):
+        return False
+    entry.update(chrome_binary=chrome_binary, chrome_mtime=chrome_mtime, chrome_version=chrome_version)
+    return True
+
+
+def resolve_chromedriver(offline=None, cache_file=DRIVER_CACHE_FILE):
+    """Return the chromedriver path to use, or None to let Selenium Manager decide.
+
+    Resolution order:
+      1. CHROMEDRIVER_PATH environment variable
+      2. Cached path, if the binary exists and matches the installed Chrome
+      3. chromedriver on PATH, if its major version matches Chrome
+      4. webdriver_manager download
+
+    Raises:
+        RuntimeError: offline and no local chromedriver matches Chrome (Selenium
+            Manager would download one)
+    """
+    if offline is None:
+        offline = os.environ.get("ELECTIONS_OFFLINE", "") not in ("", "0")
+
+    override = os.environ.get("CHROMEDRIVER_PATH")
+    if override:
+        return override
+
+    chrome_binary = find_chrome_binary()
+    entry = load_driver_cache(cache_file)
+    stamp = (entry.get("chrome_binary"), entry.get("chrome_mtime"))
+    if entry and cached_driver_is_valid(entry, chrome_binary):
+        if (entry.get("chrome_binary"), entry.get("chrome_mtime")) != stamp:
+            save_driver_cache(entry, cache_file)
+        return entry["driver_path"]
+
+    chrome_version = binary_version(chrome_binary) if chrome_binary else None
+    driver_path = None
+    driver_version = None
+
+    local_driver = shutil.which("chromedriver")
+    if local_driver:
+        local_version = binary_version(local_driver)
+        if chrome_version is None or major_version(local_version) == major_version(chrome_version):
+            driver_path, driver_version = local_driver, local_version
+
+    if driver_path is None:
+        if offline:
+            raise RuntimeError("Offline and no cached or local chromedriver matches Chrome "
+                               f"{chrome_version or '(not found)'}; set CHROMEDRIVER_PATH or unset ELECTIONS_OFFLINE")
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            driver_path = ChromeDriverManager().install()
+            driver_version = binary_version(driver_path) or chrome_version
+        except Exception as e:
+            logger.warning(f"webdriver_manager could not install chromedriver: {e}")
+            return None
+
+    save_driver_cache({
+        "driver_path": driver_path,
+        "driver_version": driver_version,
+        "chrome_binary": chrome_binary,
+        "chrome_mtime": os.path.getmtime(chrome_binary) if chrome_binary else None,
+        "chrome_version": chrome_version,
+    }, cache_file)
+    logger.info(f"Resolved chromedriver {driver_version or ''} at {driver_path}")
+    return driver_path
+
+
+def resolve_profile(overrides=None):
+    """Merge profile overrides onto the lean defaults."""
+    profile = dict(LEAN_PROFILE)
+    if overrides:
+        profile.update(overrides)
+    return profile
+
+
+def blocked_patterns(profile):
+    """Return {resource_type: [patterns]} for the types the profile blocks."""
+    if not profile.get("enabled"):
+        return {}
+    return {
+        kind: patterns for kind, patterns in BLOCKED_URL_PATTERNS.items()
+        if profile.get(f"block_{kind}")
+    }
+
+
+def build_chrome_options(headless=True, user_agent=None, profile=None, capture_network=False):
+    """Build the Chrome options shared by both scrapers.
+
+    capture_network turns on the performance log even without the lean profile,
+    for network_capture.py.
+    """
+    from selenium.webdriver.chrome.options import Options
+
+    profile = resolve_profile(profile)
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    if user_agent:
+        chrome_options.add_argument(f"--user-agent={user_agent}")
+
+    if profile.get("enabled"):
+        chrome_options.page_load_strategy = profile.get("page_load_strategy", "eager")
+        prefs = {}
+        if profile.get("block_images"):
+            # Catches extensionless image URLs that the CDP patterns miss
+            prefs["profile.managed_default_content_settings.images"] = 2
+        if profile.get("block_media"):
+            chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        if prefs:
+            chrome_options.add_experimental_option("prefs", prefs)
+        # Performance log lets us count the requests that were blocked
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if capture_network:
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return chrome_options
+
+
+def apply_lean_profile(driver, profile=None):
+    """Install the request blocklist on a running driver through the DevTools protocol."""
+    patterns = blocked_patterns(resolve_profile(profile))
+    if not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {
+            "urls": [pattern for group in patterns.values() for pattern in group]
+        })
+    except Exception as e:
+        logger.warning(f"Could not install request blocklist: {e}")
+
+
+def create_chrome_driver(headless=True, user_agent=None, offline=None, profile=None, capture_network=False):
+    """Launch a Chrome WebDriver using the cached chromedriver when possible."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    chrome_options = build_chrome_options(headless, user_agent, profile, capture_network)
+    driver_path = resolve_chromedriver(offline=offline)
+    if driver_path:
+        driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    else:
+        driver = webdriver.Chrome(options=chrome_options)
+    apply_lean_profile(driver, profile)
+    return driver
+
+
+def read_performance_log(driver):
+    """Drain the performance log entries recorded since the last read (an empty list without logging)."""
+    try:
+        return driver.get_log("performance")
+    except Exception:
+        return []
+
+
+def classify_blocked_url(url, profile=None):
+    """Return the resource type a blocked URL belongs to ('images', 'fonts', ...), or 'other'."""
+    lowered = url.lower()
+    for kind, patterns in blocked_patterns(resolve_profile(profile)).items():
+        for pattern in patterns:
+            if pattern.strip("*").lower() in lowered:
+                return kind
+    return "other"
+
+
+# Transfer size and DOMContentLoaded time of the current document and its subresources
+PAGE_TIMING_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+let bytes = nav ? (nav.transferSize || 0) : 0;
+for (const r of performance.getEntriesByType('resource')) bytes += r.transferSize || 0;
+return {bytes: bytes, loadMs: nav ? nav.domContentLoadedEventEnd : 0};
+"""
+
+
+def collect_page_metrics(driver, url, profile=None, log_entries=None):
+    """Measure one page load and estimate what the lean profile saved.
+
+    Blocked requests are counted from the performance log; the bytes saved are an
+    estimate from ESTIMATED_BLOCKED_BYTES (images blocked by content settings never
+    issue a request, so this is a lower bound) and the time saved is that estimate
+    divided by the page's observed throughput. Pass log_entries when the caller has
+    already drained the performance log (e.g. to capture network responses too).
+    """
+    page = {"url": url, "bytes": 0, "loadMs": 0, "blocked": {}, "bytesSavedEst": 0, "timeSavedMsEst": 0}
+    try:
+        timing = driver.execute_script(PAGE_TIMING_SCRIPT) or {}
+        page["bytes"] = int(timing.get("bytes") or 0)
+        page["loadMs"] = round(float(timing.get("loadMs") or 0))
+    except Exception as e:
+        logger.debug(f"Could not read page timing for {url}: {e}")
+
+    if not resolve_profile(profile).get("enabled"):
+        return page
+
+    if log_entries is None:
+        log_entries = read_performance_log(driver)
+
+    request_urls = {}
+    for entry in log_entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        params = message.get("params", {})
+        if message.get("method") == "Network.requestWillBeSent":
+            request_urls[params.get("requestId")] = params.get("request", {}).get("url", "")
+        elif message.get("method") == "Network.loadingFailed" and params.get("blockedReason"):
+            kind = classify_blocked_url(request_urls.get(params.get("requestId"), ""), profile)
+            page["blocked"][kind] = page["blocked"].get(kind, 0) + 1
+
+    page["bytesSavedEst"] = sum(
+        ESTIMATED_BLOCKED_BYTES.get(kind, 0) * count for kind, count in page["blocked"].items()
+    )
+    if page["bytes"] and page["loadMs"]:
+        bytes_per_ms = page["bytes"] / page["loadMs"]
+        page["timeSavedMsEst"] = round(page["bytesSavedEst"] / bytes_per_ms)
+    return page
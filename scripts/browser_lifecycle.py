@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Browser Lifecycle
+Keeps one long-running Chrome session healthy across a scrape.
+
+Headless Chrome's memory grows with every page a session loads, and a crashed or
+hung renderer leaves the session unusable until it is quit. BrowserManager owns
+the driver and, around every page load:
+
+- recycles it (quit and relaunch) after max_pages pages, or once the browser's
+  process tree (chromedriver, Chrome and its renderers) uses more than max_rss_mb
+- relaunches it and retries the page once when the session has died
+- records each recycle and relaunch, with its reason, in the run metrics
+
+Process memory is read with psutil when it is installed, and from /proc otherwise
+(on systems with neither the memory ceiling is not enforced).
+"""
+
+import logging
+import os
+import signal
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Recycle after this many pages, or when the process tree's RSS passes the ceiling
+MAX_PAGES = 50
+MAX_RSS_MB = 1500
+# Read the process tree's memory every this many pages (it walks /proc)
+RSS_CHECK_EVERY = 5
+
+# WebDriver error messages that mean the session (or its renderer) is gone
+DEAD_SESSION_MARKERS = (
+    "invalid session id",
+    "session deleted",
+    "no such session",
+    "chrome not reachable",
+    "disconnected",
+    "tab crashed",
+    "target frame detached",
+    "target window already closed",
+    "connection refused",
+    "max retries exceeded",
+)
+
+PROC_DIR = Path("/proc")
+
+
+def is_dead_session_error(error):
+    """Whether an exception from the driver means the browser session is unusable."""
+    if isinstance(error, (ConnectionError, OSError)):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in DEAD_SESSION_MARKERS)
+
+
+def proc_children():
+    """Map each process id to its child process ids, read from /proc."""
+    children = {}
+    for entry in PROC_DIR.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name in parentheses may contain spaces; fields resume after the last ")"
+        parent = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(parent, []).append(int(entry.name))
+    return children
+
+
+def proc_rss(pid):
+    """Resident memory of one process in bytes, from /proc (0 if it is gone)."""
+    try:
+        for line in (PROC_DIR / str(pid) / "status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def process_tree(pid):
+    """A process id and the ids of all its descendants, or None if they cannot be listed."""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            return [pid] + [child.pid for child in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return None
+
+    if not PROC_DIR.exists():
+        return None
+    children = proc_children()
+    tree = []
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        pending.extend(children.get(current, []))
+    return tree
+
+
+def process_tree_rss(pid):
+    """Total resident memory in bytes of a process and all its descendants, or None if unknown."""
+    tree = process_tree(pid)
+    if tree is None:
+        return None
+    try:
+        import psutil
+    except ImportError:
+        return sum(proc_rss(member) for member in tree)
+
+    total = 0
+    for member in tree:
+        try:
+            total += psutil.Process(member).memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def driver_pid(driver):
+    """Process id of the chromedriver service behind a Selenium driver, or None."""
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+class BrowserManager:
+    def __init__(self, factory, metrics=None, max_pages=MAX_PAGES, max_rss_mb=MAX_RSS_MB,
+                 rss_check_every=RSS_CHECK_EVERY):
+        """Own a WebDriver and relaunch it when it grows too large or dies.
+
+        Args:
+            factory: Callable that launches a new driver (e.g. browser.create_chrome_driver)
+            metrics: RunMetrics to record recycles and relaunches in
+            max_pages: Recycle after this many page loads (None: never)
+            max_rss_mb: Recycle once the browser's process tree uses more memory than this (None: never)
+            rss_check_every: Check memory every this many page loads
+        """
+        self.factory = factory
+        self.metrics = metrics
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.rss_check_every = max(1, rss_check_every)
+        self._driver = None
+        self.generation = 0
+        self.pages_loaded = 0
+        self.last_rss_mb = None
+        self.peak_rss_mb = 0
+
+    @property
+    def running(self):
+        """Whether a browser is currently launched."""
+        return self._driver is not None
+
+    @property
+    def driver(self):
+        """The current driver, launched on first use."""
+        if self._driver is None:
+            self._driver = self.factory()
+            self.generation += 1
+            self.pages_loaded = 0
+            self.last_rss_mb = None
+        return self._driver
+
+    def rss_mb(self):
+        """Memory of the current browser's process tree in MB, or None if it cannot be measured."""
+        pid = driver_pid(self._driver) if self._driver is not None else None
+        if pid is None:
+            return None
+        rss = process_tree_rss(pid)
+        if rss is None:
+            return None
+        self.last_rss_mb = round(rss / (1024 * 1024), 1)
+        self.peak_rss_mb = max(self.peak_rss_mb, self.last_rss_mb)
+        return self.last_rss_mb
+
+    def recycle_reason(self):
+        """Why the current driver should be replaced before the next page, or None."""
+        if self._driver is None:
+            return None
+        if self.max_pages and self.pages_loaded >= self.max_pages:
+            return "pages"
+        if self.max_rss_mb and self.pages_loaded and self.pages_loaded % self.rss_check_every == 0:
+            rss = self.rss_mb()
+            if rss is not None and rss > self.max_rss_mb:
+                return "memory"
+        return None
+
+    def recycle(self, reason):
+        """Quit the current driver so the next use launches a fresh one."""
+        pages, rss = self.pages_loaded, self.last_rss_mb
+        self.quit()
+        counter = "browser_relaunches" if reason == "dead_session" else "browser_recycles"
+        action = "relaunched" if reason == "dead_session" else "recycled"
+        logger.info(f"♻️  Browser {action} ({reason}) after {pages} pages"
+                    + (f", {rss} MB" if rss is not None else ""))
+        if self.metrics is not None:
+            self.metrics.increment(counter)
+            self.metrics.record_event("browser_recycle", reason=reason, pages=pages, rssMb=rss,
+                                      generation=self.generation)
+
+    def is_alive(self):
+        """Whether the current session still answers commands."""
+        if self._driver is None:
+            return False
+        try:
+            self._driver.execute_script("return 1")
+            return True
+        except Exception:
+            # Includes a renderer too hung to answer
+            return False
+
+    def get(self, url):
+        """Load a URL, recycling the browser first if it is due and relaunching it once if it died.
+
+        Returns:
+            The driver that loaded the page
+        """
+        reason = self.recycle_reason()
+        if reason:
+            self.recycle(reason)
+
+        driver = self.driver
+        try:
+            driver.get(url)
+        except Exception as e:
+            # A slow page raises a timeout on a live session; only a dead one is retried
+            if not is_dead_session_error(e) and self.is_alive():
+                raise
+            logger.warning(f"Browser session died loading {url}: {e}")
+            self.recycle("dead_session")
+            driver = self.driver
+            driver.get(url)
+        self.pages_loaded += 1
+        return driver
+
+    def quit(self):
+        """Quit the current driver, if any, ignoring errors from a session that already died."""
+        if self._driver is None:
+            return
+        driver, self._driver = self._driver, None
+        pid = driver_pid(driver)
+        # List the tree first: once chromedriver exits, its Chrome children are reparented
+        tree = process_tree(pid) if pid is not None else None
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting browser: {e}")
+            # A hung or crashed browser may not exit on quit(); kill whatever is left
+            for member in tree or []:
+                try:
+                    os.kill(member, signal.SIGKILL)
+                except OSError:
+                    pass
+
+    def stats(self):
+        """Lifecycle numbers for the run metrics."""
+        return {"launches": self.generation, "peakRssMb": self.peak_rss_mb}
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Calendar Feeds
+Precomputes the site's calendar files from electionData, so the static host
+serves registration deadlines, primaries and general elections without any
+per-request work:
+
+    <STATE>.ics     One iCalendar feed per state
+    all.ics         Every state's events in one national feed
+    timeline.json   {"cycle", "events": [...]} sorted by date
+    manifest.json   {"version", "cycle", "states": {state code: events digest}}
+
+Only the feeds of states whose events changed since the last build are
+rewritten (the digests in manifest.json say which); the national feed and the
+timeline are rewritten when any state changed.
+
+Usage:
+    python calendar_feeds.py [elections.json] [output dir]
+    (defaults: docs/elections.json and docs/calendar)
+"""
+
+import hashlib
+import json
+import sys
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from dates import normalize_date
+
+FEED_VERSION = 1
+NATIONAL_FEED = "all.ics"
+TIMELINE_FILE = "timeline.json"
+MANIFEST_FILE = "manifest.json"
+
+PRODID = "-//Elections to Watch//Election Calendar//EN"
+UID_DOMAIN = "elections-to-watch"
+# iCalendar content lines are folded at 75 octets
+MAX_LINE_OCTETS = 75
+
+# Event kinds, in the order events on the same day are listed
+KINDS = ["registration", "primary", "runoff", "special", "general", "election"]
+KIND_LABELS = {
+    "registration": "Registration",
+    "primary": "Primary",
+    "runoff": "Runoff",
+    "special": "Special Election",
+    "general": "General Election",
+    "election": "Election",
+}
+
+
+def election_kind(election):
+    """Event kind of an election, from its type and title."""
+    text = f"{election.get('type') or ''} {election.get('title') or ''}".lower()
+    for kind in ("runoff", "primary", "special", "general"):
+        if kind in text:
+            return kind
+    return "election"
+
+
+def iso_date(record, field):
+    """ISO date of a record's date field, preferring the one precomputed by the build."""
+    precomputed = record.get(f"{field}ISO")
+    if precomputed:
+        return precomputed
+    normalized = normalize_date(record.get(field))
+    return normalized.iso if normalized else None
+
+
+def state_events(state_code, state_data):
+    """Dated events of one state: its registration deadline, elections and key dates.
+
+    Key dates from the general election CSV are only added when no election of
+    the same kind falls on that day.
+    """
+    state_name = state_data.get("stateName", state_code)
+    events = []
+
+    deadline = iso_date(state_data, "registrationDeadline")
+    if deadline:
+        events.append({
+            "date": deadline,
+            "kind": "registration",
+            "title": "Voter registration deadline",
+            "description": "Last day to register to vote",
+            "url": state_data.get("registrationWebsite") or "",
+        })
+
+    for election in state_data.get("elections", []):
+        election_date = iso_date(election, "date")
+        if not election_date:
+            continue
+        events.append({
+            "date": election_date,
+            "kind": election_kind(election),
+            "title": election.get("title") or "Election",
+            "description": election.get("stakes") or "",
+            "url": state_data.get("electionInfoUrl") or "",
+        })
+
+    for kind in ("primary", "general"):
+        key_date = (state_data.get("keyDates") or {}).get(kind) or {}
+        if key_date.get("iso") and not any(event["kind"] == kind and event["date"] == key_date["iso"]
+                                           for event in events):
+            events.append({
+                "date": key_date["iso"],
+                "kind": kind,
+                "title": KIND_LABELS[kind],
+                "description": "",
+                "url": state_data.get("electionInfoUrl") or "",
+            })
+
+    for event in events:
+        event["state"] = state_code
+        event["stateName"] = state_name
+    events.sort(key=event_sort_key)
+    return events
+
+
+def event_sort_key(event):
+    """Order events by date, then state name, then kind."""
+    return event["date"], event["stateName"].lower(), KINDS.index(event["kind"]), event["title"]
+
+
+def events_digest(events):
+    """Digest of a state's events, to tell whether its feed needs rewriting."""
+    payload = json.dumps({"version": FEED_VERSION, "events": events}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def escape_text(value):
+    """Escape an iCalendar TEXT value."""
+    return (str(value).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def fold_line(line):
+    """Fold a content line at 75 octets without splitting a UTF-8 character."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= MAX_LINE_OCTETS:
+        return line
+    parts = []
+    start = 0
+    limit = MAX_LINE_OCTETS
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1  # back up to the start of a multi-byte character
+        parts.append(encoded[start:end].decode("utf-8"))
+        start = end
+        limit = MAX_LINE_OCTETS - 1  # continuation lines start with a space
+    return "\r\n ".join(parts)
+
+
+def event_uid(event, seen):
+    """Stable UID of an event, so calendar apps update it when its date changes."""
+    base = f"{event['state']}-{event['kind']}-{event['title']}"
+    digest = hashlib.sha1(base.encode("utf-8")).hexdigest()[:12]
+    seen[digest] = seen.get(digest, 0) + 1
+    suffix = f"-{seen[digest]}" if seen[digest] > 1 else ""
+    return f"{event['state'].lower()}-{event['kind']}-{digest}{suffix}@{UID_DOMAIN}"
+
+
+def render_ics(events, calendar_name, stamp):
+    """An iCalendar (RFC 5545) feed of all-day events.
+
+    Args:
+        events: Events from state_events
+        calendar_name: Name calendar apps show for the feed
+        stamp: datetime written as each event's DTSTAMP
+    """
+    dtstamp = stamp.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(calendar_name)}",
+    ]
+    seen = {}
+    for event in events:
+        day = date.fromisoformat(event["date"])
+        summary = f"{event['title']} ({event['stateName']})"
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{event_uid(event, seen)}",
+            f"DTSTAMP:{dtstamp}",
+            f"DTSTART;VALUE=DATE:{day.strftime('%Y%m%d')}",
+            f"DTEND;VALUE=DATE:{(day + timedelta(days=1)).strftime('%Y%m%d')}",
+            f"SUMMARY:{escape_text(summary)}",
+        ]
+        if event["description"]:
+            lines.append(f"DESCRIPTION:{escape_text(event['description'])}")
+        if event["url"]:
+            lines.append(f"URL:{event['url']}")
+        lines += [
+            f"CATEGORIES:{escape_text(KIND_LABELS[event['kind']])}",
+            "TRANSP:TRANSPARENT",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "".join(fold_line(line) + "\r\n" for line in lines)
+
+
+def write_text(path, text):
+    """Write a feed file (iCalendar lines end in CRLF, so no newline translation)."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+
+
+def read_manifest(output_dir):
+    """The manifest of the last build, or an empty one."""
+    try:
+        with open(Path(output_dir) / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"states": {}}
+    if manifest.get("version") != FEED_VERSION:
+        return {"states": {}}
+    return manifest
+
+
+def write_calendar_feeds(election_data, output_dir, cycle=None, now=None):
+    """Write the calendar feeds and timeline for electionData to output_dir.
+
+    Args:
+        election_data: electionData dict
+        output_dir: Directory for the feeds (created if needed)
+        cycle: Cycle summary ({"id", "label"}) for feed names and the timeline
+        now: Timestamp for rewritten feeds (default: now)
+
+    Returns:
+        Dict with "written" (state codes whose feeds were rewritten), "removed"
+        (state codes no longer in the data) and "unchanged" (count)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    now = now or datetime.now(timezone.utc)
+    cycle = cycle or {}
+    label = cycle.get("label") or "Elections"
+    previous = read_manifest(output_dir)
+    if previous.get("cycle") != cycle.get("id"):
+        previous = {"states": {}}
+
+    digests = {}
+    all_events = []
+    written = []
+    for state_code in sorted(election_data):
+        events = state_events(state_code, election_data[state_code])
+        all_events.extend(events)
+        digests[state_code] = events_digest(events)
+        feed = output_dir / f"{state_code}.ics"
+        if previous["states"].get(state_code) == digests[state_code] and feed.exists():
+            continue
+        state_name = election_data[state_code].get("stateName", state_code)
+        write_text(feed, render_ics(events, f"{state_name} — {label}", now))
+        written.append(state_code)
+
+    removed = sorted(set(previous["states"]) - set(digests))
+    for state_code in removed:
+        (output_dir / f"{state_code}.ics").unlink(missing_ok=True)
+
+    national = output_dir / NATIONAL_FEED
+    timeline = output_dir / TIMELINE_FILE
+    if written or removed or not national.exists() or not timeline.exists():
+        all_events.sort(key=event_sort_key)
+        write_text(national, render_ics(all_events, label, now))
+        with open(timeline, 'w', encoding='utf-8') as f:
+            json.dump({"cycle": cycle.get("id"), "events": all_events}, f, separators=(",", ":"), ensure_ascii=False)
+
+    with open(output_dir / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump({"version": FEED_VERSION, "cycle": cycle.get("id"), "national": NATIONAL_FEED,
+                   "timeline": TIMELINE_FILE, "states": digests}, f, indent=2)
+
+    return {"written": written, "removed": removed, "unchanged": len(digests) - len(written)}
+
+
+def main():
+    """Rebuild the calendar feeds from a published elections.json."""
+    base_dir = Path(__file__).parent.parent
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else base_dir / "docs" / "elections.json"
+    output_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else base_dir / "docs" / "calendar"
+
+    with open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    result = write_calendar_feeds(data.get("electionData", {}), output_dir, data.get("cycle"))
+    print(f"✅ Rewrote {len(result['written'])} calendar feeds in {output_dir} ({result['unchanged']} unchanged)")
+
+
+if __name__ == "__main__":
+    main()
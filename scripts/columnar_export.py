@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Columnar Export
+Writes electionData in a compact, column-oriented "v2" format for the site.
+elections.json repeats every key and most values ("chamberImpact": "State",
+"type": "General Election", ...) once per election; v2 stores each table as
+parallel arrays, one per field, and replaces columns of repeated values with a
+small dictionary table plus integer codes. docs/columnar.js decodes it back into
+the exact electionData object the site already uses.
+
+Usage:
+    python columnar_export.py [elections.json] [output file]
+    (defaults: docs/elections.json and docs/elections.v2.json)
+    python columnar_export.py --benchmark [elections.json]
+
+Format:
+    {"format": 2, "lastUpdated": ..., "cycle": {...}, "codes": [state code, ...],
+     "states": <table>, "indexes": {...}}
+
+    <table>   {"rows": n, "shapes": [[key, ...], ...], "shape": <column>,
+               "columns": {key: <column>, ...}}
+    <column>  {"values": [...]}                       plain values
+              {"dict": [value, ...], "codes": [...]}  dictionary-encoded
+              {"counts": [...], "table": <table>}     list of records per row
+
+Each row's shape is the ordered list of its keys, so records with missing or
+extra fields round-trip exactly. A column only holds values for the rows whose
+shape includes that key, in row order.
+"""
+
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+from election_model import to_json
+
+FORMAT_VERSION = 2
+
+# Dictionary-encode a column when it has at most this fraction of distinct values
+DICTIONARY_RATIO = 0.5
+
+
+def is_scalar(value):
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def is_record_list(value):
+    return isinstance(value, list) and all(isinstance(item, dict) for item in value)
+
+
+def encode_column(values):
+    """Pick the smallest encoding for one column's values."""
+    if values and all(is_record_list(value) for value in values):
+        return {
+            "counts": [len(value) for value in values],
+            "table": encode_table([row for value in values for row in value]),
+        }
+
+    if values and all(is_scalar(value) for value in values):
+        # Keyed by (type, value) so True and 1 stay distinct
+        table = {}
+        for value in values:
+            table.setdefault((type(value), value), len(table))
+        if len(table) <= len(values) * DICTIONARY_RATIO:
+            return {
+                "dict": [value for kind, value in table],
+                "codes": [table[(type(value), value)] for value in values],
+            }
+
+    return {"values": values}
+
+
+def encode_table(rows):
+    """Encode a list of JSON objects as parallel columns."""
+    shapes = {}
+    columns = {}
+    shape_codes = []
+
+    for row in rows:
+        keys = tuple(row)
+        shape_codes.append(shapes.setdefault(keys, len(shapes)))
+        for key in keys:
+            columns.setdefault(key, []).append(row[key])
+
+    return {
+        "rows": len(rows),
+        "shapes": [list(keys) for keys in shapes],
+        "shape": encode_column(shape_codes),
+        "columns": {key: encode_column(values) for key, values in columns.items()},
+    }
+
+
+def decode_column(column):
+    """Return the list of values stored in one column."""
+    if "values" in column:
+        return column["values"]
+    if "dict" in column:
+        table = column["dict"]
+        return [table[code] for code in column["codes"]]
+
+    nested = decode_table(column["table"])
+    values = []
+    start = 0
+    for count in column["counts"]:
+        values.append(nested[start:start + count])
+        start += count
+    return values
+
+
+def decode_table(table):
+    """Rebuild the list of JSON objects from an encoded table."""
+    columns = {key: iter(decode_column(column)) for key, column in table["columns"].items()}
+    shapes = table["shapes"]
+    return [{key: next(columns[key]) for key in shapes[shape]} for shape in decode_column(table["shape"])]
+
+
+def encode_election_data(election_data, last_updated=None, indexes=None, cycle=None):
+    """Build the v2 document for an electionData dict (state code -> state record)."""
+    election_data = to_json(election_data)
+    document = {
+        "format": FORMAT_VERSION,
+        "lastUpdated": last_updated,
+    }
+    if cycle is not None:
+        document["cycle"] = cycle
+    document.update({
+        "codes": list(election_data),
+        "states": encode_table(list(election_data.values())),
+    })
+    if indexes is not None:
+        document["indexes"] = indexes
+    return document
+
+
+def decode_election_data(document):
+    """Turn a v2 document back into the elections.json structure."""
+    if document.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported election data format: {document.get('format')}")
+    data = {"lastUpdated": document.get("lastUpdated")}
+    if "cycle" in document:
+        data["cycle"] = document["cycle"]
+    data["electionData"] = dict(zip(document["codes"], decode_table(document["states"])))
+    if "indexes" in document:
+        data["indexes"] = document["indexes"]
+    return data
+
+
+def write_columnar(path, document):
+    """Write a v2 document without whitespace."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, separators=(",", ":"), ensure_ascii=False)
+
+
+def time_decode(decode, repeat):
+    """Best-of-N wall time of decode() in milliseconds."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        decode()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def benchmark(source, repeat=50):
+    """Compare size and decode time of elections.json against its v2 encoding.
+
+    "v1" is the file as published (indented); "v1-min" is the same data without
+    whitespace, which is the fairer size baseline.
+
+    Returns:
+        Dict of {"v1"|"v1-min"|"v2": {"bytes", "gzipBytes", "decodeMs"}}
+    """
+    with open(source, 'rb') as f:
+        v1_bytes = f.read()
+    v1 = json.loads(v1_bytes)
+    v1_min_bytes = json.dumps(v1, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    v2_bytes = json.dumps(
+        encode_election_data(v1["electionData"], v1.get("lastUpdated"), v1.get("indexes"), v1.get("cycle")),
+        separators=(",", ":"), ensure_ascii=False,
+    ).encode("utf-8")
+
+    if decode_election_data(json.loads(v2_bytes)) != v1:
+        raise ValueError("v2 encoding does not round-trip")
+
+    return {
+        "v1": {
+            "bytes": len(v1_bytes),
+            "gzipBytes": len(gzip.compress(v1_bytes)),
+            "decodeMs": time_decode(lambda: json.loads(v1_bytes), repeat),
+        },
+        "v1-min": {
+            "bytes": len(v1_min_bytes),
+            "gzipBytes": len(gzip.compress(v1_min_bytes)),
+            "decodeMs": time_decode(lambda: json.loads(v1_min_bytes), repeat),
+        },
+        "v2": {
+            "bytes": len(v2_bytes),
+            "gzipBytes": len(gzip.compress(v2_bytes)),
+            "decodeMs": time_decode(lambda: decode_election_data(json.loads(v2_bytes)), repeat),
+        },
+    }
+
+
+def print_benchmark(results):
+    """Print the benchmark comparison as a small table."""
+    print(f"{'format':<8}{'bytes':>10}{'gzip':>10}{'decode ms':>12}")
+    for name, result in results.items():
+        print(f"{name:<8}{result['bytes']:>10}{result['gzipBytes']:>10}{result['decodeMs']:>12.3f}")
+    v2 = results["v2"]
+    for name in ("v1", "v1-min"):
+        v1 = results[name]
+        print(f"v2 is {v2['bytes'] / v1['bytes']:.0%} of {name} ({v2['gzipBytes'] / v1['gzipBytes']:.0%} gzipped)")
+
+
+def main():
+    """Write the v2 file for a published elections.json, or benchmark the two formats."""
+    base_dir = Path(__file__).parent.parent
+    args = [arg for arg in sys.argv[1:] if arg != '--benchmark']
+    source = Path(args[0]) if args else base_dir / "docs" / "elections.json"
+
+    if '--benchmark' in sys.argv:
+        print_benchmark(benchmark(source))
+        return
+
+    output = Path(args[1]) if len(args) > 1 else source.with_name("elections.v2.json")
+    with open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    write_columnar(output, encode_election_data(data["electionData"], data.get("lastUpdated"),
+                                                data.get("indexes"), data.get("cycle")))
+    print(f"✅ Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
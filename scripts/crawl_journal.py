@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Crawl Journal
+Append-only record of which URLs a crawl has completed, failed or still has pending,
+together with the records extracted from them. A crawl that is interrupted (Chrome
+crash, reboot, or a --max-run-time limit) can be resumed from the journal instead of
+starting over from the first state.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from election_model import to_json
+
+BASE_DIR = Path(__file__).parent.parent
+JOURNAL_FILE = BASE_DIR / ".cache" / "crawl_journal.jsonl"
+
+PENDING = "pending"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class CrawlJournal:
+    def __init__(self, path=JOURNAL_FILE, resume=False, max_attempts=3):
+        """Open the journal.
+
+        Args:
+            path: Journal file (JSON Lines, one event per line)
+            resume: Replay the existing journal; otherwise start a fresh crawl. A journal
+                whose crawl finished (nothing pending or left to retry) is moved to
+                previous_path() and a fresh crawl started
+            max_attempts: Failed URLs are retried on resume until they fail this often
+        """
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.entries = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        if resume:
+            self.replay()
+            if self.entries and self.is_finished():
+                # Nothing left to resume: keep the finished crawl's journal aside and start over
+                os.replace(self.path, self.previous_path())
+                self.entries = {}
+                resume = False
+        self.file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        if resume and self.file.tell() and not self.ends_with_newline():
+            self.file.write("\n")  # End a truncated last line so the next event starts on its own
+
+    def ends_with_newline(self):
+        """Whether the journal file ends with a complete line."""
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def previous_path(self):
+        """Where the journal of the last finished crawl is kept."""
+        return self.path.with_name(f"{self.path.stem}.previous{self.path.suffix}")
+
+    def replay(self):
+        """Rebuild the latest state of every URL from the journal file."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue  # Truncated last line from a crash mid-write
+                    entry = self.entries.setdefault(event["url"], {"attempts": 0})
+                    entry.update(state=event["state"], status=event["status"])
+                    if event["status"] == COMPLETED:
+                        entry["record"] = event.get("record")
+                    elif event["status"] == FAILED:
+                        entry["attempts"] += 1
+                        entry["error"] = event.get("error")
+        except FileNotFoundError:
+            pass
+
+    def append(self, url, state, status, **fields):
+        """Append one event and flush it to disk."""
+        event = {"url": url, "state": state, "status": status, "ts": time.time(), **fields}
+        self.file.write(json.dumps(event, ensure_ascii=False, default=to_json) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+        entry = self.entries.setdefault(url, {"attempts": 0})
+        entry.update(state=state, status=status)
+        if status == COMPLETED:
+            entry["record"] = fields.get("record")
+        elif status == FAILED:
+            entry["attempts"] += 1
+            entry["error"] = fields.get("error")
+
+    def add_pending(self, jobs):
+        """Record (state, url) jobs that are not in the journal yet as pending."""
+        for state, url in jobs:
+            if url not in self.entries:
+                self.append(url, state, PENDING)
+
+    def mark_completed(self, url, state, record=None):
+        """Record that a URL was scraped, with the record extracted from it (if any)."""
+        self.append(url, state, COMPLETED, record=record)
+
+    def mark_failed(self, url, state, error):
+        """Record that scraping a URL failed."""
+        self.append(url, state, FAILED, error=str(error))
+
+    def should_skip(self, url):
+        """True if the URL is already completed or has used up its retries."""
+        entry = self.entries.get(url)
+        if not entry:
+            return False
+        return entry["status"] == COMPLETED or entry["attempts"] >= self.max_attempts
+
+    def is_finished(self):
+        """True if no URL is pending or still has retries left."""
+        return all(self.should_skip(url) for url in self.entries)
+
+    def completed_records(self):
+        """Yield (state, record) for every completed URL that produced a record."""
+        for entry in self.entries.values():
+            if entry["status"] == COMPLETED and entry.get("record"):
+                yield entry["state"], entry["record"]
+
+    def counts(self):
+        """Return the number of URLs in each status."""
+        counts = {PENDING: 0, COMPLETED: 0, FAILED: 0}
+        for entry in self.entries.values():
+            counts[entry["status"]] += 1
+        return counts
+
+    def close(self):
+        """Close the journal file."""
+        self.file.close()
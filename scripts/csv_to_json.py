@@ -6,9 +6,12 @@ Reads from the Elections and Logistics CSV files and generates elections.json
 
 import csv
 import json
-from datetime import datetime
+import sys
 from pathlib import Path
 
+from dates import date_info, normalize_date
+from election_model import Election, StateRecord
+
 # State code mapping
 STATE_CODES = {
     "Alabama": "AL", "Alaska": "AK", "Arizona": "AZ", "Arkansas": "AR", "California": "CA",
@@ -79,9 +82,14 @@ DEFAULT_REGISTRATION_SITES = {
     "WY": "https://sos.wyo.gov/Elections/State/RegisteringToVote.aspx"
 }
 
-def parse_elections_csv(csv_path):
-    """Parse the Elections CSV and extract election data by state."""
+def parse_elections_csv(csv_path, election_day):
+    """Parse the Elections CSV and extract election data by state.
+    
+    Races are dated on election_day (e.g. "November 4, 2025") unless the CSV notes
+    another day, such as "(12/02)", which is taken to be in the same year.
+    """
     elections_by_state = {}
+    year = normalize_date(election_day).iso[:4]
     
     with open(csv_path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
@@ -100,41 +108,41 @@ def parse_elections_csv(csv_path):
             
             # Check Gubernatorial
             if row.get('Gubernatorial?', '').strip().upper() == 'YES':
-                elections.append({
-                    "title": "Governor",
-                    "date": "November 4, 2025",
-                    "type": "General Election",
-                    "candidates": [],
-                    "stakes": "Open seat gubernatorial race.",
-                    "chamberImpact": "State",
-                    "competitive": True
-                })
+                elections.append(Election(
+                    title="Governor",
+                    date=election_day,
+                    type="General Election",
+                    candidates=[],
+                    stakes="Open seat gubernatorial race.",
+                    chamberImpact="State",
+                    competitive=True
+                ))
             
             # Check House of Representatives
             house_info = row.get('House of Reps?', '').strip()
             if house_info and house_info not in ['', 'N/A']:
-                elections.append({
-                    "title": f"U.S. House - {house_info}",
-                    "date": "November 4, 2025" if "(12/02)" not in house_info else "December 2, 2025",
-                    "type": "General Election" if "(12/02)" not in house_info else "Special Election",
-                    "candidates": [],
-                    "stakes": house_info.replace("(12/02)", "").strip(),
-                    "chamberImpact": "House",
-                    "competitive": True
-                })
+                elections.append(Election(
+                    title=f"U.S. House - {house_info}",
+                    date=election_day if "(12/02)" not in house_info else f"December 2, {year}",
+                    type="General Election" if "(12/02)" not in house_info else "Special Election",
+                    candidates=[],
+                    stakes=house_info.replace("(12/02)", "").strip(),
+                    chamberImpact="House",
+                    competitive=True
+                ))
             
             # Check Referendums
             referendum_info = row.get('Statewide Referendums?', '').strip()
             if referendum_info and referendum_info not in ['', 'N/A']:
-                elections.append({
-                    "title": referendum_info,
-                    "date": "November 4, 2025",
-                    "type": "Referendum",
-                    "candidates": [],
-                    "stakes": "Statewide ballot measures.",
-                    "chamberImpact": "State",
-                    "competitive": False
-                })
+                elections.append(Election(
+                    title=referendum_info,
+                    date=election_day,
+                    type="Referendum",
+                    candidates=[],
+                    stakes="Statewide ballot measures.",
+                    chamberImpact="State",
+                    competitive=False
+                ))
             
             # Check Other Relevant elections
             other_info = row.get('Other Relevant?', '').strip()
@@ -171,34 +179,59 @@ def parse_elections_csv(csv_path):
                         competitive = True
                     
                     # Extract date if present
-                    date = "November 4, 2025"
+                    date = election_day
                     if "(11/15)" in election_title:
-                        date = "November 15, 2025"
+                        date = f"November 15, {year}"
                     elif "(12/09)" in election_title:
-                        date = "December 9, 2025"
+                        date = f"December 9, {year}"
                     
                     election_title = election_title.replace("(11/15)", "").replace("(12/09)", "").strip()
                     
-                    elections.append({
-                        "title": election_title,
-                        "date": date,
-                        "type": election_type,
-                        "candidates": [],
-                        "stakes": election_title,
-                        "chamberImpact": chamber,
-                        "competitive": competitive
-                    })
+                    elections.append(Election(
+                        title=election_title,
+                        date=date,
+                        type=election_type,
+                        candidates=[],
+                        stakes=election_title,
+                        chamberImpact=chamber,
+                        competitive=competitive
+                    ))
             
             if elections:
-                elections_by_state[state_code] = {
-                    "stateName": state_name,
-                    "elections": elections
-                }
+                elections_by_state[state_code] = StateRecord(stateName=state_name, elections=elections)
     
     return elections_by_state
 
-def parse_logistics_csv(csv_path):
-    """Parse the Logistics CSV and extract registration info."""
+def load_curated_json(json_path):
+    """Load a hand-maintained electionData file (state code -> state record).
+
+    Elections listed without candidates get an empty list, like the CSV's.
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        curated = json.load(f)
+    for state_data in curated.values():
+        for election in state_data.get("elections", []):
+            election.setdefault("candidates", [])
+    return {state_code: StateRecord.from_dict(state_data) for state_code, state_data in curated.items()}
+
+def logistics_state_code(state_name):
+    """State code for a Logistics CSV state name such as "ALASKA*" or "DC (District of Columbia)"."""
+    # Handle special cases
+    if state_name.upper().startswith("DC"):
+        return "DC"
+    # Clean state name (remove asterisks, etc.) and convert to title case
+    clean_name = state_name.replace("*", "").strip()
+    # Handle special formatting
+    if "\n" in clean_name:
+        clean_name = clean_name.split("\n")[0].strip()
+    # Convert to title case for matching
+    return STATE_CODES.get(clean_name.title())
+
+def parse_logistics_csv(csv_path, election_day):
+    """Parse the Logistics CSV and extract registration info.
+    
+    States without a registration deadline get election_day.
+    """
     logistics_by_state = {}
     
     with open(csv_path, 'r', encoding='utf-8') as f:
@@ -209,19 +242,7 @@ def parse_logistics_csv(csv_path):
             if not state_name or state_name.startswith('**'):
                 continue
             
-            # Handle special cases
-            if state_name.upper().startswith("DC"):
-                state_code = "DC"
-            else:
-                # Clean state name (remove asterisks, etc.) and convert to title case
-                clean_name = state_name.replace("*", "").strip()
-                # Handle special formatting
-                if "\n" in clean_name:
-                    clean_name = clean_name.split("\n")[0].strip()
-                # Convert to title case for matching
-                clean_name = clean_name.title()
-                state_code = STATE_CODES.get(clean_name)
-            
+            state_code = logistics_state_code(state_name)
             if not state_code:
                 print(f"Warning: Unknown state in logistics '{state_name}'")
                 continue
@@ -234,72 +255,127 @@ def parse_logistics_csv(csv_path):
             
             logistics_by_state[state_code] = {
                 "registrationWebsite": registration_website if registration_website.startswith('http') else "",
-                "registrationDeadline": deadline if deadline else "November 4, 2025"
+                "registrationDeadline": deadline if deadline else election_day
             }
     
     return logistics_by_state
 
-def merge_data(elections_data, logistics_data):
-    """Merge elections and logistics data, including all states."""
+# Race types in the general election CSV, keyed by the name used in the data export
+GENERAL_RACE_COLUMNS = {
+    "Senate": "Senate",
+    "Governor": "Gubernatorial",
+    "Court": "Court",
+}
+
+def parse_general_election_csv(csv_path):
+    """Parse the general election CSV and extract each state's key dates and race types."""
+    general_by_state = {}
+    
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        
+        for row in reader:
+            state_name = row.get('State', '').strip()
+            state_code = STATE_CODES.get(state_name)
+            if not state_code:
+                if state_name:
+                    print(f"Warning: Unknown state in general election CSV '{state_name}'")
+                continue
+            
+            key_dates = {
+                "registrationDeadline": date_info(row.get('Registration Deadline')),
+                "primary": date_info(row.get('Primary Date')),
+                "general": date_info(row.get('General Election Date')),
+            }
+            general_by_state[state_code] = {
+                "keyDates": {name: info for name, info in key_dates.items() if info},
+                "generalRaces": [race for race, column in GENERAL_RACE_COLUMNS.items()
+                                 if row.get(column, '').strip() not in ('', '0')]
+            }
+    
+    return general_by_state
+
+def merge_data(elections_data, logistics_data, general_data=None, election_day="", dead_links=None,
+               curated_data=None):
+    """Merge elections and logistics data, including all states.
+    
+    The registration deadline comes from the curated data, then the logistics data,
+    then from the general election CSV's key dates, then defaults to election_day.
+    Registration websites listed in dead_links (from link_checker.py) are replaced
+    by the state's default when that one is not dead too. Curated states also keep
+    their other fields (electionInfoUrl, electionsOver) and list their elections
+    before the CSV's.
+    """
+    dead_links = set(dead_links or ())
+    curated_data = curated_data or {}
     merged = {}
     
     # Start with ALL states from STATE_CODES
     for state_name, state_code in STATE_CODES.items():
         # Get logistics info if available
         logistics = logistics_data.get(state_code, {})
+        curated = curated_data.get(state_code, {})
         
-        # Get registration website (CSV first, then default)
-        registration_website = logistics.get("registrationWebsite", "")
+        # Get registration website (curated, then CSV, then default)
+        registration_website = curated.get("registrationWebsite") or logistics.get("registrationWebsite", "")
         if not registration_website or not registration_website.startswith('http'):
             registration_website = DEFAULT_REGISTRATION_SITES.get(state_code, "")
+        elif registration_website in dead_links:
+            default_website = DEFAULT_REGISTRATION_SITES.get(state_code, "")
+            if default_website and default_website not in dead_links:
+                registration_website = default_website
         
-        merged[state_code] = {
-            "stateName": state_name,
-            "registrationWebsite": registration_website,
-            "registrationDeadline": logistics.get("registrationDeadline", "November 4, 2025"),
-            "elections": []
-        }
+        registration_deadline = curated.get("registrationDeadline") or logistics.get("registrationDeadline")
+        if not registration_deadline:
+            general_deadline = (general_data or {}).get(state_code, {}).get("keyDates", {}).get("registrationDeadline")
+            registration_deadline = general_deadline and (general_deadline["iso"] or general_deadline["display"])
+        
+        merged[state_code] = StateRecord(
+            stateName=state_name,
+            registrationWebsite=registration_website,
+            registrationDeadline=registration_deadline or election_day,
+            elections=[Election.from_dict(election) for election in curated.get("elections", [])]
+        )
+        for field, value in curated.items():
+            if field not in ("stateName", "registrationWebsite", "registrationDeadline", "elections"):
+                merged[state_code][field] = value
     
     # Then, add elections for states that have them
     for state_code, election_info in elections_data.items():
         if state_code in merged:
-            merged[state_code]["elections"] = election_info["elections"]
+            merged[state_code]["elections"] = merged[state_code]["elections"] + list(election_info["elections"])
+    
+    # Key dates and race types from the general election CSV
+    for state_code, general_info in (general_data or {}).items():
+        if state_code in merged:
+            merged[state_code]["keyDates"] = general_info["keyDates"]
+            merged[state_code]["generalRaces"] = general_info["generalRaces"]
     
     return merged
 
 def main():
-    """Main function to convert CSV to JSON."""
-    # Paths
-    base_dir = Path(__file__).parent.parent
-    elections_csv = base_dir / "data" / "2025 Off-Year Elections - Elections.csv"
-    logistics_csv = base_dir / "data" / "2025 Off-Year Elections - Logistics.csv"
-    output_json = base_dir / "docs" / "elections.json"
-    web_json = base_dir / "web" / "elections.json"
-    
-    print(f"Reading election data from: {elections_csv}")
-    print(f"Reading logistics data from: {logistics_csv}")
-    
-    # Parse CSV files
-    elections_data = parse_elections_csv(elections_csv)
-    logistics_data = parse_logistics_csv(logistics_csv)
+    """Main function to convert CSV to JSON.
     
-    print(f"Found election data for {len(elections_data)} states")
-    print(f"Found logistics data for {len(logistics_data)} states")
+    Runs the non-scraping steps of pipeline.py for the current cycle (or the one
+    given with --cycle ID), so the CSVs are only re-parsed and the outputs only
+    rewritten when one of their inputs changed. Pass --force to rebuild everything
+    anyway.
+    """
+    from pipeline import default_config, build_steps, build_artifact, run_pipeline, read_json
     
-    # Merge data
-    merged_data = merge_data(elections_data, logistics_data)
+    cycle = sys.argv[sys.argv.index('--cycle') + 1] if '--cycle' in sys.argv[:-1] else None
+    config = default_config(cycle=cycle)
+    print(f"Building the {config['cycle_label']}")
+    print(f"Reading election data from: {config['elections_csv']}")
+    print(f"Reading logistics data from: {config['logistics_csv']}")
     
-    # Create final JSON structure
-    final_json = {
-        "lastUpdated": datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"),
-        "electionData": merged_data
-    }
+    if config["frozen"] and all(Path(target).exists() for target in config["publish_targets"]):
+        print(f"🧊 {config['cycle_label']} are frozen; not rebuilding")
+        return
     
-    # Write to both locations
-    for output_file in [output_json, web_json]:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(final_json, f, indent=2, ensure_ascii=False)
-        print(f"✅ Written to: {output_file}")
+    force = ['ingest', 'export', 'publish'] if '--force' in sys.argv else []
+    run_pipeline(build_steps(config), config, state_file=config["state_file"], force=force)
+    merged_data = read_json(build_artifact(config, "merged.json"))
     
     # Print summary
     print(f"\n📊 Summary:")
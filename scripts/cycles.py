@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Election Cycles
+Declares each election cycle's inputs and where its data is published. The
+build, the scrapers and the site all work on one cycle at a time:
+
+- The newest declared cycle is the current one. It is published as
+  docs/elections.json (and web/elections.json) with its search index in
+  docs/search, which is all the site loads by default.
+- Every other cycle is published under docs/cycles/<id>/ and shown on the site
+  with ?cycle=<id>.
+- Frozen cycles are never re-parsed or re-scraped: once their published files
+  exist the build skips them entirely.
+
+To start a new cycle, add it to CYCLES and mark the previous one frozen when its
+data is final.
+"""
+
+import json
+from pathlib import Path
+
+from dates import normalize_date
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+DOCS_DIR = BASE_DIR / "docs"
+CYCLES_MANIFEST = DOCS_DIR / "cycles.json"
+
+# Inputs set to None are not used by that cycle. curated_json is a hand-maintained
+# electionData file (state fields and elections) the build starts from.
+CYCLES = {
+    "2025": {
+        "label": "2025 Off-Year Elections",
+        "electionDay": "November 4, 2025",
+        "elections_csv": DATA_DIR / "2025 Off-Year Elections - Elections.csv",
+        "logistics_csv": DATA_DIR / "2025 Off-Year Elections - Logistics.csv",
+        "curated_json": None,
+        "general_csv": None,
+        "fec_candidates": None,
+        "fec_committees": None,
+        "frozen": True,
+    },
+    "2026": {
+        "label": "2026 Elections",
+        "electionDay": "November 3, 2026",
+        "elections_csv": None,
+        "logistics_csv": None,
+        "curated_json": DATA_DIR / "2026 Elections - Curated.json",
+        "general_csv": BASE_DIR / "general_election.csv",
+        "fec_candidates": DATA_DIR / "fec" / "cn.txt",
+        "fec_committees": DATA_DIR / "fec" / "cm.txt",
+        "frozen": False,
+    },
+}
+
+
+def current_cycle_id():
+    """The newest declared cycle."""
+    return max(CYCLES, key=int)
+
+
+def get_cycle(cycle_id=None):
+    """Return a cycle's declaration plus its id, year and parsed election day.
+
+    Args:
+        cycle_id: Cycle id such as "2026", a cycle dict (returned unchanged) or None for the current cycle
+
+    Raises:
+        KeyError: if the cycle is not declared
+    """
+    if isinstance(cycle_id, dict):
+        return cycle_id
+    cycle_id = str(cycle_id or current_cycle_id())
+    if cycle_id not in CYCLES:
+        raise KeyError(f"Unknown election cycle {cycle_id!r} (declared: {', '.join(sorted(CYCLES))})")
+
+    cycle = dict(CYCLES[cycle_id])
+    election_day = normalize_date(cycle["electionDay"])
+    cycle.update(
+        id=cycle_id,
+        year=int(election_day.iso[:4]),
+        electionDate=election_day.iso,
+        current=cycle_id == current_cycle_id(),
+    )
+    return cycle
+
+
+def latest_input(key, cycle_id=None):
+    """The given input of a cycle, or of the newest earlier cycle that declares it.
+
+    Used for reference data that carries over between cycles, such as the state
+    election websites in the logistics CSV.
+    """
+    cycle_id = get_cycle(cycle_id)["id"]
+    for candidate in sorted((c for c in CYCLES if int(c) <= int(cycle_id)), key=int, reverse=True):
+        if CYCLES[candidate].get(key):
+            return CYCLES[candidate][key]
+    return None
+
+
+def in_cycle(cycle, value):
+    """Whether a date string falls in the cycle's year (undated values such as "same-day" always do)."""
+    normalized = normalize_date(value)
+    if normalized is None:
+        return False
+    return normalized.iso is None or normalized.iso[:4] == str(get_cycle(cycle)["year"])
+
+
+def output_dir(cycle_id=None):
+    """Site directory (under docs/) holding a cycle's published files."""
+    cycle = get_cycle(cycle_id)
+    return DOCS_DIR if cycle["current"] else DOCS_DIR / "cycles" / cycle["id"]
+
+
+def publish_targets(cycle_id=None):
+    """Every elections.json a cycle is published to."""
+    cycle = get_cycle(cycle_id)
+    targets = [output_dir(cycle) / "elections.json"]
+    if cycle["current"]:
+        targets.append(BASE_DIR / "web" / "elections.json")
+    return targets
+
+
+def search_dir(cycle_id=None):
+    """Directory of a cycle's client-side search index."""
+    return output_dir(cycle_id) / "search"
+
+
+def calendar_dir(cycle_id=None):
+    """Directory of a cycle's calendar feeds and timeline."""
+    return output_dir(cycle_id) / "calendar"
+
+
+def cycle_summary(cycle_id=None):
+    """The cycle fields exported with the data, for the site."""
+    cycle = get_cycle(cycle_id)
+    return {"id": cycle["id"], "label": cycle["label"], "electionDay": cycle["electionDay"]}
+
+
+def write_cycles_manifest(path=CYCLES_MANIFEST):
+    """Write the list of cycles and their site paths, for ?cycle= on the site."""
+    manifest = {"current": current_cycle_id(), "cycles": []}
+    for cycle_id in sorted(CYCLES, key=int, reverse=True):
+        cycle = get_cycle(cycle_id)
+        base = "" if cycle["current"] else f"cycles/{cycle_id}/"
+        manifest["cycles"].append({
+            **cycle_summary(cycle),
+            "frozen": cycle["frozen"],
+            "data": f"{base}elections.json",
+            "search": f"{base}search/",
+            "calendar": f"{base}calendar/",
+        })
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    return manifest
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Date Normalization
+Turns the many date formats in our inputs ("10/21/25", "November 4, 2025",
+"2026-06-01", "same-day", ...) into one typed value with an ISO date, a display
+string and a flag for special values. Results are cached, so each distinct input
+string is parsed once per build and the same immutable object is shared by every
+record that uses it.
+"""
+
+import re
+from collections import namedtuple
+from datetime import date, datetime
+from functools import lru_cache
+
+# iso: "YYYY-MM-DD" or None; display: preformatted text for the site;
+# flag: None for ordinary dates, otherwise "same-day" or "unparsed"
+NormalizedDate = namedtuple("NormalizedDate", ["iso", "display", "flag"])
+
+SAME_DAY = "same-day"
+UNPARSED = "unparsed"
+
+# Values meaning "you can register up to and including election day"
+SAME_DAY_VALUES = {"same-day", "same day", "same-day registration", "election day", "any time before"}
+
+MONTH_ABBREVIATIONS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+ISO_PATTERN = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})")
+NUMERIC_PATTERN = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{2}|\d{4})$")
+TEXT_FORMATS = ["%B %d, %Y", "%b %d, %Y", "%b. %d, %Y", "%B %d %Y", "%b %d %Y"]
+
+
+def format_display(value):
+    """Format a date the way the site shows it: "Jun 1, 2026"."""
+    return f"{MONTH_ABBREVIATIONS[value.month - 1]} {value.day}, {value.year}"
+
+
+def format_long(value):
+    """Format a date with the full month name: "June 1, 2026"."""
+    return f"{value.strftime('%B')} {value.day}, {value.year}"
+
+
+def parse_date(value):
+    """Parse a date string into a datetime.date, or None if it is not a recognized format."""
+    text = value.strip()
+
+    match = ISO_PATTERN.match(text)
+    if match:
+        year, month, day = (int(part) for part in match.groups())
+        return date(year, month, day)
+
+    match = NUMERIC_PATTERN.match(text)
+    if match:
+        month, day, year = (int(part) for part in match.groups())
+        if year < 100:
+            year += 2000
+        return date(year, month, day)
+
+    for fmt in TEXT_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=None)
+def normalize_date(value):
+    """Normalize one raw date value.
+
+    Returns:
+        NormalizedDate, or None for an empty value
+    """
+    if value is None or not str(value).strip():
+        return None
+    text = str(value).strip()
+
+    if text.lower() in SAME_DAY_VALUES:
+        return NormalizedDate(None, "Same-day registration", SAME_DAY)
+
+    try:
+        parsed = parse_date(text)
+    except ValueError:
+        parsed = None  # Out-of-range values such as 2/30/26
+    if parsed is None:
+        return NormalizedDate(None, text, UNPARSED)
+    return NormalizedDate(parsed.isoformat(), format_display(parsed), None)
+
+
+def date_info(value):
+    """Return a normalized date as a JSON-ready dict, or None for an empty value."""
+    normalized = normalize_date(value)
+    if normalized is None:
+        return None
+    info = {"iso": normalized.iso, "display": normalized.display}
+    if normalized.flag:
+        info["flag"] = normalized.flag
+    return info
+
+
+def annotate_state_dates(state_data):
+    """Add precomputed ISO and display fields to a per-state record, in place.
+
+    Adds registrationDeadlineISO/registrationDeadlineDisplay (plus
+    registrationDeadlineFlag for special values) to the state and
+    dateISO/dateDisplay to each election. The original strings are kept.
+    """
+    deadline = normalize_date(state_data.get("registrationDeadline"))
+    if deadline:
+        state_data["registrationDeadlineISO"] = deadline.iso
+        state_data["registrationDeadlineDisplay"] = deadline.display
+        if deadline.flag:
+            state_data["registrationDeadlineFlag"] = deadline.flag
+
+    for election in state_data.get("elections", []):
+        election_date = normalize_date(election.get("date"))
+        if election_date:
+            election["dateISO"] = election_date.iso
+            election["dateDisplay"] = election_date.display
+    return state_data
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Discovery Crawler
+Finds the pages of each state's election website that actually list races and
+election dates. The logistics CSV only gives one root URL per state; the useful
+pages are usually two or three links below it.
+
+From each root the crawler runs a polite, bounded breadth-first crawl over plain
+HTTP (no browser):
+
+- URLs are canonicalized (case, default ports, fragments, tracking parameters,
+  query order) so the same page is only fetched once.
+- Visited URLs are kept in a set, or a Bloom filter for very large crawls.
+- Depth, page and time budgets bound every state's crawl.
+- robots.txt is fetched once per host, cached, and obeyed, including Crawl-delay.
+- Within each depth, links whose text and URL look most relevant are fetched
+  first, so the page budget is spent on the likeliest pages.
+
+Every fetched page is scored with relevance.py and the top candidates per state
+are written to .cache/discovery.json for the scraper to extract from.
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import re
+import time
+from collections import namedtuple
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ballotpedia_api import USER_AGENT
+from relevance import is_relevant, score_page
+from run_metrics import RunMetrics
+
+BASE_DIR = Path(__file__).parent.parent
+DISCOVERY_FILE = BASE_DIR / ".cache" / "discovery.json"
+
+# Per-state budgets
+MAX_DEPTH = 3
+MAX_PAGES = 40
+MAX_SECONDS = 120
+TOP_K = 5
+# Larger pages are not read past this size
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+# Seconds between requests to the same host, unless robots.txt asks for more
+CRAWL_DELAY = 1.0
+# robots.txt is fetched again after this many seconds
+ROBOTS_TTL = 24 * 60 * 60
+# Crawls expected to visit more URLs than this use a Bloom filter instead of a set
+BLOOM_MIN_CAPACITY = 100_000
+
+# Query parameters that never change the page
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|gclid|fbclid|msclkid|mc_cid|mc_eid|_ga|sessionid|jsessionid|phpsessid|sid)$",
+                             re.IGNORECASE)
+# Links to files that are not HTML pages
+SKIPPED_EXTENSIONS = re.compile(r"\.(pdf|docx?|xlsx?|pptx?|csv|zip|jpe?g|png|gif|svg|mp3|mp4|mov|ics|xml|json)$",
+                                re.IGNORECASE)
+URL_WORD_SEPARATORS = re.compile(r"[-_/.=&?+%]+")
+LINK_TAG = re.compile(r"<a\s[^>]*?href\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))[^>]*>(.*?)</a>",
+                      re.IGNORECASE | re.DOTALL)
+
+Candidate = namedtuple("Candidate", "url depth score")
+
+
+def canonicalize_url(url, base=None):
+    """Canonical form of a (possibly relative) URL, or None if it is not an http(s) page.
+
+    Lowercases the scheme and host, drops default ports, fragments, tracking
+    parameters and empty query values, sorts the query, and collapses repeated
+    slashes in the path.
+    """
+    url = urljoin(base, url.strip()) if base else url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+    if parts.scheme.lower() not in ("http", "https") or not parts.hostname:
+        return None
+
+    scheme = parts.scheme.lower()
+    host = parts.hostname.lower().rstrip(".")
+    if port and not (scheme == "http" and port == 80 or scheme == "https" and port == 443):
+        host = f"{host}:{port}"
+    path = re.sub(r"/{2,}", "/", parts.path) or "/"
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if value and not TRACKING_PARAMS.match(key))
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def site_host(url):
+    """Host of a URL without "www.", for same-site checks."""
+    host = urlsplit(url).hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def is_same_site(url, root_host):
+    """Whether a URL is on the root's host or one of its subdomains."""
+    host = site_host(url)
+    return host == root_host or host.endswith("." + root_host)
+
+
+class BloomFilter:
+    """Fixed-size set membership with a small false-positive rate and no false negatives."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        """Size the filter for the expected number of items.
+
+        Args:
+            capacity: Expected number of items
+            error_rate: Acceptable false-positive rate at that capacity
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, item):
+        """Bit positions of an item (double hashing over one digest)."""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        """Add an item to the filter."""
+        for position in self.positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(item))
+
+    def __len__(self):
+        return self.count
+
+
+def make_seen_set(expected_urls):
+    """A plain set for normal crawls, a Bloom filter for very large ones."""
+    if expected_urls > BLOOM_MIN_CAPACITY:
+        return BloomFilter(expected_urls)
+    return set()
+
+
+class RobotsCache:
+    """robots.txt rules per host, fetched once and reused until they expire."""
+
+    def __init__(self, session, user_agent=USER_AGENT, ttl=ROBOTS_TTL, timeout=10):
+        self.session = session
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.timeout = timeout
+        self.rules = {}
+        self.fetches = 0
+
+    def get(self, url):
+        """The parsed robots.txt for a URL's host."""
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        cached = self.rules.get(origin)
+        if cached and time.time() - cached[0] < self.ttl:
+            return cached[1]
+
+        parser = RobotFileParser(origin + "/robots.txt")
+        self.fetches += 1
+        try:
+            response = self.session.get(origin + "/robots.txt", timeout=self.timeout)
+            if response.status_code in (401, 403):
+                parser.disallow_all = True
+            elif response.status_code >= 400:
+                parser.allow_all = True
+            else:
+                parser.parse(response.text.splitlines())
+        except requests.RequestException:
+            # Unreachable robots.txt: assume the site allows crawling
+            parser.allow_all = True
+        self.rules[origin] = (time.time(), parser)
+        return parser
+
+    def allowed(self, url):
+        """Whether robots.txt lets us fetch the URL."""
+        return self.get(url).can_fetch(self.user_agent, url)
+
+    def crawl_delay(self, url):
+        """The host's Crawl-delay in seconds, if it sets one."""
+        try:
+            return self.get(url).crawl_delay(self.user_agent)
+        except AttributeError:
+            return None
+
+
+def link_priority(url, anchor_text, cycle=None):
+    """How promising a link looks, from its anchor text and the words in its URL."""
+    path_words = URL_WORD_SEPARATORS.sub(" ", urlsplit(url).path + " " + urlsplit(url).query)
+    return score_page(f"{anchor_text} {path_words}", cycle).score
+
+
+def extract_links(html, base_url):
+    """(absolute_url, anchor_text) for every link in an HTML page."""
+    links = []
+    for match in LINK_TAG.finditer(html):
+        href = next(group for group in match.groups()[:3] if group is not None)
+        text = " ".join(re.sub(r"<[^>]+>", " ", match.group(4)).split())
+        links.append((urljoin(base_url, href), text))
+    return links
+
+
+class DiscoveryCrawler:
+    def __init__(self, cycle=None, max_depth=MAX_DEPTH, max_pages=MAX_PAGES, max_seconds=MAX_SECONDS,
+                 top_k=TOP_K, crawl_delay=CRAWL_DELAY, timeout=15, session=None, metrics=None):
+        """Create a crawler sharing one pooled HTTP session and robots.txt cache across states.
+
+        Args:
+            cycle: Election cycle whose year counts toward page relevance
+            max_depth: Links followed from the root (the root is depth 0)
+            max_pages: Pages fetched per state
+            max_seconds: Time budget per state
+            top_k: Candidate pages kept per state
+            crawl_delay: Minimum seconds between requests to one host
+            timeout: Seconds per HTTP request
+            session: Existing requests.Session to use instead of creating one
+            metrics: RunMetrics to record counters in
+        """
+        self.cycle = cycle
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.max_seconds = max_seconds
+        self.top_k = top_k
+        self.crawl_delay = crawl_delay
+        self.timeout = timeout
+        self.metrics = metrics or RunMetrics("discovery_crawler")
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+        self.session = session
+        self.robots = RobotsCache(session, timeout=timeout)
+        self.last_request = {}
+
+    def wait_for_host(self, url):
+        """Sleep until the host's crawl delay has passed since our last request to it."""
+        host = urlsplit(url).netloc
+        delay = max(self.crawl_delay, self.robots.crawl_delay(url) or 0)
+        elapsed = time.time() - self.last_request.get(host, 0)
+        if elapsed < delay:
+            time.sleep(delay - elapsed)
+        self.last_request[host] = time.time()
+
+    def fetch(self, url):
+        """Fetch an HTML page, returning (final_url, html) or None for errors and non-HTML responses."""
+        self.wait_for_host(url)
+        try:
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                self.metrics.increment("discovery_requests")
+                if response.status_code >= 400:
+                    self.metrics.increment("discovery_errors")
+                    return None
+                if "html" not in response.headers.get("Content-Type", "text/html").lower():
+                    self.metrics.increment("discovery_non_html")
+                    return None
+                chunks = []
+                size = 0
+                for chunk in response.iter_content(64 * 1024):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= MAX_PAGE_BYTES:
+                        break
+                encoding = response.encoding or "utf-8"
+                return response.url, b"".join(chunks).decode(encoding, errors="replace")
+        except requests.RequestException as e:
+            print(f"  Could not fetch {url}: {e}")
+            self.metrics.increment("discovery_errors")
+            return None
+
+    def discover(self, root_url, seen=None):
+        """Crawl outward from a root URL and return its top Candidate pages, most relevant first.
+
+        Args:
+            root_url: The state's election website
+            seen: Set-like of canonical URLs already visited (default: a new set)
+        """
+        root = canonicalize_url(root_url)
+        if root is None:
+            return []
+        root_host = site_host(root)
+        seen = make_seen_set(self.max_pages * 50) if seen is None else seen
+        deadline = time.time() + self.max_seconds if self.max_seconds else None
+
+        # Breadth-first by depth; within a depth, most promising links first
+        frontier = [(0, 0.0, 0, root)]
+        seen.add(root)
+        order = 1
+        fetched = 0
+        candidates = []
+
+        while frontier and fetched < self.max_pages:
+            if deadline and time.time() > deadline:
+                self.metrics.increment("discovery_timeouts")
+                break
+            depth, _, _, url = heapq.heappop(frontier)
+
+            if not self.robots.allowed(url):
+                self.metrics.increment("discovery_robots_blocked")
+                continue
+            page = self.fetch(url)
+            fetched += 1
+            if page is None:
+                continue
+            final_url, html = page
+
+            relevance = score_page(html, self.cycle)
+            candidates.append(Candidate(canonicalize_url(final_url) or url, depth, relevance.score))
+
+            if depth >= self.max_depth:
+                continue
+            for link, text in extract_links(html, final_url):
+                link = canonicalize_url(link)
+                if link is None or link in seen or not is_same_site(link, root_host):
+                    continue
+                if SKIPPED_EXTENSIONS.search(urlsplit(link).path):
+                    continue
+                seen.add(link)
+                heapq.heappush(frontier, (depth + 1, -link_priority(link, text, self.cycle), order, link))
+                order += 1
+
+        self.metrics.increment("discovery_pages", fetched)
+        relevant = [candidate for candidate in candidates if is_relevant(candidate.score)]
+        return heapq.nlargest(self.top_k, relevant, key=lambda candidate: (candidate.score, -candidate.depth))
+
+    def discover_all(self, sites):
+        """Discover candidate pages for every state.
+
+        Args:
+            sites: Dict of state code -> root URL
+
+        Returns:
+            Dict of state code -> list of Candidate, most relevant first
+        """
+        results = {}
+        for state_code, root_url in sites.items():
+            print(f"Discovering election pages for {state_code} from {root_url}...")
+            try:
+                results[state_code] = self.discover(root_url)
+            except Exception as e:
+                print(f"Error discovering pages for {state_code}: {e}")
+                results[state_code] = []
+            print(f"✓ {len(results[state_code])} candidate page(s) for {state_code}")
+        return results
+
+    def close(self):
+        """Close the HTTP session."""
+        self.session.close()
+
+
+def save_discovery(results, path=DISCOVERY_FILE):
+    """Write discovered candidates as JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {state: [candidate._asdict() for candidate in candidates] for state, candidates in results.items()}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    return path
+
+
+def load_discovery(path=DISCOVERY_FILE):
+    """Candidate page URLs per state from the last discovery run, most relevant first."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {state: [candidate["url"] for candidate in candidates] for state, candidates in data.items()}
+
+
+def main():
+    """Discover candidate election pages for every state in the logistics CSV."""
+    import sys
+    from election_scraper import ElectionScraper
+
+    cycle = None
+    if '--cycle' in sys.argv:
+        index = sys.argv.index('--cycle')
+        if index + 1 < len(sys.argv):
+            cycle = sys.argv[index + 1]
+
+    scraper = ElectionScraper(cycle=cycle)
+    crawler = DiscoveryCrawler(cycle=scraper.cycle["id"])
+    try:
+        results = crawler.discover_all(scraper.state_election_sites)
+    finally:
+        crawler.close()
+    path = save_discovery(results)
+    print(f"📁 Candidate pages written to {path}")
+    print(f"Crawl counters: {crawler.metrics.counters}")
+
+
+if __name__ == "__main__":
+    main()
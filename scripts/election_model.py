@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Election Data Model
+Compact in-memory records for elections.json data. States, elections and
+candidates are __slots__ objects instead of dicts; the repeated values (election
+type, chamber, party) are enum members shared by every record, and titles and
+dates are interned so equal strings are stored once.
+
+Records keep the dict-style access the rest of the scripts use
+(record["elections"], election.get("date"), setdefault, ...), keyed by the JSON
+field names, and convert losslessly to and from the JSON shape: fields the model
+does not know about (keyDates, dateISO, fecId, ...) are kept in an `extra` dict.
+Pass `default=to_json` to json.dump to serialize them.
+"""
+
+import sys
+from enum import Enum
+
+from dates import normalize_date
+
+
+class CodedValue(str, Enum):
+    """String enum that formats and serializes as its plain value."""
+
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+
+class ElectionType(CodedValue):
+    GENERAL = "General Election"
+    SPECIAL = "Special Election"
+    PRIMARY = "Primary Election"
+    RUNOFF = "Runoff Election"
+    REFERENDUM = "Referendum"
+
+
+class Chamber(CodedValue):
+    SENATE = "Senate"
+    HOUSE = "House"
+    STATE = "State"
+    LOCAL = "Local"
+
+
+class Party(CodedValue):
+    DEMOCRATIC = "Democratic"
+    REPUBLICAN = "Republican"
+    INDEPENDENT = "Independent"
+    GREEN = "Green"
+    LIBERTARIAN = "Libertarian"
+
+
+def coded(enum_class, value):
+    """Return the enum member for a value, or the interned value if it is not one."""
+    if value is None or isinstance(value, enum_class):
+        return value
+    try:
+        return enum_class(value)
+    except ValueError:
+        return sys.intern(value) if isinstance(value, str) else value
+
+
+def interned(value):
+    """Intern a string so repeated values share one object."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Record:
+    """Base for slotted records with dict-style access by JSON field name.
+
+    Subclasses list their known fields in FIELDS as (json key, attribute,
+    converter) in JSON key order. Unset fields are omitted from to_dict().
+    """
+
+    __slots__ = ("extra",)
+    FIELDS = ()
+
+    def __init_subclass__(cls):
+        super().__init_subclass__()
+        cls.ATTRIBUTES = {key: attribute for key, attribute, convert in cls.FIELDS}
+        cls.CONVERTERS = {key: convert for key, attribute, convert in cls.FIELDS if convert}
+
+    def __init__(self, **fields):
+        self.extra = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from its JSON dict (a record is returned unchanged)."""
+        if isinstance(data, cls):
+            return data
+        return cls(**data)
+
+    def to_dict(self):
+        """Return the JSON dict for this record."""
+        data = {}
+        for key, attribute, convert in self.FIELDS:
+            value = getattr(self, attribute, UNSET)
+            if value is not UNSET:
+                data[key] = to_json(value) if isinstance(value, (Record, list)) else plain(value)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __getitem__(self, key):
+        attribute = self.ATTRIBUTES.get(key)
+        if attribute is not None:
+            value = getattr(self, attribute, UNSET)
+            if value is UNSET:
+                raise KeyError(key)
+            return value
+        if self.extra is None or key not in self.extra:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        attribute = self.ATTRIBUTES.get(key)
+        if attribute is None:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+            return
+        convert = self.CONVERTERS.get(key)
+        setattr(self, attribute, convert(value) if convert else value)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        known = sum(getattr(self, attribute, UNSET) is not UNSET for key, attribute, convert in self.FIELDS)
+        return known + len(self.extra or ())
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, Record) else other)
+        return NotImplemented
+
+    # Records are mutable and compare by value, so they are not hashable
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+# Marker for fields that were never set (distinct from an explicit None)
+UNSET = object()
+
+
+def plain(value):
+    """Turn enum members back into plain strings."""
+    return value.value if isinstance(value, Enum) else value
+
+
+def to_json(value):
+    """Convert records (and lists of them) to JSON data; usable as json.dump(default=to_json)."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [to_json(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def candidate_list(candidates):
+    return [Candidate.from_dict(candidate) for candidate in candidates or []]
+
+
+def election_list(elections):
+    return [Election.from_dict(election) for election in elections or []]
+
+
+class Candidate(Record):
+    __slots__ = ("name", "party", "incumbent")
+    FIELDS = (
+        ("name", "name", None),
+        ("party", "party", lambda value: coded(Party, value)),
+        ("incumbent", "incumbent", None),
+    )
+
+
+class Election(Record):
+    __slots__ = ("title", "date", "type", "candidates", "stakes", "chamber_impact", "competitive")
+    FIELDS = (
+        ("title", "title", interned),
+        ("date", "date", interned),
+        ("type", "type", lambda value: coded(ElectionType, value)),
+        ("candidates", "candidates", candidate_list),
+        ("stakes", "stakes", interned),
+        ("chamberImpact", "chamber_impact", lambda value: coded(Chamber, value)),
+        ("competitive", "competitive", None),
+    )
+
+    @property
+    def normalized_date(self):
+        """The shared, cached NormalizedDate for this election's date."""
+        return normalize_date(getattr(self, "date", None))
+
+
+class StateRecord(Record):
+    __slots__ = ("state_name", "registration_website", "registration_deadline", "elections")
+    FIELDS = (
+        ("stateName", "state_name", interned),
+        ("registrationWebsite", "registration_website", interned),
+        ("registrationDeadline", "registration_deadline", interned),
+        ("elections", "elections", election_list),
+    )
+
+
+def load_state_records(election_data):
+    """Convert an electionData dict (state code -> JSON dict) into StateRecords."""
+    return {state_code: StateRecord.from_dict(state_data) for state_code, state_data in election_data.items()}
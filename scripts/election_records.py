@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Election Record Helpers
+Merging of per-state election records and an incremental writer that appends each
+(state_code, record) pair to a JSON Lines file as soon as it is scraped, so partial
+results survive a crash late in a run.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from election_model import Election, StateRecord, to_json
+from entity_resolution import merge_candidates
+
+
+def merge_election_data(*data_sources, source_names=None):
+    """Merge per-state election data from multiple sources.
+
+    The first source to provide a state supplies its state-level fields; later
+    sources add elections whose title is not already present, and candidates to
+    the elections that are (people already listed under another spelling are
+    merged, see entity_resolution.py). The first argument is updated in place
+    when it is a dict, so records can be folded in one at a time. Incoming states
+    and elections are stored as model records.
+
+    With source_names (one per data source), candidates record which sources
+    listed them.
+    """
+    merged_data = data_sources[0] if data_sources else {}
+    if source_names:
+        for state_code, state_data in merged_data.items():
+            tag_candidates(state_code, state_data, source_names[0])
+
+    for position, data_source in enumerate(data_sources[1:], 1):
+        source = source_names[position] if source_names else None
+        for state_code, state_data in data_source.items():
+            if state_code not in merged_data:
+                merged_data[state_code] = StateRecord.from_dict(state_data)
+                if source:
+                    tag_candidates(state_code, merged_data[state_code], source)
+            else:
+                # Merge elections
+                existing_elections = merged_data[state_code]["elections"]
+                new_elections = state_data["elections"]
+
+                # Add new elections that don't already exist, and new candidates to those that do
+                by_title = {existing["title"]: existing for existing in existing_elections}
+                for new_election in new_elections:
+                    existing = by_title.get(new_election["title"])
+                    if existing is None:
+                        election = Election.from_dict(new_election)
+                        existing_elections.append(election)
+                        by_title[election["title"]] = election
+                        if source and election.get("candidates"):
+                            election["candidates"] = merge_candidates([], election["candidates"], state_code,
+                                                                      election["title"], source)
+                    elif new_election.get("candidates"):
+                        existing["candidates"] = merge_candidates(existing.get("candidates"),
+                                                                  new_election["candidates"], state_code,
+                                                                  existing["title"], source)
+
+    return merged_data
+
+
+def tag_candidates(state_code, state_data, source):
+    """Record a source on the candidates of every election in a state record."""
+    for election in state_data.get("elections", []):
+        if election.get("candidates"):
+            election["candidates"] = merge_candidates([], election["candidates"], state_code,
+                                                      election.get("title", ""), source)
+
+
+def merge_records(records, merged=None):
+    """Fold a stream of (state_code, record) pairs into a per-state dict."""
+    merged = {} if merged is None else merged
+    for state_code, record in records:
+        merge_election_data(merged, {state_code: record})
+    return merged
+
+
+class RecordWriter:
+    def __init__(self, path):
+        """Open a JSON Lines file for the records of one run (truncating any old one)."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, 'w', encoding='utf-8')
+        self.count = 0
+
+    def write(self, state_code, record, source=None):
+        """Append one record (and the source it came from, if given) and flush it to disk."""
+        entry = {"state": state_code, "record": record}
+        if source is not None:
+            entry["source"] = source
+        self.file.write(json.dumps(entry, ensure_ascii=False, default=to_json) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.count += 1
+
+    def close(self):
+        """Close the file."""
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_records(path, with_source=False):
+    """Yield (state_code, record) pairs from a file written by RecordWriter.
+
+    With with_source, yield (source, state_code, record) instead. A truncated
+    last line (from a crash mid-write) is skipped.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if with_source:
+                    yield entry.get("source"), entry["state"], entry["record"]
+                else:
+                    yield entry["state"], entry["record"]
+    except FileNotFoundError:
+        return
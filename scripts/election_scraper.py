@@ -5,38 +5,91 @@ Automatically scrapes election information from various sources and updates the
 """
 
 import json
-import time
 import re
+import time
 import csv
 from datetime import datetime, timedelta
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import requests
-from bs4 import BeautifulSoup
+from pathlib import Path
+
+from browser import create_chrome_driver, collect_page_metrics, read_performance_log
+from browser_lifecycle import MAX_PAGES, MAX_RSS_MB, BrowserManager
+from cycles import get_cycle, in_cycle, latest_input, publish_targets
+from run_metrics import RunMetrics
+from election_model import StateRecord, to_json
+from election_records import RecordWriter, merge_records, read_records
+from crawl_journal import JOURNAL_FILE, CrawlJournal
+from network_capture import EndpointStore, capture_json_responses, elections_from_json, fetch_endpoint
+from page_parsers import (
+    determine_chamber_impact,
+    extract_candidate_info,
+    parse_in_pool,
+    parse_state_elections_wikitext,
+)
+from relevance import RELEVANCE_THRESHOLD, is_relevant, score_page
+from sharding import Shard, merge_shards
+from state_extractors import extract_elections, get_extractor, region_selectors
+
+# outerHTML of the first region selector that matches, so only that part of the page leaves the browser
+REGION_HTML_SCRIPT = """
+for (const selector of arguments[0]) {
+  const element = document.querySelector(selector);
+  if (element) return element.outerHTML;
+}
+return null;
+"""
+PAGE_LINKS_SCRIPT = "return Array.from(document.links, link => link.href);"
+
+# Seconds to let a state site finish rendering before reading it
+PAGE_SETTLE_SECONDS = 2
+
+# Records are appended here as they are scraped, so a failed run keeps its partial results
+PARTIAL_OUTPUT = Path(__file__).parent.parent / ".cache" / "partial" / "election_scraper.jsonl"
+# Order sources are scraped (and shard results merged) in
+SOURCE_ORDER = ['state_sites', 'ballotpedia']
 
 class ElectionScraper:
-    def __init__(self, headless=True, logistics_csv="2025 Off-Year Elections - Logistics.csv"):
-        """Initialize the scraper with Chrome WebDriver."""
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.wait = WebDriverWait(self.driver, 10)
+    def __init__(self, headless=True, logistics_csv=None, browser_profile=None, parse_workers=None,
+                 journal=None, max_run_time=None, ballotpedia_client=None, cycle=None,
+                 discovered_pages=None, shard=None, max_pages_per_browser=MAX_PAGES,
+                 max_browser_rss_mb=MAX_RSS_MB, capture_network=False, use_endpoints=True, endpoints=None):
+        """Initialize the scraper. Chrome is launched on first use of self.driver.
         
-        # Load state election websites from CSV
-        self.state_election_sites = {}
-        self.state_registration_sites = {}
-        self.registration_deadlines = {}
-        self.load_logistics_data(logistics_csv)
+        Args:
+            logistics_csv: State websites and deadlines (default: the cycle's, or the latest declared)
+            browser_profile: Overrides for browser.LEAN_PROFILE, e.g. {"enabled": False}
+            parse_workers: Parser processes for fetched pages (default: CPU count, 0: parse inline)
+            journal: CrawlJournal recording state-site progress, for resumable crawls
+            max_run_time: Stop starting new state sites after this many seconds
+            ballotpedia_client: BallotpediaClient to use (default: one for ballotpedia.org)
+            cycle: Election cycle id from cycles.py (default: the current cycle)
+            discovered_pages: State code -> candidate page URLs from discovery_crawler.py, read
+                instead of the landing page for states without a configured page
+            shard: Shard of the run to scrape (see sharding.py; default: everything)
+            max_pages_per_browser: Relaunch Chrome after this many pages (see browser_lifecycle.py)
+            max_browser_rss_mb: Relaunch Chrome once its processes use more memory than this
+            capture_network: Learn the JSON endpoints state sites load their data from (see network_capture.py)
+            use_endpoints: Call learned endpoints over plain HTTP before rendering a state site
+            endpoints: EndpointStore of learned endpoints (default: .cache/state_endpoints.json)
+        """
+        self.cycle = get_cycle(cycle)
+        self.headless = headless
+        self.journal = journal
+        self.deadline = time.time() + max_run_time if max_run_time else None
+        self.parse_workers = parse_workers
+        self.browser_profile = browser_profile
+        self.metrics = RunMetrics("election_scraper")
+        self.capture_network = capture_network
+        self.use_endpoints = use_endpoints
+        self.endpoints = endpoints if endpoints is not None else EndpointStore()
+        self.network_log = []
+        self.browser = BrowserManager(
+            lambda: create_chrome_driver(headless=self.headless, profile=self.browser_profile,
+                                         capture_network=self.capture_network),
+            metrics=self.metrics, max_pages=max_pages_per_browser, max_rss_mb=max_browser_rss_mb)
+        self._http = None
+        self._ballotpedia = ballotpedia_client
+        self.discovered_pages = discovered_pages or {}
+        self.shard = shard or Shard()
         
         # State names mapping
         self.state_names = {
@@ -52,7 +105,66 @@ class ElectionScraper:
             "TN": "Tennessee", "TX": "Texas", "UT": "Utah", "VT": "Vermont", "VA": "Virginia",
             "WA": "Washington", "WV": "West Virginia", "WI": "Wisconsin", "WY": "Wyoming"
         }
+        
+        # Load state election websites from CSV (after the state names it looks up)
+        self.state_election_sites = {}
+        self.state_registration_sites = {}
+        self.registration_deadlines = {}
+        self.load_logistics_data(logistics_csv or latest_input("logistics_csv", self.cycle))
     
+    @property
+    def driver(self):
+        """Chrome WebDriver, launched the first time a page is needed (and relaunched by self.browser)."""
+        return self.browser.driver
+
+    @property
+    def ballotpedia(self):
+        """Ballotpedia MediaWiki API client, created on first use."""
+        if self._ballotpedia is None:
+            from ballotpedia_api import BallotpediaClient
+            self._ballotpedia = BallotpediaClient()
+        return self._ballotpedia
+
+    @property
+    def http(self):
+        """Plain HTTP session for learned JSON endpoints, created on first use."""
+        if self._http is None:
+            import requests
+            from ballotpedia_api import USER_AGENT
+            self._http = requests.Session()
+            self._http.headers["User-Agent"] = USER_AGENT
+        return self._http
+
+    def load_page(self, url):
+        """Navigate to a URL and record its page metrics."""
+        driver = self.browser.get(url)
+        log_entries = None
+        if self.capture_network:
+            # Metrics and network capture share the performance log, which is drained on read
+            log_entries = read_performance_log(driver)
+            self.network_log = list(log_entries)
+        self.metrics.record_page(collect_page_metrics(driver, url, self.browser_profile, log_entries))
+
+    def capture_responses(self):
+        """JSON responses the current page loaded so far (call before the next page load)."""
+        entries = self.network_log + read_performance_log(self.driver)
+        self.network_log = []
+        return capture_json_responses(self.driver, entries)
+
+    def close(self):
+        """Quit Chrome and close the Ballotpedia API session if they were ever opened."""
+        if self.browser.running:
+            self.browser.rss_mb()  # A last sample, so the peak covers the end of the run
+            self.browser.quit()
+        self.metrics.record_browser(self.browser.stats())
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+        if self._ballotpedia is not None:
+            self.metrics.increment("api_requests", self._ballotpedia.requests_made)
+            self._ballotpedia.close()
+            self._ballotpedia = None
+
     def load_logistics_data(self, logistics_csv):
         """Load state election websites and logistics data from CSV."""
         try:
@@ -97,151 +209,85 @@ class ElectionScraper:
 
     def scrape_ballotpedia_elections(self):
         """Scrape election data from Ballotpedia."""
-        print("Scraping Ballotpedia for 2024 elections...")
-        
-        # Navigate to Ballotpedia's 2024 elections page
-        self.driver.get("https://ballotpedia.org/2024_elections")
+        return merge_records(self.iter_ballotpedia_elections())
+
+    def iter_ballotpedia_elections(self):
+        """Yield (state_code, record) for each Ballotpedia state page as it is parsed.
         
-        elections_data = {}
+        State pages are found from the links on the elections overview page and
+        fetched as wikitext through the MediaWiki API, 50 per request. Each batch is
+        parsed in a process pool while the next one downloads. A page that fails to
+        parse is skipped; API and network errors propagate, so a cut-short scrape is
+        never mistaken for a complete one.
+        """
+        year = self.cycle["year"]
+        print(f"Scraping Ballotpedia for {year} elections...")
         
-        try:
-            # Wait for the page to load
-            self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, "mw-content-ltr")))
-            
-            # Look for state-specific election information
-            state_links = self.driver.find_elements(By.XPATH, "//a[contains(@href, '/2024_elections') and contains(text(), 'elections')]")
-            
-            for link in state_links[:5]:  # Limit to first 5 for testing
-                try:
-                    state_text = link.text
-                    if "elections" in state_text.lower():
-                        state_name = state_text.replace(" elections", "").replace(" Elections", "")
-                        state_code = self.get_state_code(state_name)
-                        
-                        if state_code:
-                            print(f"Processing {state_name} ({state_code})...")
-                            link.click()
-                            time.sleep(2)
-                            
-                            # Extract election data from the state page
-                            state_elections = self.extract_state_elections(state_code)
-                            if state_elections:
-                                elections_data[state_code] = state_elections
-                            
-                            # Go back to main page
-                            self.driver.back()
-                            time.sleep(1)
-                            
-                except Exception as e:
-                    print(f"Error processing state link: {e}")
-                    continue
-                    
-        except TimeoutException:
-            print("Timeout waiting for Ballotpedia page to load")
+        state_pages = {state_code: title
+                       for state_code, title in self.ballotpedia_state_pages(f"{year} elections").items()
+                       if self.shard.owns("ballotpedia", state_code)}
+        print(f"Found {len(state_pages)} Ballotpedia state pages")
         
-        return elections_data
+        for state_code, state_elections, error in parse_in_pool(self.fetch_state_pages(state_pages),
+                                                                parse=parse_state_elections_wikitext,
+                                                                workers=self.parse_workers):
+            if error:
+                print(f"Error extracting state elections for {state_code}: {error}")
+            elif state_elections:
+                yield state_code, state_elections
 
-    def extract_state_elections(self, state_code):
-        """Extract election information from a state's Ballotpedia page."""
-        try:
-            elections = []
-            
-            # Look for election sections
-            election_sections = self.driver.find_elements(By.XPATH, "//h2[contains(text(), 'Elections') or contains(text(), 'Races')]")
-            
-            for section in election_sections:
-                try:
-                    # Get the section title
-                    title = section.text
-                    
-                    # Look for candidate information in the following content
-                    next_elements = section.find_elements(By.XPATH, "./following-sibling::*")
-                    
-                    candidates = []
-                    date = "November 5, 2024"  # Default to general election date
-                    
-                    for element in next_elements[:10]:  # Limit search to next 10 elements
-                        if element.tag_name in ['h2', 'h3']:
-                            break  # Stop at next section
-                            
-                        text = element.text.lower()
-                        if any(keyword in text for keyword in ['candidate', 'running', 'incumbent']):
-                            # Extract candidate names and parties
-                            candidate_info = self.extract_candidate_info(element.text)
-                            candidates.extend(candidate_info)
-                    
-                    if candidates:
-                        election = {
-                            "title": title,
-                            "date": date,
-                            "type": "General Election",
-                            "candidates": candidates,
-                            "stakes": f"Key race in {self.state_names.get(state_code, state_code)}",
-                            "chamberImpact": self.determine_chamber_impact(title),
-                            "competitive": True
-                        }
-                        elections.append(election)
-                        
-                except Exception as e:
-                    print(f"Error extracting election from section: {e}")
-                    continue
-            
-            if elections:
-                return {
-                    "stateName": self.state_names.get(state_code, state_code),
-                    "registrationWebsite": self.state_registration_sites.get(state_code, ""),
-                    "registrationDeadline": self.calculate_registration_deadline(state_code),
-                    "elections": elections
-                }
-                
-        except Exception as e:
-            print(f"Error extracting state elections for {state_code}: {e}")
+    def ballotpedia_state_pages(self, overview_title):
+        """Map state codes to the titles of their pages linked from an overview page.
         
-        return None
+        Links such as "Virginia elections, 2026" or "Virginia 2026 elections" are
+        matched to states by name.
+        """
+        state_pages = {}
+        for title in self.ballotpedia.links(overview_title):
+            if "elections" not in title.lower():
+                continue
+            state_name = re.sub(r"\s*,?\s*\b\d{4}\b", "", title)
+            state_name = re.sub(r"\s+elections$", "", state_name, flags=re.IGNORECASE).strip()
+            state_code = self.get_state_code(state_name)
+            if state_code and state_code not in state_pages:
+                state_pages[state_code] = title
+        return state_pages
+
+    def fetch_state_pages(self, state_pages):
+        """Yield (state_code, wikitext, context) for each state page, fetching in batches."""
+        codes_by_title = {title: state_code for state_code, title in state_pages.items()}
+        for title, wikitext in self.ballotpedia.iter_page_wikitext(codes_by_title):
+            state_code = codes_by_title.get(title)
+            if state_code is None:
+                continue
+            print(f"Processing {self.state_names.get(state_code, state_code)} ({state_code})...")
+            yield state_code, wikitext, self.state_context(state_code)
+
+    def state_context(self, state_code):
+        """State-level fields attached to every parsed state record."""
+        return {
+            "stateName": self.state_names.get(state_code, state_code),
+            "registrationWebsite": self.state_registration_sites.get(state_code, ""),
+            "registrationDeadline": self.calculate_registration_deadline(state_code),
+            "electionDay": self.cycle["electionDay"],
+        }
 
     def extract_candidate_info(self, text):
         """Extract candidate information from text."""
-        candidates = []
-        
-        # Look for patterns like "John Doe (R)" or "Jane Smith (D)"
-        pattern = r'([A-Z][a-z]+ [A-Z][a-z]+)\s*\(([RDIG])\)'
-        matches = re.findall(pattern, text)
-        
-        for name, party in matches:
-            party_full = {
-                'R': 'Republican',
-                'D': 'Democratic', 
-                'I': 'Independent',
-                'G': 'Green'
-            }.get(party, party)
-            
-            candidates.append({
-                "name": name,
-                "party": party_full,
-                "incumbent": "incumbent" in text.lower()
-            })
-        
-        return candidates
+        return extract_candidate_info(text)
 
     def determine_chamber_impact(self, title):
         """Determine which chamber this election affects."""
-        title_lower = title.lower()
-        if "senate" in title_lower:
-            return "Senate"
-        elif "house" in title_lower or "representative" in title_lower:
-            return "House"
-        elif any(office in title_lower for office in ["governor", "attorney general", "secretary", "treasurer"]):
-            return "State"
-        else:
-            return "Local"
+        return determine_chamber_impact(title)
 
     def calculate_registration_deadline(self, state_code=None):
         """Get registration deadline from CSV data or calculate default."""
-        if state_code and state_code in self.registration_deadlines:
+        # A logistics CSV carried over from an earlier cycle has stale deadlines
+        if state_code and in_cycle(self.cycle, self.registration_deadlines.get(state_code)):
             return self.registration_deadlines[state_code]
         
-        # Default calculation if not in CSV
-        election_date = datetime(2025, 11, 4)  # November 4, 2025 (general election)
+        # Default calculation if not in CSV: 30 days before the cycle's election day
+        election_date = datetime.fromisoformat(self.cycle["electionDate"])
         deadline = election_date - timedelta(days=30)
         return deadline.strftime("%B %d, %Y")
 
@@ -254,52 +300,140 @@ class ElectionScraper:
 
     def scrape_state_election_sites(self):
         """Scrape election data directly from state election websites."""
+        return merge_records(self.iter_state_election_sites())
+
+    def iter_state_election_sites(self):
+        """Yield (state_code, record) for each state election website as it is scraped.
+        
+        With a journal, sites completed by an earlier run are skipped and their
+        records replayed, and each result is journaled as soon as it is known.
+        Each site is read with its state's extractor (see state_extractors.py).
+        """
         print("Scraping state election websites from CSV...")
         
-        elections_data = {}
+        jobs = [(state_code, url) for state_code, url in self.state_election_sites.items()
+                if self.shard.owns("state_sites", state_code)]
+        if self.journal:
+            self.journal.add_pending(jobs)
+            yield from self.journal.completed_records()
         
-        for state_code, url in self.state_election_sites.items():
+        for state_code, url in jobs:
+            if self.journal and self.journal.should_skip(url):
+                continue
+            if self.deadline and time.time() >= self.deadline:
+                print("Max run time reached; remaining state sites are left pending (use --resume to continue)")
+                break
+            
             try:
-                state_name = self.state_names.get(state_code, state_code)
-                print(f"Scraping {state_name} ({state_code}) from {url}...")
-                
-                self.driver.get(url)
-                time.sleep(2)  # Wait for page to load
-                
-                # Try to extract election information
-                # This is a generic approach that may need customization per state
-                page_text = self.driver.find_element(By.TAG_NAME, "body").text.lower()
-                
-                # Look for election-related keywords
-                has_election_info = any(keyword in page_text for keyword in [
-                    "election", "ballot", "vote", "polling", "candidate"
-                ])
-                
-                if has_election_info:
-                    state_data = {
-                        "stateName": state_name,
-                        "registrationWebsite": self.state_registration_sites.get(state_code, ""),
-                        "registrationDeadline": self.calculate_registration_deadline(state_code),
-                        "electionWebsite": url,
-                        "elections": []
-                    }
-                    elections_data[state_code] = state_data
-                    print(f"✓ Found election information for {state_name}")
-                else:
-                    print(f"✗ No election information found for {state_name}")
-                    
+                state_data = self.scrape_state_site(state_code, url)
             except Exception as e:
                 print(f"Error scraping {state_code}: {e}")
+                if self.journal:
+                    self.journal.mark_failed(url, state_code, e)
                 continue
+            
+            if self.journal:
+                self.journal.mark_completed(url, state_code, state_data)
+            if state_data:
+                yield state_code, state_data
+    
+    def scrape_state_site(self, state_code, url):
+        """Scrape one state election website, returning its StateRecord or None if it lists no elections."""
+        state_name = self.state_names.get(state_code, state_code)
+        print(f"Scraping {state_name} ({state_code}) from {url}...")
+        
+        elections = self.fetch_state_endpoints(state_code) if self.use_endpoints else []
+        if not elections:
+            elections = self.extract_state_site(state_code, url)
+        if not elections:
+            print(f"✗ No election information found for {state_name}")
+            return None
+        
+        print(f"✓ Found {len(elections)} election(s) for {state_name}")
+        return StateRecord(
+            stateName=state_name,
+            registrationWebsite=self.state_registration_sites.get(state_code, ""),
+            registrationDeadline=self.calculate_registration_deadline(state_code),
+            electionWebsite=url,
+            elections=elections
+        )
+    
+    def extract_state_site(self, state_code, url):
+        """Read a state's elections with its extractor config (see state_extractors.py).
         
-        return elections_data
+        Only the extractor's page region is copied out of the browser, not the
+        whole page text. With capture_network on, JSON the pages loaded is read
+        first, and its endpoints are learned for later runs (see network_capture.py).
+        """
+        extractor = get_extractor(state_code)
+        if not extractor.page and self.discovered_pages.get(state_code):
+            url = self.discovered_pages[state_code][0]
+        self.load_page(url)
+        time.sleep(PAGE_SETTLE_SECONDS)  # Wait for page to load
+        captured = self.capture_responses() if self.capture_network else []
+        
+        page_url = extractor.page_url(url, self.driver.execute_script(PAGE_LINKS_SCRIPT) or [])
+        if page_url != url:
+            self.load_page(page_url)
+            time.sleep(PAGE_SETTLE_SECONDS)
+            if self.capture_network:
+                captured += self.capture_responses()
+        if captured and self.learn_endpoints(state_code, captured):
+            # The site's own data is more reliable than its rendered text
+            return max((elections_from_json(response.data, self.cycle) for response in captured), key=len)
+        
+        region_html = self.driver.execute_script(REGION_HTML_SCRIPT, region_selectors(state_code))
+        html = region_html or self.driver.page_source
+        
+        # Skip extraction for pages that barely mention any races or dates
+        relevance = score_page(html, self.cycle)
+        if self.metrics.pages:
+            self.metrics.pages[-1]["relevance"] = relevance.score
+        if not is_relevant(relevance.score):
+            self.metrics.increment("irrelevant_pages")
+            print(f"  Skipping {page_url}: relevance {relevance.score} below {RELEVANCE_THRESHOLD}")
+            return []
+        return extract_elections(state_code, html, self.cycle)
+    
+    def fetch_state_endpoints(self, state_code):
+        """Read a state's elections from its learned JSON endpoints, without the browser.
+
+        Endpoints that fail or list nothing are forgotten, so the site is rendered
+        (and, with capture on, its endpoints learned again).
+        """
+        endpoints = self.endpoints.get(state_code)
+        if not endpoints:
+            return []
+        for endpoint in endpoints:
+            try:
+                elections = elections_from_json(fetch_endpoint(self.http, endpoint), self.cycle)
+            except Exception as e:
+                print(f"  Endpoint {endpoint['url']} failed: {e}")
+                continue
+            if elections:
+                self.metrics.increment("endpoint_hits")
+                print(f"  Read {len(elections)} election(s) from {endpoint['url']}")
+                return elections
+        self.metrics.increment("endpoint_misses")
+        self.endpoints.forget(state_code)
+        self.endpoints.save()
+        return []
+    
+    def learn_endpoints(self, state_code, captured):
+        """Keep the captured JSON responses that list the state's elections as its endpoints."""
+        learned = self.endpoints.learn(state_code, captured, self.cycle)
+        if learned:
+            self.metrics.increment("endpoints_learned", len(learned))
+            self.endpoints.save()
+            print(f"  Learned {len(learned)} JSON endpoint(s) for {state_code}: {learned[0]['url']}")
+        return learned
     
     def scrape_vote411(self):
         """Scrape additional election data from Vote411.org."""
         print("Scraping Vote411 for additional election information...")
         
         try:
-            self.driver.get("https://www.vote411.org/")
+            self.load_page("https://www.vote411.org/")
             
             # Look for state-specific information
             # This would need to be customized based on Vote411's current structure
@@ -308,10 +442,12 @@ class ElectionScraper:
             print(f"Error scraping Vote411: {e}")
 
     def update_elections_json(self, new_data):
-        """Update the elections.json file with new data."""
+        """Update the cycle's published elections.json files with new data."""
         try:
+            output_files = publish_targets(self.cycle)
+            
             # Load existing data
-            with open('electionstowatch/elections.json', 'r') as f:
+            with open(output_files[0], 'r') as f:
                 existing_data = json.load(f)
             
             # Update with new data
@@ -322,55 +458,98 @@ class ElectionScraper:
             existing_data['lastUpdated'] = datetime.now().isoformat() + 'Z'
             
             # Save updated data
-            with open('electionstowatch/elections.json', 'w') as f:
-                json.dump(existing_data, f, indent=2)
+            for output_file in output_files:
+                with open(output_file, 'w') as f:
+                    json.dump(existing_data, f, indent=2, default=to_json)
             
             print(f"Updated elections.json with data for {len(new_data)} states")
             
         except Exception as e:
             print(f"Error updating elections.json: {e}")
 
+    def iter_records(self, scrape_sources):
+        """Yield (source, state_code, record) from each requested source in turn."""
+        # Scrape from state websites listed in CSV
+        if 'state_sites' in scrape_sources:
+            for state_code, record in self.iter_state_election_sites():
+                yield 'state_sites', state_code, record
+        
+        # Scrape from Ballotpedia
+        if 'ballotpedia' in scrape_sources:
+            for state_code, record in self.iter_ballotpedia_elections():
+                yield 'ballotpedia', state_code, record
+
     def run_scraper(self, scrape_sources=['state_sites', 'ballotpedia']):
         """Run the complete scraping process.
         
+        Each state's record is appended to PARTIAL_OUTPUT as soon as it is scraped and
+        not kept in memory; the file is merged once scraping ends, so an error late in
+        the run still keeps everything scraped before it.
+        A sharded run writes its shard's partial file instead and leaves elections.json
+        alone; merge_shard_results() publishes once every shard is done.
+        
         Args:
             scrape_sources: List of sources to scrape from. Options: 'state_sites', 'ballotpedia'
+        
+        Returns:
+            True if every source was scraped to the end, False if a source failed
         """
         print("Starting election data scraping...")
         print(f"Sources to scrape: {', '.join(scrape_sources)}")
+        output = PARTIAL_OUTPUT
+        if self.shard.is_sharded:
+            output = self.shard.path("election_scraper", self.cycle["id"])
+            print(f"Scraping shard {self.shard}; records go to {output}")
         
-        all_data = {}
+        scraped_states = set()
+        completed = False
         
         try:
-            # Scrape from state websites listed in CSV
-            if 'state_sites' in scrape_sources:
-                state_data = self.scrape_state_election_sites()
-                all_data.update(state_data)
-            
-            # Scrape from Ballotpedia
-            if 'ballotpedia' in scrape_sources:
-                ballotpedia_data = self.scrape_ballotpedia_elections()
-                # Merge with existing data
-                for state_code, data in ballotpedia_data.items():
-                    if state_code in all_data:
-                        # Merge elections
-                        all_data[state_code]['elections'].extend(data.get('elections', []))
-                    else:
-                        all_data[state_code] = data
-            
-            # Update the JSON file
-            if all_data:
-                self.update_elections_json(all_data)
-            else:
-                print("No data scraped from any source")
+            with RecordWriter(output) as writer:
+                for source, state_code, record in self.iter_records(scrape_sources):
+                    writer.write(state_code, record, source)
+                    scraped_states.add(state_code)
             
             print("Scraping completed successfully!")
+            completed = True
             
         except Exception as e:
-            print(f"Error during scraping: {e}")
+            print(f"❌ Error during scraping: {e}")
+            if scraped_states:
+                print(f"Keeping partial results for {len(scraped_states)} states; the run is incomplete")
         
         finally:
-            self.driver.quit()
+            self.close()
+            print(self.metrics.describe())
+            self.metrics.save()
+            if self.journal:
+                print(f"Crawl journal: {self.journal.counts()}")
+                self.journal.close()
+        
+        # Update the JSON file
+        if self.shard.is_sharded:
+            print(f"Shard {self.shard} done: {len(scraped_states)} states (merge with --merge-shards {self.shard.count})")
+        elif scraped_states:
+            self.update_elections_json(merge_records(read_records(output)))
+        else:
+            print("No data scraped from any source")
+        return completed
+
+    def merge_shard_results(self, count):
+        """Merge the partial files of a sharded run and update elections.json.
+        
+        Returns:
+            True if every shard's partial file was found and merged
+        """
+        merged, missing = merge_shards("election_scraper", count, self.cycle["id"], SOURCE_ORDER)
+        if missing:
+            print(f"❌ Missing shard results: {', '.join(str(path) for path in missing)}")
+            return False
+        if merged:
+            self.update_elections_json(merged)
+        else:
+            print("No data scraped by any shard")
+        return True
 
 def main():
     """Main function to run the scraper."""
@@ -378,6 +557,12 @@ def main():
     
     # Parse command line arguments
     sources = ['state_sites']  # Default to state sites from CSV
+    browser_profile = {"enabled": False} if '--full-browser' in sys.argv else None
+    max_run_time = None
+    if '--max-run-time' in sys.argv:
+        index = sys.argv.index('--max-run-time')
+        if index + 1 < len(sys.argv):
+            max_run_time = float(sys.argv[index + 1])
     
     if len(sys.argv) > 1:
         if '--all' in sys.argv:
@@ -390,12 +575,46 @@ def main():
             print("  (no options)     Scrape from state election websites in CSV (default)")
             print("  --all            Scrape from both state sites and Ballotpedia")
             print("  --ballotpedia    Scrape only from Ballotpedia")
+            print("  --full-browser   Load images, fonts, media and trackers (disable the lean profile)")
+            print("  --resume         Continue the last state-site crawl from its journal")
+            print("  --max-run-time N Stop starting new state sites after N seconds")
+            print("  --discover       Crawl each state site for its election pages first (see discovery_crawler.py)")
+            print("  --capture-network Learn the JSON endpoints state sites load data from, to call directly later")
+            print("  --no-endpoints   Render every state site, ignoring learned JSON endpoints")
+            print("  --shard i/N      Only scrape shard i of N (0 <= i < N), into a partial file")
+            print("  --merge-shards N Merge the partial files of all N shards into elections.json")
             print("  --help           Show this help message")
             return
     
+    if '--merge-shards' in sys.argv[:-1]:
+        scraper = ElectionScraper(headless=True)
+        if not scraper.merge_shard_results(int(sys.argv[sys.argv.index('--merge-shards') + 1])):
+            sys.exit(1)
+        return
+    
+    shard = Shard.parse(sys.argv[sys.argv.index('--shard') + 1]) if '--shard' in sys.argv[:-1] else Shard()
     print(f"Scraping from: {', '.join(sources)}")
-    scraper = ElectionScraper(headless=True)
-    scraper.run_scraper(scrape_sources=sources)
+    # Shards running on one machine each keep their own journal
+    journal_file = JOURNAL_FILE
+    if shard.is_sharded:
+        journal_file = JOURNAL_FILE.with_name(f"crawl_journal.{shard.index}-of-{shard.count}.jsonl")
+    journal = CrawlJournal(journal_file, resume='--resume' in sys.argv)
+    scraper = ElectionScraper(headless=True, browser_profile=browser_profile, journal=journal, max_run_time=max_run_time,
+                              shard=shard, capture_network='--capture-network' in sys.argv,
+                              use_endpoints='--no-endpoints' not in sys.argv)
+    if '--discover' in sys.argv and 'state_sites' in sources:
+        from discovery_crawler import DiscoveryCrawler, save_discovery
+        
+        crawler = DiscoveryCrawler(cycle=scraper.cycle["id"], metrics=scraper.metrics)
+        try:
+            results = crawler.discover_all({state_code: url for state_code, url in scraper.state_election_sites.items()
+                                            if shard.owns("state_sites", state_code)})
+        finally:
+            crawler.close()
+        save_discovery(results)
+        scraper.discovered_pages = {state: [c.url for c in candidates] for state, candidates in results.items()}
+    if not scraper.run_scraper(scrape_sources=sources):
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Candidate Entity Resolution
+Recognizes the same candidate listed by several sources under slightly different
+names ("Abigail Spanberger" / "Abby Spanberger" / "SPANBERGER, ABIGAIL D.") and
+merges them into one candidate.
+
+- Names are normalized: case and accents folded, titles (Dr., Rep.) dropped,
+  suffixes (Jr., III) kept apart, nicknames mapped to their formal first name,
+  middle names reduced to initials, and "Last, First" reordered.
+- Candidates are only compared within a block of (state, office, last-name key),
+  kept in an index, so a run never compares all pairs.
+- Merged candidates keep the most complete name, the first known party and any
+  source's incumbent flag. With a source name, each candidate records which
+  sources listed it ("sources") and which one supplied each field ("provenance").
+"""
+
+import re
+import unicodedata
+from collections import namedtuple
+
+from election_model import Candidate, Record
+
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+NAME_TITLES = {"dr", "mr", "mrs", "ms", "miss", "rep", "sen", "gov", "hon", "judge", "rev", "the"}
+
+# Nickname -> formal first name
+NICKNAMES = {
+    "abby": "abigail", "al": "albert", "alex": "alexander", "andy": "andrew", "beth": "elizabeth",
+    "ben": "benjamin", "bernie": "bernard", "bill": "william", "billy": "william", "bob": "robert",
+    "bobby": "robert", "charlie": "charles", "chris": "christopher", "chuck": "charles", "dan": "daniel",
+    "danny": "daniel", "dave": "david", "deb": "deborah", "debbie": "deborah", "dick": "richard",
+    "don": "donald", "ed": "edward", "eddie": "edward", "greg": "gregory", "jen": "jennifer",
+    "jenny": "jennifer", "jeff": "jeffrey", "jerry": "gerald", "jim": "james", "jimmy": "james",
+    "joe": "joseph", "jon": "jonathan", "kathy": "katherine", "kate": "katherine", "katie": "katherine",
+    "ken": "kenneth", "larry": "lawrence", "liz": "elizabeth", "maggie": "margaret", "matt": "matthew",
+    "meg": "margaret", "mike": "michael", "mitch": "mitchell", "nick": "nicholas", "pat": "patrick",
+    "peggy": "margaret", "pete": "peter", "rick": "richard", "rob": "robert", "ron": "ronald",
+    "sam": "samuel", "steve": "steven", "stephen": "steven", "sue": "susan", "ted": "edward",
+    "tim": "timothy", "tom": "thomas", "tommy": "thomas", "tony": "anthony", "will": "william",
+}
+
+# "Robert "Bob" Smith", "Robert (Bob) Smith"
+QUOTED_NICKNAME = re.compile(r'["“”(]([^"“”()]*)["“”)]')
+NON_NAME_CHARACTERS = re.compile(r"[^a-z\s-]")
+
+NameKey = namedtuple("NameKey", "first middle last suffix nickname")
+
+
+def fold(text):
+    """Lowercase a string and strip its accents."""
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+
+
+def name_tokens(text):
+    """Lowercase name words, without punctuation (apostrophes dropped: O'Brien -> obrien)."""
+    text = text.replace("'", "").replace("’", "").replace(".", " ")
+    return NON_NAME_CHARACTERS.sub(" ", text).split()
+
+
+def normalize_name(name):
+    """Parse a candidate name into a NameKey, or None if it has no letters."""
+    text = fold(name or "")
+    nicknames = [part.strip() for part in QUOTED_NICKNAME.findall(text) if part.strip()]
+    text = QUOTED_NICKNAME.sub(" ", text)
+
+    if "," in text:
+        head, tail = text.split(",", 1)
+        if all(token in NAME_SUFFIXES for token in name_tokens(tail)):
+            text = f"{head} {tail}"  # "John Smith, Jr."
+        else:
+            text = f"{tail} {head}"  # "Smith, John"
+
+    tokens = name_tokens(text)
+    while tokens and tokens[0] in NAME_TITLES:
+        tokens.pop(0)
+    suffix = None
+    while len(tokens) > 1 and tokens[-1] in NAME_SUFFIXES:
+        suffix = tokens.pop()
+    if not tokens:
+        return None
+
+    first = NICKNAMES.get(tokens[0], tokens[0]) if len(tokens) > 1 else ""
+    nickname = name_tokens(nicknames[0])[0] if nicknames and name_tokens(nicknames[0]) else None
+    return NameKey(
+        first=first,
+        middle=tuple(token[0] for token in tokens[1:-1]),
+        last=tokens[-1],
+        suffix=suffix,
+        nickname=NICKNAMES.get(nickname, nickname) if nickname else None,
+    )
+
+
+def last_name_keys(key):
+    """Blocking keys for a last name: the whole name and each part of a hyphenated one."""
+    parts = [part for part in key.last.split("-") if part]
+    return {key.last.replace("-", "")} | set(parts)
+
+
+def first_names_match(a, b):
+    """Whether two normalized first names (or nicknames, or initials) can be the same person."""
+    names_a = {name for name in (a.first, a.nickname) if name}
+    names_b = {name for name in (b.first, b.nickname) if name}
+    if not names_a or not names_b:
+        return True  # a last-name-only mention
+    for name_a in names_a:
+        for name_b in names_b:
+            if name_a == name_b:
+                return True
+            short, long = sorted((name_a, name_b), key=len)
+            if len(short) == 1 and long.startswith(short):
+                return True  # an initial
+            if len(short) >= 3 and long.startswith(short):
+                return True  # a shortened name missing from NICKNAMES ("Kat", "Katherine")
+    return False
+
+
+def same_person(a, b):
+    """Whether two NameKeys in the same block name the same person."""
+    if not last_name_keys(a) & last_name_keys(b):
+        return False
+    if a.suffix and b.suffix and a.suffix != b.suffix:
+        return False  # John Smith Jr. and John Smith Sr.
+    if a.middle and b.middle and a.middle[0] != b.middle[0]:
+        return False
+    return first_names_match(a, b)
+
+
+def parties_conflict(a, b):
+    """Whether two candidates list different parties."""
+    party_a, party_b = str(a.get("party") or ""), str(b.get("party") or "")
+    return bool(party_a and party_b and party_a != party_b)
+
+
+def name_completeness(name):
+    """Sort key preferring full first names, then more name parts, then longer names."""
+    key = normalize_name(name)
+    if key is None:
+        return (0, 0, 0)
+    has_first = bool(key.first) and len(key.first) > 1
+    return (has_first, len(key.middle) + bool(key.first) + bool(key.suffix), len(name))
+
+
+class CandidateResolver:
+    def __init__(self):
+        """Resolve candidate mentions into entities, comparing only within (state, office, last-name) blocks."""
+        self.entities = []
+        self.keys = []
+        self.index = {}
+        self.comparisons = 0
+        self.merged = 0
+
+    def add(self, candidate, state_code="", office="", source=None):
+        """Add one candidate mention.
+
+        Returns:
+            (entity dict, True if it is a new candidate)
+        """
+        data = candidate.to_dict() if isinstance(candidate, Record) else dict(candidate)
+        key = normalize_name(data.get("name", ""))
+        if key is None:
+            return self.new_entity(data, None, (), source), True
+
+        blocks = [(state_code, office, last) for last in sorted(last_name_keys(key))]
+        seen = set()
+        for block in blocks:
+            for position in self.index.get(block, []):
+                if position in seen:
+                    continue
+                seen.add(position)
+                self.comparisons += 1
+                if same_person(self.keys[position], key) and not parties_conflict(self.entities[position], data):
+                    self.merge_into(position, data, key, source)
+                    for other in blocks:
+                        if position not in self.index.setdefault(other, []):
+                            self.index[other].append(position)
+                    self.merged += 1
+                    return self.entities[position], False
+        return self.new_entity(data, key, blocks, source), True
+
+    def new_entity(self, data, key, blocks, source):
+        """Start a new candidate from its first mention."""
+        entity = dict(data)
+        if source:
+            entity["sources"] = sorted(set(entity.get("sources", [])) | {source})
+            provenance = dict(entity.get("provenance", {}))
+            for field, value in data.items():
+                if field not in ("sources", "provenance") and value not in (None, ""):
+                    provenance.setdefault(field, source)
+            entity["provenance"] = provenance
+        position = len(self.entities)
+        self.entities.append(entity)
+        self.keys.append(key)
+        for block in blocks:
+            self.index.setdefault(block, []).append(position)
+        return entity
+
+    def merge_into(self, position, data, key, source):
+        """Fold another mention of a candidate into its entity."""
+        entity = self.entities[position]
+        provenance = entity.setdefault("provenance", {}) if (source or data.get("provenance")) else None
+        if data.get("sources") or source:
+            entity["sources"] = sorted(set(entity.get("sources", [])) | set(data.get("sources", []))
+                                       | ({source} if source else set()))
+        for field, mention_source in data.get("provenance", {}).items():
+            provenance.setdefault(field, mention_source)
+
+        for field, value in data.items():
+            if field in ("sources", "provenance") or value in (None, ""):
+                continue
+            if field == "name":
+                replace = name_completeness(value) > name_completeness(entity.get("name", ""))
+            elif field == "incumbent":
+                replace = bool(value) and not entity.get("incumbent")
+            else:
+                replace = entity.get(field) in (None, "")
+            if replace:
+                entity[field] = value
+                if source:
+                    provenance[field] = source
+                if field == "name":
+                    self.keys[position] = key
+
+    def resolve(self, candidates, state_code="", office="", source=None):
+        """Resolve a list of candidates (e.g. one election's), returning the new entities among them.
+
+        Entities are live dicts: later mentions of the same person still update them.
+        """
+        distinct = []
+        for candidate in candidates or []:
+            entity, is_new = self.add(candidate, state_code, office, source)
+            if is_new:
+                distinct.append(entity)
+        return distinct
+
+
+def merge_candidates(existing, incoming, state_code="", office="", source=None):
+    """Merge incoming candidates into an election's list, recognizing people already listed.
+
+    Returns:
+        The merged list of Candidate records (existing candidates first)
+    """
+    resolver = CandidateResolver()
+    entities = resolver.resolve(existing, state_code, office)
+    entities += resolver.resolve(incoming, state_code, office, source)
+    return [Candidate.from_dict(entity) for entity in entities]
+
+
+def resolve_election_candidates(election_data, source=None):
+    """Merge duplicate candidates within every election, in place.
+
+    One resolver covers the whole data set; its blocks include the state and
+    the election, so only candidates of the same race are ever compared.
+
+    Returns:
+        The CandidateResolver, for its comparison and merge counts
+    """
+    resolver = CandidateResolver()
+    for state_code, state_data in election_data.items():
+        for election in state_data.get("elections", []):
+            if election.get("candidates"):
+                # Blocks include the election, so later races never touch these entities
+                entities = resolver.resolve(election["candidates"], state_code, election.get("title", ""), source)
+                election["candidates"] = [Candidate.from_dict(entity) for entity in entities]
+    return resolver
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+FEC Bulk Data Ingestion
+Reads the FEC bulk candidate master (cn.txt) and committee master (cm.txt) files
+and attaches House and Senate candidates to our elections. The files are
+pipe-delimited, have no header row and run to hundreds of MB, so they are
+streamed line by line through a memory map and filtered before any field is
+decoded; only the matching candidates are ever held in memory.
+
+Download the files for a cycle from https://www.fec.gov/data/browse-data/?tab=bulk-data
+and unzip them into data/fec/.
+"""
+
+import mmap
+import os
+import re
+from datetime import date
+
+from election_model import Candidate
+from entity_resolution import CandidateResolver
+
+# Column layout of the FEC bulk files (see the FEC data dictionaries)
+CANDIDATE_COLUMNS = [
+    "CAND_ID", "CAND_NAME", "CAND_PTY_AFFILIATION", "CAND_ELECTION_YR", "CAND_OFFICE_ST",
+    "CAND_OFFICE", "CAND_OFFICE_DISTRICT", "CAND_ICI", "CAND_STATUS", "CAND_PCC",
+    "CAND_ST1", "CAND_ST2", "CAND_CITY", "CAND_ST", "CAND_ZIP",
+]
+COMMITTEE_COLUMNS = [
+    "CMTE_ID", "CMTE_NM", "TRES_NM", "CMTE_ST1", "CMTE_ST2", "CMTE_CITY", "CMTE_ST", "CMTE_ZIP",
+    "CMTE_DSGN", "CMTE_TP", "CMTE_PTY_AFFILIATION", "CMTE_FILING_FREQ", "ORG_TP",
+    "CONNECTED_ORG_NM", "CAND_ID",
+]
+
+# Field positions used by the byte-level prefilter
+YEAR_FIELD = CANDIDATE_COLUMNS.index("CAND_ELECTION_YR")
+STATE_FIELD = CANDIDATE_COLUMNS.index("CAND_OFFICE_ST")
+OFFICE_FIELD = CANDIDATE_COLUMNS.index("CAND_OFFICE")
+
+FEDERAL_OFFICES = {"H": "House", "S": "Senate"}
+
+FEC_PARTIES = {
+    "REP": "Republican",
+    "DEM": "Democratic",
+    "IND": "Independent",
+    "GRE": "Green",
+    "LIB": "Libertarian",
+}
+
+NAME_PREFIXES = {"MR", "MRS", "MS", "DR", "HON"}
+NAME_SUFFIXES = {"JR", "SR", "II", "III", "IV"}
+
+HOUSE_DISTRICT_PATTERN = re.compile(r"(?:district\s*)?(\d+)", re.IGNORECASE)
+
+
+def current_cycle(today=None):
+    """The two-year FEC election cycle containing today (named for its even year)."""
+    year = (today or date.today()).year
+    return year + year % 2
+
+
+def iter_lines(path):
+    """Yield the raw lines of a file (as bytes) through a read-only memory map."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            size = len(mm)
+            while start < size:
+                end = mm.find(b"\n", start)
+                if end == -1:
+                    end = size
+                line = mm[start:end].rstrip(b"\r")
+                if line:
+                    yield line
+                start = end + 1
+
+
+def decode_fields(fields, columns):
+    """Turn the split byte fields of one line into a dict of strings."""
+    return {name: value.decode("utf-8", "replace").strip() for name, value in zip(columns, fields)}
+
+
+def format_candidate_name(fec_name):
+    """Turn "SPANBERGER, ABIGAIL DAVIS MS." into "Abigail Spanberger"."""
+    last, _, given = fec_name.partition(",")
+    given_parts = [part for part in given.replace(".", " ").split()
+                   if part.upper() not in NAME_PREFIXES]
+    suffixes = [part for part in given_parts if part.upper() in NAME_SUFFIXES]
+    given_parts = [part for part in given_parts if part.upper() not in NAME_SUFFIXES]
+
+    name_parts = given_parts[:1] + [last.strip()] + suffixes
+    name = " ".join(part for part in name_parts if part).title()
+    # .title() lowercases roman numerals ("Iii"); put them back
+    return re.sub(r"\b(Ii|Iii|Iv)\b", lambda m: m.group(1).upper(), name)
+
+
+def iter_candidates(cn_path, cycle, states):
+    """Stream House and Senate candidates for one cycle and set of states.
+
+    A cycle covers its odd and even year, so special elections held in the odd
+    year are included.
+
+    Args:
+        cn_path: Path to the FEC candidate master file (cn.txt)
+        cycle: Even-numbered cycle year, e.g. 2026
+        states: Collection of two-letter state codes to keep
+
+    Yields:
+        Candidate dicts with the CANDIDATE_COLUMNS fields
+    """
+    years = {str(cycle - 1).encode(), str(cycle).encode()}
+    state_keys = {state.encode() for state in states}
+    offices = {office.encode() for office in FEDERAL_OFFICES}
+
+    for line in iter_lines(cn_path):
+        fields = line.split(b"|")
+        if len(fields) <= OFFICE_FIELD:
+            continue
+        # Compare raw bytes first; only matching lines are decoded
+        if (fields[YEAR_FIELD] in years and fields[STATE_FIELD] in state_keys
+                and fields[OFFICE_FIELD] in offices):
+            yield decode_fields(fields, CANDIDATE_COLUMNS)
+
+
+def load_committee_names(cm_path, committee_ids):
+    """Return {committee id: name} for the given committees from cm.txt."""
+    wanted = {committee_id.encode() for committee_id in committee_ids if committee_id}
+    names = {}
+    if not wanted or not cm_path or not os.path.exists(cm_path):
+        return names
+
+    for line in iter_lines(cm_path):
+        committee_id, _, rest = line.partition(b"|")
+        if committee_id in wanted:
+            names[committee_id.decode()] = decode_fields(rest.split(b"|"), COMMITTEE_COLUMNS[1:])["CMTE_NM"]
+    return names
+
+
+def load_fec_candidates(cn_path, cm_path=None, cycle=None, states=()):
+    """Load the candidates for our states in the JSON-ready form used in elections.json.
+
+    Returns:
+        List of dicts with name, party, incumbent, fecId, state, office
+        ("House"/"Senate"), district (int or None) and committee (name or None)
+    """
+    cycle = cycle or current_cycle()
+    raw = list(iter_candidates(cn_path, cycle, states))
+    committees = load_committee_names(cm_path, (row["CAND_PCC"] for row in raw))
+
+    candidates = []
+    for row in raw:
+        district = row["CAND_OFFICE_DISTRICT"]
+        party = row["CAND_PTY_AFFILIATION"]
+        candidates.append({
+            "name": format_candidate_name(row["CAND_NAME"]),
+            "party": FEC_PARTIES.get(party, party),
+            "incumbent": row["CAND_ICI"] == "I",
+            "fecId": row["CAND_ID"],
+            "state": row["CAND_OFFICE_ST"],
+            "office": FEDERAL_OFFICES[row["CAND_OFFICE"]],
+            "district": int(district) if district.isdigit() and int(district) > 0 else None,
+            "committee": committees.get(row["CAND_PCC"]),
+        })
+    return candidates
+
+
+def election_office(election):
+    """Return ("Senate", None) or ("House", district) for a federal election, else None."""
+    title = election.get("title", "")
+    chamber = election.get("chamberImpact")
+    if chamber == "Senate" or title.startswith("U.S. Senate"):
+        return "Senate", None
+    if chamber == "House" or title.startswith("U.S. House"):
+        match = HOUSE_DISTRICT_PATTERN.search(title.split("-", 1)[-1])
+        return "House", int(match.group(1)) if match else None
+    return None
+
+
+def attach_fec_candidates(election_data, candidates, source=None):
+    """Add FEC candidates to the matching House and Senate elections, in place.
+
+    Senate candidates go to the state's Senate race. House candidates go to the
+    race for their district, or to every House race in a state whose titles name
+    no district. Candidates already listed, even under another spelling, are not
+    repeated but gain the FEC fields (see entity_resolution.py); with a source
+    name, their provenance records it.
+
+    Returns:
+        Number of candidates attached
+    """
+    by_race = {}
+    for candidate in candidates:
+        by_race.setdefault((candidate["state"], candidate["office"]), []).append(candidate)
+
+    attached = 0
+    for state_code, state_data in election_data.items():
+        for election in state_data.get("elections", []):
+            office = election_office(election)
+            if not office:
+                continue
+            chamber, district = office
+
+            incoming = [{key: candidate[key] for key in ("name", "party", "incumbent", "fecId", "committee")}
+                        for candidate in by_race.get((state_code, chamber), [])
+                        if district is None or candidate["district"] in (None, district)]
+            if not incoming:
+                continue
+            resolver = CandidateResolver()
+            office_key = election.get("title", "")
+            entities = resolver.resolve(election.get("candidates"), state_code, office_key)
+            added = resolver.resolve(incoming, state_code, office_key, source)
+            election["candidates"] = [Candidate.from_dict(entity) for entity in entities + added]
+            attached += len(added)
+    return attached
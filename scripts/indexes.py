@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Data Export Indexes
+Precomputed lookups written next to electionData in elections.json, so the site
+answers "which states have a Senate race", "states in name order" or "what is
+coming up next" with a lookup instead of scanning and sorting every state.
+"""
+
+from csv_to_json import GENERAL_RACE_COLUMNS
+
+
+def state_sort_key(election_data, state_code):
+    """Sort key that orders state codes by state name."""
+    return election_data[state_code].get("stateName", state_code).lower()
+
+
+def build_indexes(election_data):
+    """Build the indexes for one electionData dict.
+
+    Returns:
+        Dict with:
+            byType: race type (Senate/Governor/Court) -> state codes, by state name
+            byChamber: chamberImpact -> state codes, by state name
+            statesByName: every state code, by state name
+            electionsByDate: [state code, election index, ISO date] sorted by date,
+                with undated elections last
+    """
+    states_by_name = sorted(election_data, key=lambda code: state_sort_key(election_data, code))
+
+    by_type = {race: [] for race in GENERAL_RACE_COLUMNS}
+    by_chamber = {}
+    elections_by_date = []
+
+    # Walking states in name order keeps every per-state list sorted without a re-sort
+    for state_code in states_by_name:
+        state_data = election_data[state_code]
+        for race in state_data.get("generalRaces", []):
+            by_type.setdefault(race, []).append(state_code)
+
+        for index, election in enumerate(state_data.get("elections", [])):
+            chamber = election.get("chamberImpact")
+            if chamber:
+                codes = by_chamber.setdefault(chamber, [])
+                if not codes or codes[-1] != state_code:
+                    codes.append(state_code)
+            elections_by_date.append([state_code, index, election.get("dateISO")])
+
+    elections_by_date.sort(key=lambda entry: (entry[2] is None, entry[2] or ""))
+
+    return {
+        "byType": by_type,
+        "byChamber": by_chamber,
+        "statesByName": states_by_name,
+        "electionsByDate": elections_by_date,
+    }
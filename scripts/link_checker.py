@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Link Health Checker
+Checks every URL in the Logistics CSV and DEFAULT_REGISTRATION_SITES (elections
+websites, registration checks, online registration and absentee forms) and
+reports the dead ones, since a broken registration link is the most common
+problem users report.
+
+- Links are checked concurrently over one pooled HTTP session, with at most a
+  few requests in flight per host so state sites are not hammered.
+- Each link is tried with HEAD first, and with a (streamed, unread) GET when the
+  server refuses or fails HEAD, as many government sites do.
+- Results are cached in .cache/link_health.json: live links are not checked
+  again for a week, dead ones for a day.
+
+The pipeline's "links" step (pipeline.py --check-links) passes the dead links to
+merge_data, which falls back to the default registration site for those states.
+
+Usage:
+    python link_checker.py             Check every link and write a link-rot report to logs/
+    python link_checker.py --refresh   Ignore cached results
+"""
+
+import csv
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ballotpedia_api import USER_AGENT
+from csv_to_json import DEFAULT_REGISTRATION_SITES, logistics_state_code
+
+BASE_DIR = Path(__file__).parent.parent
+CACHE_FILE = BASE_DIR / ".cache" / "link_health.json"
+LOG_DIR = BASE_DIR / "logs"
+
+# Short names for the Logistics CSV columns that hold links; other columns keep their header
+LINK_COLUMNS = {
+    "Elections website?": "electionsWebsite",
+    "Check registration?": "checkRegistration",
+    "Online registration? (REQUIRES STATE ID)": "onlineRegistration",
+    "Absentee request forms:": "absenteeForms",
+    "Where to mail absentee request": "absenteeMail",
+}
+DEFAULT_FIELD = "defaultRegistration"
+URL_IN_TEXT = re.compile(r"https?://[^\s,\"'<>()]+")
+
+CONCURRENCY = 16
+PER_HOST = 2
+# Seconds a cached result is trusted
+LIVE_TTL = 7 * 24 * 3600
+DEAD_TTL = 24 * 3600
+# HEAD answers that mean "try GET instead" rather than "dead"
+HEAD_UNSUPPORTED = {400, 403, 404, 405, 406, 429, 500, 501, 503}
+
+
+def collect_links(logistics_csv=None, defaults=DEFAULT_REGISTRATION_SITES):
+    """Every link to check, as dicts of state, field and url.
+
+    Args:
+        logistics_csv: Logistics CSV to read links from (None: only the defaults)
+        defaults: Default registration sites by state code
+    """
+    links = []
+    if logistics_csv:
+        with open(logistics_csv, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                state_name = (row.get('State') or '').strip()
+                if not state_name or state_name.startswith('**'):
+                    continue
+                state_code = logistics_state_code(state_name)
+                if not state_code:
+                    continue
+                for column, value in row.items():
+                    for url in URL_IN_TEXT.findall(value or ''):
+                        links.append({"state": state_code, "field": LINK_COLUMNS.get(column, column),
+                                      "url": url.rstrip('.;:')})
+
+    for state_code, url in defaults.items():
+        links.append({"state": state_code, "field": DEFAULT_FIELD, "url": url})
+    return links
+
+
+class LinkChecker:
+    def __init__(self, concurrency=CONCURRENCY, per_host=PER_HOST, timeout=10, cache_file=CACHE_FILE,
+                 live_ttl=LIVE_TTL, dead_ttl=DEAD_TTL, session=None):
+        """Create a checker with a pooled HTTP session and a result cache.
+
+        Args:
+            concurrency: Links checked at once
+            per_host: Requests in flight to any one host
+            timeout: Seconds per HTTP request
+            cache_file: JSON file of earlier results (None: do not cache)
+            live_ttl: Seconds before a live link is checked again
+            dead_ttl: Seconds before a dead link is checked again
+            session: Existing requests.Session to use instead of creating one
+        """
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.live_ttl = live_ttl
+        self.dead_ttl = dead_ttl
+        self.requests_made = 0
+        self.host_limits = {}
+        self.lock = threading.Lock()
+        self.cache = self.load_cache()
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+        self.session = session
+
+    def load_cache(self):
+        """Earlier results by URL."""
+        if not self.cache_file:
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_cache(self):
+        """Write the results to the cache file."""
+        if not self.cache_file:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f, indent=2, sort_keys=True)
+
+    def cached(self, url):
+        """The cached result for a URL, if it has not expired."""
+        result = self.cache.get(url)
+        if not result:
+            return None
+        ttl = self.live_ttl if result["ok"] else self.dead_ttl
+        return result if time.time() - result["checked"] < ttl else None
+
+    def host_limit(self, url):
+        """The semaphore limiting requests to a URL's host."""
+        host = urlsplit(url).netloc.lower()
+        with self.lock:
+            if host not in self.host_limits:
+                self.host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self.host_limits[host]
+
+    def request(self, method, url):
+        """Make one request and return its status code and final URL."""
+        with self.lock:
+            self.requests_made += 1
+        with self.session.request(method, url, timeout=self.timeout, allow_redirects=True,
+                                  stream=method == "GET") as response:
+            return response.status_code, response.url
+
+    def check(self, url, refresh=False):
+        """Check one link, with HEAD and then GET if HEAD is refused.
+
+        Returns:
+            Dict with url, ok, status, finalUrl, method, error and checked (a timestamp)
+        """
+        if not refresh:
+            result = self.cached(url)
+            if result:
+                return result
+
+        result = {"url": url, "ok": False, "status": None, "finalUrl": None, "method": None, "error": None}
+        with self.host_limit(url):
+            for method in ("HEAD", "GET"):
+                try:
+                    status, final_url = self.request(method, url)
+                except requests.RequestException as e:
+                    result.update(method=method, error=type(e).__name__, status=None, finalUrl=None)
+                    continue
+                result.update(method=method, status=status, finalUrl=final_url, error=None, ok=status < 400)
+                if result["ok"] or status not in HEAD_UNSUPPORTED:
+                    break
+
+        result["checked"] = time.time()
+        with self.lock:
+            self.cache[url] = result
+        return result
+
+    def check_all(self, urls, refresh=False):
+        """Check many links concurrently.
+
+        Returns:
+            Dict mapping each distinct URL to its result
+        """
+        urls = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = dict(zip(urls, executor.map(lambda url: self.check(url, refresh), urls)))
+        self.save_cache()
+        return results
+
+    def close(self):
+        """Close the HTTP session."""
+        self.session.close()
+
+
+def link_rot_report(links, results):
+    """Summarize the checked links: dead links with where they appear, and counts per field."""
+    dead = []
+    by_field = {}
+    for link in links:
+        result = results[link["url"]]
+        counts = by_field.setdefault(link["field"], {"checked": 0, "dead": 0})
+        counts["checked"] += 1
+        if not result["ok"]:
+            counts["dead"] += 1
+            dead.append({**link, "status": result["status"], "error": result["error"]})
+
+    return {
+        "generated": datetime.now().isoformat(),
+        "links": len(links),
+        "urls": len(results),
+        "deadUrls": sorted({link["url"] for link in dead}),
+        "dead": dead,
+        "byField": by_field,
+    }
+
+
+def write_report(report, output_file=None):
+    """Write a link-rot report to logs/."""
+    if output_file is None:
+        LOG_DIR.mkdir(exist_ok=True)
+        output_file = LOG_DIR / f"link_health_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return output_file
+
+
+def check_links(logistics_csv=None, refresh=False, checker=None):
+    """Check every logistics and default link and return the link-rot report.
+
+    A checker passed in is left open for the caller; one created here is closed.
+    """
+    links = collect_links(logistics_csv)
+    own_checker = checker is None
+    checker = checker or LinkChecker()
+    try:
+        results = checker.check_all([link["url"] for link in links], refresh=refresh)
+    finally:
+        if own_checker:
+            checker.close()
+    return link_rot_report(links, results)
+
+
+def main():
+    """Check the latest logistics CSV's links and report the dead ones."""
+    import sys
+    from cycles import latest_input
+
+    cycle = sys.argv[sys.argv.index('--cycle') + 1] if '--cycle' in sys.argv[:-1] else None
+    logistics_csv = latest_input("logistics_csv", cycle)
+    print(f"🔗 Checking links from {logistics_csv} and the default registration sites...")
+    report = check_links(logistics_csv, refresh='--refresh' in sys.argv)
+
+    for field, counts in sorted(report["byField"].items()):
+        print(f"   {field}: {counts['dead']}/{counts['checked']} dead")
+    for link in report["dead"]:
+        print(f"   ✗ {link['state']} {link['field']}: {link['url']} ({link['status'] or link['error']})")
+    print(f"📁 Report written to {write_report(report)}")
+    return 0 if not report["dead"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
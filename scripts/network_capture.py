@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Network Capture
+Learns the JSON endpoints behind state election websites, so later runs can skip
+the browser.
+
+Many state portals render their election calendars from XHR/fetch calls that
+return JSON. With capture on, the scraper reads Chrome's performance log after a
+page settles, pulls the bodies of JSON responses through the DevTools protocol,
+and keeps the endpoints whose JSON lists elections in the cycle:
+
+    .cache/state_endpoints.json   {state: [{url, method, postData, headers, elections, score}]}
+
+On later runs those endpoints are requested directly over plain HTTP and their
+JSON is turned into election records; the state's site is only rendered in
+Chrome when that fails or finds nothing.
+"""
+
+import base64
+import json
+import logging
+import os
+import re
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from cycles import in_cycle
+from dates import normalize_date
+from relevance import score_page
+from state_extractors import DATE_IN_TEXT, TITLE_SEPARATORS, election_record
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are still atomic, just not serialized
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent.parent
+ENDPOINTS_FILE = BASE_DIR / ".cache" / "state_endpoints.json"
+
+# Only these responses can carry a site's data
+CAPTURE_TYPES = {"XHR", "Fetch"}
+JSON_MIME = re.compile(r"[/+]json\b", re.IGNORECASE)
+# Larger bodies are not read
+MAX_BODY_BYTES = 5 * 1024 * 1024
+# Request headers replayed when calling an endpoint directly (cookies and auth are not)
+REPLAY_HEADERS = {"accept", "content-type", "x-requested-with"}
+# Endpoints kept per state, most elections first
+MAX_ENDPOINTS = 3
+
+# Keys of a JSON object that hold an entry's title, in order of preference, and its date
+TITLE_KEYS = [re.compile(pattern, re.IGNORECASE)
+              for pattern in (r"title", r"election|event", r"name|label", r"description|summary")]
+DATE_KEYS = re.compile(r"date|day|start|when", re.IGNORECASE)
+MAX_TITLE_LENGTH = 200
+
+Captured = namedtuple("Captured", "url method post_data headers data")
+
+
+def performance_messages(entries):
+    """DevTools messages from Chrome performance log entries."""
+    for entry in entries:
+        try:
+            yield json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+
+
+def json_requests(entries):
+    """requestId -> request details for every successful JSON XHR/fetch response in the log."""
+    requests_sent = {}
+    responses = {}
+    for message in performance_messages(entries):
+        params = message.get("params", {})
+        if message.get("method") == "Network.requestWillBeSent":
+            requests_sent[params.get("requestId")] = params.get("request", {})
+        elif message.get("method") == "Network.responseReceived":
+            response = params.get("response", {})
+            if (params.get("type") in CAPTURE_TYPES and response.get("status") == 200
+                    and JSON_MIME.search(response.get("mimeType", ""))):
+                responses[params.get("requestId")] = response
+
+    found = {}
+    for request_id, response in responses.items():
+        request = requests_sent.get(request_id, {})
+        found[request_id] = {
+            "url": request.get("url") or response.get("url"),
+            "method": request.get("method", "GET"),
+            "postData": request.get("postData"),
+            "headers": {key: value for key, value in request.get("headers", {}).items()
+                        if key.lower() in REPLAY_HEADERS},
+        }
+    return found
+
+
+def response_body(driver, request_id):
+    """Body of a response still held by the browser, or None once it is gone."""
+    try:
+        result = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+    except Exception as e:
+        logger.debug(f"No body for request {request_id}: {e}")
+        return None
+    body = result.get("body", "")
+    if result.get("base64Encoded"):
+        body = base64.b64decode(body).decode("utf-8", errors="replace")
+    return body
+
+
+def capture_json_responses(driver, entries):
+    """Captured JSON responses of the current page, from its performance log entries.
+
+    Bodies are only available until the browser navigates away, so call this
+    before loading the next page.
+    """
+    captured = []
+    for request_id, request in json_requests(entries).items():
+        if request["method"] not in ("GET", "POST"):
+            continue
+        body = response_body(driver, request_id)
+        if not body or len(body) > MAX_BODY_BYTES:
+            continue
+        try:
+            data = json.loads(body)
+        except ValueError:
+            continue
+        captured.append(Captured(request["url"], request["method"], request["postData"], request["headers"], data))
+    return captured
+
+
+def iter_objects(data):
+    """Every JSON object (dict) inside a JSON value."""
+    pending = deque([data])
+    while pending:
+        value = pending.popleft()
+        if isinstance(value, dict):
+            yield value
+            pending.extend(value.values())
+        elif isinstance(value, list):
+            pending.extend(value)
+
+
+def json_text(data):
+    """The strings in a JSON value, joined, for relevance scoring."""
+    return " ".join(str(value) for value in iter_scalars(data))
+
+
+def iter_scalars(data):
+    """Every string and number inside a JSON value."""
+    if isinstance(data, dict):
+        for value in data.values():
+            yield from iter_scalars(value)
+    elif isinstance(data, list):
+        for value in data:
+            yield from iter_scalars(value)
+    elif isinstance(data, (str, int, float)) and not isinstance(data, bool):
+        yield data
+
+
+def field_date(value):
+    """Normalized date of a JSON field value, or None."""
+    if not isinstance(value, str):
+        return None
+    normalized = normalize_date(value)
+    if normalized is not None and normalized.iso:
+        return normalized
+    match = DATE_IN_TEXT.search(value)
+    if match:
+        normalized = normalize_date(match.group(0))
+        if normalized is not None and normalized.iso:
+            return normalized
+    return None
+
+
+def elections_from_json(data, cycle=None):
+    """Election records from a JSON response: every object with a title and a date field.
+
+    Args:
+        data: Parsed JSON
+        cycle: Only keep elections in this cycle's year (default: keep every dated entry)
+    """
+    elections = []
+    seen = set()
+    for obj in iter_objects(data):
+        normalized = None
+        for key, value in obj.items():
+            if DATE_KEYS.search(key):
+                normalized = field_date(value)
+                if normalized:
+                    break
+        if normalized is None:
+            continue
+        if cycle is not None and not in_cycle(cycle, normalized.iso):
+            continue
+
+        title = next((" ".join(value.split()).strip(TITLE_SEPARATORS)
+                      for pattern in TITLE_KEYS for key, value in obj.items()
+                      if pattern.search(key) and isinstance(value, str) and value.strip()
+                      and field_date(value) is None), None)
+        if not title or len(title) > MAX_TITLE_LENGTH:
+            continue
+
+        key = (title.lower(), normalized.iso)
+        if key in seen:
+            continue
+        seen.add(key)
+        elections.append(election_record(title, normalized))
+    return elections
+
+
+class EndpointStore:
+    def __init__(self, path=ENDPOINTS_FILE):
+        """Learned JSON endpoints per state, kept in a JSON file shared by every scraper process."""
+        self.path = Path(path)
+        self.endpoints = self.read()
+        # States learned or forgotten since the file was read: state -> endpoints, or None once forgotten
+        self.changes = {}
+
+    def read(self):
+        """The endpoints on disk, or {} if there are none yet."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read learned endpoints from {self.path}: {e}")
+            return {}
+
+    def get(self, state_code):
+        """A state's learned endpoints, most elections first."""
+        return self.endpoints.get(state_code, [])
+
+    def learn(self, state_code, captured, cycle=None):
+        """Keep the captured responses that list elections in the cycle as the state's endpoints.
+
+        Returns:
+            The endpoints learned
+        """
+        learned = []
+        for response in captured:
+            elections = elections_from_json(response.data, cycle)
+            if not elections:
+                continue
+            learned.append({
+                "url": response.url,
+                "method": response.method,
+                "postData": response.post_data,
+                "headers": response.headers,
+                "elections": len(elections),
+                "score": score_page(json_text(response.data), cycle).score,
+                "learned": datetime.now().isoformat(timespec="seconds"),
+            })
+        if learned:
+            learned.sort(key=lambda endpoint: (-endpoint["elections"], -endpoint["score"]))
+            unique = {}
+            for endpoint in learned:
+                unique.setdefault((endpoint["url"], endpoint["postData"]), endpoint)
+            self.endpoints[state_code] = self.changes[state_code] = list(unique.values())[:MAX_ENDPOINTS]
+        return learned
+
+    def forget(self, state_code):
+        """Drop a state's endpoints, e.g. once they stop answering."""
+        self.endpoints.pop(state_code, None)
+        self.changes[state_code] = None
+
+    @contextmanager
+    def locked(self):
+        """Hold an exclusive lock on the store while reading and rewriting it."""
+        with open(self.path.with_name(f"{self.path.name}.lock"), 'a', encoding='utf-8') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def save(self):
+        """Apply this store's changes to the file on disk.
+
+        Other processes may have saved since this one read the file, so it is re-read
+        under a lock and only the states learned or forgotten here are replaced. The
+        file is written to a temporary file and renamed, so readers never see half of it.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.locked():
+            endpoints = self.read()
+            for state_code, learned in self.changes.items():
+                if learned is None:
+                    endpoints.pop(state_code, None)
+                else:
+                    endpoints[state_code] = learned
+            temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(endpoints, f, indent=2)
+            os.replace(temp_path, self.path)
+        self.endpoints = endpoints
+        self.changes = {}
+        return self.path
+
+
+def fetch_endpoint(session, endpoint, timeout=15):
+    """Call a learned endpoint over plain HTTP and return its parsed JSON."""
+    response = session.request(endpoint["method"], endpoint["url"], data=endpoint.get("postData"),
+                               headers=endpoint.get("headers") or {}, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Page Parsers
+CPU-bound parsing of fetched election pages. The functions here work on raw HTML
+or wikitext rather than live WebDriver elements, so they can run in a process pool
+while the next pages are being fetched.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from election_model import Election, StateRecord
+
+PARTY_NAMES = {
+    'R': 'Republican',
+    'D': 'Democratic',
+    'I': 'Independent',
+    'G': 'Green'
+}
+
+# Look for patterns like "John Doe (R)" or "Jane Smith (D)"
+CANDIDATE_PATTERN = re.compile(r'([A-Z][a-z]+ [A-Z][a-z]+)\s*\(([RDIG])\)')
+SECTION_TITLE_PATTERN = re.compile(r'Elections|Races')
+CANDIDATE_KEYWORDS = ['candidate', 'running', 'incumbent']
+
+# Race listings also write "John Doe - R" and include middle names
+RACE_CANDIDATE_PATTERNS = [
+    re.compile(r'([A-Z][a-z]+ [A-Z][a-z]+(?: [A-Z][a-z]+)?)\s*\(([RDIG])\)'),
+    re.compile(r'([A-Z][a-z]+ [A-Z][a-z]+(?: [A-Z][a-z]+)?)\s*-\s*([RDIG])\b'),
+]
+
+# Wikitext markup
+WIKI_HEADING = re.compile(r'^(={2,6})\s*(.*?)\s*\1\s*$')
+WIKI_LINK = re.compile(r'\[\[(?:[^\]|]*\|)?([^\]|]+)\]\]')
+WIKI_EXTERNAL_LINK = re.compile(r'\[https?://\S+\s+([^\]]+)\]')
+WIKI_TEMPLATE = re.compile(r'\{\{[^{}]*\}\}')
+WIKI_REF = re.compile(r'<ref[^>/]*/>|<ref[^>]*>.*?</ref>', re.DOTALL)
+WIKI_EMPHASIS = re.compile(r"'{2,}")
+HTML_TAG = re.compile(r'<[^>]+>')
+DISTRICT_PATTERN = re.compile(r'District (\d+)|(\d+)(?:st|nd|rd|th) Congressional District')
+YEAR_PATTERN = re.compile(r'\b\d{4}\b')
+
+
+def extract_candidate_info(text):
+    """Extract candidate information from text."""
+    candidates = []
+    incumbent = "incumbent" in text.lower()
+
+    for name, party in CANDIDATE_PATTERN.findall(text):
+        candidates.append({
+            "name": name,
+            "party": PARTY_NAMES.get(party, party),
+            "incumbent": incumbent
+        })
+
+    return candidates
+
+
+def extract_race_candidates(text):
+    """Extract candidates from a race listing, e.g. "Jane Smith (D)" or "Jane Q Smith - D"."""
+    candidates = []
+    incumbent = "incumbent" in text.lower() or "re-election" in text.lower()
+
+    for pattern in RACE_CANDIDATE_PATTERNS:
+        for name, party in pattern.findall(text):
+            candidates.append({
+                "name": name.strip(),
+                "party": PARTY_NAMES.get(party, party),
+                "incumbent": incumbent
+            })
+
+    return candidates
+
+
+def determine_chamber_impact(title):
+    """Determine which chamber this election affects."""
+    title_lower = title.lower()
+    if "senate" in title_lower:
+        return "Senate"
+    elif "house" in title_lower or "representative" in title_lower:
+        return "House"
+    elif any(office in title_lower for office in ["governor", "attorney general", "secretary", "treasurer"]):
+        return "State"
+    else:
+        return "Local"
+
+
+def build_state_record(sections, state_code, context):
+    """Turn (section title, [paragraph texts]) pairs into the per-state record used in elections.json.
+
+    Returns None if no "... Elections" or "... Races" section lists any candidates.
+    """
+    elections = []
+
+    for title, texts in sections:
+        if not SECTION_TITLE_PATTERN.search(title):
+            continue
+
+        candidates = []
+        date = context.get("electionDay", "")  # Default to the cycle's general election date
+
+        for text in texts:
+            if any(keyword in text.lower() for keyword in CANDIDATE_KEYWORDS):
+                candidates.extend(extract_candidate_info(text))
+
+        if candidates:
+            elections.append(Election(
+                title=title,
+                date=date,
+                type="General Election",
+                candidates=candidates,
+                stakes=f"Key race in {context.get('stateName', state_code)}",
+                chamberImpact=determine_chamber_impact(title),
+                competitive=True
+            ))
+
+    if not elections:
+        return None
+
+    return StateRecord(
+        stateName=context.get("stateName", state_code),
+        registrationWebsite=context.get("registrationWebsite", ""),
+        registrationDeadline=context.get("registrationDeadline", ""),
+        elections=elections
+    )
+
+
+def parse_state_elections_html(html, state_code, context):
+    """Extract election information from a state's Ballotpedia page.
+
+    Args:
+        html: Page source of the state page
+        state_code: Two-letter state code
+        context: Dict with the state-level fields to attach ("stateName",
+            "registrationWebsite", "registrationDeadline") and the cycle's "electionDay"
+
+    Returns:
+        The per-state StateRecord used in elections.json, or None if no races were found
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    sections = []
+
+    for section in soup.find_all("h2"):
+        texts = []
+        # Look for candidate information in the next 10 elements of this section
+        for element in section.find_next_siblings(limit=10):
+            if element.name in ['h2', 'h3']:
+                break  # Stop at next section
+            texts.append(element.get_text(" ", strip=True))
+        sections.append((section.get_text(" ", strip=True), texts))
+
+    return build_state_record(sections, state_code, context)
+
+
+def wikitext_to_text(wikitext):
+    """Strip links, templates, references and markup from a line of wikitext."""
+    text = WIKI_REF.sub("", wikitext)
+    # Templates can nest; remove the innermost ones until none are left
+    previous = None
+    while previous != text:
+        previous, text = text, WIKI_TEMPLATE.sub("", text)
+    text = WIKI_LINK.sub(r"\1", text)
+    text = WIKI_EXTERNAL_LINK.sub(r"\1", text)
+    text = HTML_TAG.sub("", text)
+    text = WIKI_EMPHASIS.sub("", text)
+    return " ".join(text.lstrip("*#:;| ").split())
+
+
+def iter_wikitext_sections(wikitext):
+    """Yield (level, heading text, [plain-text lines]) for each section of a page.
+
+    Text before the first heading is yielded as level 1 with an empty heading.
+    """
+    level, title, lines = 1, "", []
+    for raw_line in wikitext.splitlines():
+        heading = WIKI_HEADING.match(raw_line.strip())
+        if heading:
+            yield level, title, lines
+            level, title, lines = len(heading.group(1)), wikitext_to_text(heading.group(2)), []
+            continue
+        text = wikitext_to_text(raw_line)
+        if text:
+            lines.append(text)
+    yield level, title, lines
+
+
+def parse_state_elections_wikitext(wikitext, state_code, context):
+    """Extract election information from the wikitext of a state's Ballotpedia page.
+
+    Produces the same records as parse_state_elections_html: every level-2
+    section up to the next heading (at most 10 lines) is checked for candidates.
+    """
+    sections = [(title, lines[:10]) for level, title, lines in iter_wikitext_sections(wikitext) if level == 2]
+    return build_state_record(sections, state_code, context)
+
+
+def state_name_pattern(state_codes):
+    """Compile a pattern matching any state name, longest first ("West Virginia" before "Virginia")."""
+    names = sorted(state_codes, key=len, reverse=True)
+    return re.compile(r"\b(" + "|".join(re.escape(name) for name in names) + r")\b", re.IGNORECASE)
+
+
+def parse_senate_races_wikitext(wikitext, state_codes):
+    """Find the candidates in each state's section of a Senate elections page.
+
+    Args:
+        wikitext: Wikitext of the "United States Senate elections" page
+        state_codes: Dict mapping lowercase state name to state code
+
+    Returns:
+        List of (state code, candidates), in page order
+    """
+    races = []
+    for level, title, lines in iter_wikitext_sections(wikitext):
+        state_code = state_codes.get(YEAR_PATTERN.sub("", title).strip().lower())
+        if not state_code:
+            continue
+        # Candidates are listed near the top of each state's section
+        candidates = [candidate for line in lines[:5] for candidate in extract_race_candidates(line)]
+        if candidates:
+            races.append((state_code, candidates))
+    return races
+
+
+def parse_house_races_wikitext(wikitext, state_codes):
+    """Find every House district race with candidates on a House elections page.
+
+    The state comes from the line itself or, failing that, from the section
+    heading when it names a state.
+
+    Returns:
+        List of (state code, district, candidates, competitive), in page order
+    """
+    pattern = state_name_pattern(state_codes)
+    races = []
+    for level, title, lines in iter_wikitext_sections(wikitext):
+        heading_state = pattern.search(title)
+        section_competitive = any(word in title.lower() for word in ("competitive", "battleground"))
+        for line in lines:
+            district = DISTRICT_PATTERN.search(line)
+            if not district:
+                continue
+            state = pattern.search(line) or heading_state
+            candidates = extract_race_candidates(line)
+            if state and candidates:
+                races.append((
+                    state_codes[state.group(1).lower()],
+                    district.group(1) or district.group(2),
+                    candidates,
+                    section_competitive or "competitive" in line.lower(),
+                ))
+    return races
+
+
+def _run_parse(parse, key, html, context):
+    """Pool worker: run one parse and return (key, result, error)."""
+    try:
+        return key, parse(html, key, context), None
+    except Exception as e:
+        return key, None, f"{type(e).__name__}: {e}"
+
+
+def parse_in_pool(pages, parse=parse_state_elections_html, workers=None):
+    """Parse fetched pages in a process pool while more pages are being fetched.
+
+    `pages` is consumed lazily, so when it is a generator that fetches each page on
+    demand, fetching (I/O in this process) overlaps with parsing (CPU in the pool).
+    At most two pages per worker are queued, which keeps memory flat on long runs.
+
+    Args:
+        pages: Iterable of (key, html, context) tuples
+        parse: Module-level function parse(html, key, context); must be picklable
+        workers: Number of parser processes (default: CPU count; 0 parses inline)
+
+    Yields:
+        (key, result, error) as each page finishes parsing
+    """
+    if workers == 0:
+        for key, html, context in pages:
+            yield _run_parse(parse, key, html, context)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for key, html, context in pages:
+            pending.add(pool.submit(_run_parse, parse, key, html, context))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
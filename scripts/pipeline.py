@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""
+Election Data Build Pipeline
+Runs the data build as a small DAG of steps: ingest CSVs, scrape, FEC candidates,
+merge, validate, export, search index, calendar feeds and publish. Each step
+records a hash of its inputs (source files, scripts and upstream outputs), and only
+steps whose inputs changed are rerun, so a no-op rebuild finishes almost instantly.
+
+The build runs once per election cycle declared in cycles.py, each with its own
+inputs, build directory and outputs. Frozen cycles are skipped once published.
+
+Usage:
+    python pipeline.py                 Rebuild stale steps of every cycle from the CSVs
+    python pipeline.py --cycle 2026    Only build one cycle
+    python pipeline.py --scrape        Also scrape (reruns when older than a day)
+    python pipeline.py --scrape-shards N
+                                       Use the merged results of a scrape sharded N ways
+                                       (advanced_election_scraper.py --shard i/N) instead
+    python pipeline.py --check-links   Check registration links and replace dead ones with the defaults
+    python pipeline.py --force merge   Rerun a step (and anything it changes)
+    python pipeline.py --dry-run       Show which steps would run
+"""
+
+import ast
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cycles import (CYCLES, calendar_dir, cycle_summary, get_cycle, in_cycle, latest_input, publish_targets,
+                    search_dir, write_cycles_manifest)
+from election_model import to_json
+from fec_bulk import current_cycle
+
+BASE_DIR = Path(__file__).parent.parent
+SCRIPTS_DIR = Path(__file__).parent
+CACHE_DIR = BASE_DIR / ".cache"
+STATE_FILE = CACHE_DIR / "pipeline_state.json"
+
+# Columnar (v2) export, published next to each elections.json
+COLUMNAR_FILE = "elections.v2.json"
+
+
+def file_digest(path):
+    """Return the sha256 hex digest of a file, or None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def read_json(path):
+    """Load a JSON file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json(path, data, indent=None):
+    """Write a JSON file, creating its directory if needed."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False, default=to_json)
+
+
+class Step:
+    def __init__(self, name, action, inputs=(), deps=(), outputs=(), params=None, max_age=None):
+        """Describe one pipeline step.
+
+        Args:
+            name: Unique step name
+            action: Callable taking the pipeline config; run when the step is stale
+            inputs: Files the step reads directly (CSVs, scripts)
+            deps: Names of upstream steps whose outputs this step reads
+            outputs: Files the step writes
+            params: JSON-serializable settings that should invalidate the step when changed
+            max_age: Rerun after this many seconds even if the inputs are unchanged
+        """
+        self.name = name
+        self.action = action
+        self.inputs = [Path(p) for p in inputs]
+        self.deps = list(deps)
+        self.outputs = [Path(p) for p in outputs]
+        self.params = params or {}
+        self.max_age = max_age
+
+
+def topological_order(steps):
+    """Return the steps ordered so every step comes after its dependencies."""
+    by_name = {step.name: step for step in steps}
+    for step in steps:
+        for dep in step.deps:
+            if dep not in by_name:
+                raise ValueError(f"Step '{step.name}' depends on unknown step '{dep}'")
+
+    ordered = []
+    done = set()
+    visiting = set()
+
+    def visit(step):
+        if step.name in done:
+            return
+        if step.name in visiting:
+            raise ValueError(f"Dependency cycle at step '{step.name}'")
+        visiting.add(step.name)
+        for dep in step.deps:
+            visit(by_name[dep])
+        visiting.discard(step.name)
+        done.add(step.name)
+        ordered.append(step)
+
+    for step in steps:
+        visit(step)
+    return ordered
+
+
+def step_signature(step, by_name):
+    """Hash everything a step's result depends on."""
+    digest = hashlib.sha256()
+    digest.update(step.name.encode())
+    digest.update(json.dumps(step.params, sort_keys=True, default=str).encode())
+    for path in step.inputs:
+        digest.update(f"{path}:{file_digest(path)}".encode())
+    for dep in step.deps:
+        for path in by_name[dep].outputs:
+            digest.update(f"{path}:{file_digest(path)}".encode())
+    return digest.hexdigest()
+
+
+def load_state(state_file):
+    """Load recorded step signatures."""
+    try:
+        return read_json(state_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def is_stale(step, signature, record, force):
+    """Decide whether a step has to run, and why."""
+    if step.name in force:
+        return "forced"
+    if not record:
+        return "never run"
+    if record.get("signature") != signature:
+        return "inputs changed"
+    if any(not path.exists() for path in step.outputs):
+        return "output missing"
+    if step.max_age is not None and time.time() - record.get("finished", 0) > step.max_age:
+        return "older than max age"
+    return None
+
+
+def run_pipeline(steps, config, state_file=STATE_FILE, force=(), dry_run=False):
+    """Run the stale steps of a pipeline in dependency order.
+
+    Returns:
+        Dict mapping step name to "ran", "up to date" or "would run"
+    """
+    ordered = topological_order(steps)
+    by_name = {step.name: step for step in ordered}
+    state = load_state(state_file)
+    results = {}
+
+    for step in ordered:
+        # Signatures are computed just before each step so they see upstream outputs
+        # that were rewritten earlier in this run.
+        signature = step_signature(step, by_name)
+        reason = is_stale(step, signature, state.get(step.name), set(force))
+        if reason is None:
+            print(f"⏭️  {step.name}: up to date")
+            results[step.name] = "up to date"
+            continue
+
+        if dry_run:
+            print(f"🔸 {step.name}: would run ({reason})")
+            results[step.name] = "would run"
+            continue
+
+        print(f"▶️  {step.name}: running ({reason})")
+        started = time.time()
+        step.action(config)
+        finished = time.time()
+
+        state[step.name] = {"signature": signature, "finished": finished}
+        write_json(state_file, state, indent=2)
+        print(f"✅ {step.name} ({finished - started:.2f}s)")
+        results[step.name] = "ran"
+
+    return results
+
+
+# ========================================
+# BUILD STEPS
+# ========================================
+
+def default_config(cycle=None, **overrides):
+    """Return the paths and settings for building one election cycle.
+
+    Inputs come from the cycle's declaration in cycles.py (default: the current
+    cycle); each cycle has its own build directory, step state and outputs.
+    """
+    cycle = get_cycle(cycle)
+    config = {
+        "cycle": cycle["id"],
+        "cycle_label": cycle["label"],
+        "election_day": cycle["electionDay"],
+        "frozen": cycle["frozen"],
+        "elections_csv": cycle["elections_csv"],
+        # State election websites and registration links carry over from earlier cycles
+        "logistics_csv": latest_input("logistics_csv", cycle["id"]),
+        "curated_json": cycle["curated_json"],
+        "general_csv": cycle["general_csv"],
+        "fec_candidates": cycle["fec_candidates"],
+        "fec_committees": cycle["fec_committees"],
+        "fec_cycle": current_cycle(date.fromisoformat(cycle["electionDate"])),
+        "build_dir": CACHE_DIR / "build" / cycle["id"],
+        "state_file": CACHE_DIR / "pipeline_state" / f"{cycle['id']}.json",
+        "publish_targets": publish_targets(cycle),
+        "search_dir": search_dir(cycle),
+        "calendar_dir": calendar_dir(cycle),
+        "scrape": False,
+        "scrape_max_age": 24 * 3600,
+        "scrape_shards": None,
+        "shard_dir": CACHE_DIR / "shards",
+        "scrape_queue": None,
+        "check_links": False,
+        "links_max_age": 24 * 3600,
+        "backup": cycle["current"],
+    }
+    config.update(overrides)
+    return config
+
+
+def declared_inputs(*paths):
+    """The inputs a cycle actually declares (unused ones are None)."""
+    return [path for path in paths if path]
+
+
+def is_entry_point(node):
+    """Whether a node is a script's command-line entry point (main() or the __main__ block)."""
+    if isinstance(node, ast.FunctionDef):
+        return node.name == "main"
+    return (isinstance(node, ast.If) and isinstance(node.test, ast.Compare)
+            and isinstance(node.test.left, ast.Name) and node.test.left.id == "__name__")
+
+
+@lru_cache(maxsize=None)
+def imported_scripts(name):
+    """Names of the scripts a script imports, at module level or inside functions.
+
+    Imports only made by its command-line entry point are left out: steps never run it.
+    """
+    try:
+        tree = ast.parse((SCRIPTS_DIR / f"{name}.py").read_text(encoding='utf-8'))
+    except OSError:
+        return frozenset()
+    names = set()
+    pending = [node for node in tree.body if not is_entry_point(node)]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module)
+        elif isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        pending.extend(ast.iter_child_nodes(node))
+    # The pipeline itself is the caller, not code a step runs
+    return frozenset(module for module in names
+                     if module != "pipeline" and (SCRIPTS_DIR / f"{module}.py").exists())
+
+
+def script_inputs(*names):
+    """Paths of the given scripts and every script they import, directly or indirectly.
+
+    A step lists the modules its action imports, so a change to any code it runs
+    makes it stale.
+    """
+    found = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in found:
+            continue
+        found.add(name)
+        pending.extend(imported_scripts(name))
+    return [SCRIPTS_DIR / f"{name}.py" for name in sorted(found)]
+
+
+def build_artifact(config, name):
+    """Path of an intermediate build file."""
+    return Path(config["build_dir"]) / name
+
+
+def columnar_target(target):
+    """Where the v2 export is published next to a published elections.json."""
+    return Path(target).with_name(COLUMNAR_FILE)
+
+
+def ingest_step(config):
+    """Parse the cycle's source CSVs and curated data."""
+    from csv_to_json import load_curated_json, parse_elections_csv, parse_general_election_csv, parse_logistics_csv
+
+    election_day = config["election_day"]
+    logistics = parse_logistics_csv(config["logistics_csv"], election_day) if config["logistics_csv"] else {}
+    # A logistics CSV carried over from an earlier cycle still lists that cycle's deadlines
+    for state_logistics in logistics.values():
+        if not in_cycle(config["cycle"], state_logistics["registrationDeadline"]):
+            del state_logistics["registrationDeadline"]
+
+    write_json(build_artifact(config, "ingest.json"), {
+        "elections": parse_elections_csv(config["elections_csv"], election_day) if config["elections_csv"] else {},
+        "logistics": logistics,
+        "general": parse_general_election_csv(config["general_csv"]) if config["general_csv"] else {},
+        "curated": load_curated_json(config["curated_json"]) if config["curated_json"] else {},
+    })
+
+
+def scrape_step(config):
+    """Scrape the web sources, or keep the previous scrape when scraping is off."""
+    output = build_artifact(config, "scraped.json")
+    if config["scrape_queue"]:
+        from scrape_queue import merge_queue_results
+        from work_queue import WorkQueue
+
+        with WorkQueue(config["scrape_queue"]) as queue:
+            if not queue.is_drained():
+                raise RuntimeError(f"Scrape queue {config['scrape_queue']} still has unfinished jobs")
+            write_json(output, merge_queue_results(queue))
+        return
+    if config["scrape_shards"]:
+        from advanced_election_scraper import SOURCE_ORDER
+        from sharding import merge_shards
+
+        merged, missing = merge_shards("advanced_scraper", config["scrape_shards"], config["cycle"],
+                                       SOURCE_ORDER, directory=config["shard_dir"])
+        if missing:
+            raise FileNotFoundError(f"Missing scrape shard results: {', '.join(str(path) for path in missing)}")
+        write_json(output, merged)
+        return
+    if not config["scrape"]:
+        if not output.exists():
+            write_json(output, {})
+        return
+
+    from advanced_election_scraper import AdvancedElectionScraper
+
+    scraper = AdvancedElectionScraper(logistics_csv=config["logistics_csv"], cycle=config["cycle"])
+    write_json(output, scraper.collect_election_data())
+
+
+def links_step(config):
+    """Check the cycle's registration links, or keep the previous result when checking is off."""
+    output = build_artifact(config, "links.json")
+    if not config["check_links"]:
+        if not output.exists():
+            write_json(output, {"deadUrls": []})
+        return
+
+    from link_checker import check_links, write_report
+
+    report = check_links(config["logistics_csv"])
+    print(f"   {len(report['deadUrls'])} dead links; report in {write_report(report)}")
+    write_json(output, {"deadUrls": report["deadUrls"]})
+
+
+def fec_step(config):
+    """Extract our states' House and Senate candidates from the FEC bulk files."""
+    from csv_to_json import STATE_CODES
+    from fec_bulk import load_fec_candidates
+
+    output = build_artifact(config, "fec.json")
+    if not config["fec_candidates"]:
+        write_json(output, [])
+        return
+    if not Path(config["fec_candidates"]).exists():
+        print(f"   No FEC candidate file at {config['fec_candidates']}; skipping")
+        write_json(output, [])
+        return
+
+    candidates = load_fec_candidates(config["fec_candidates"], config["fec_committees"],
+                                     cycle=config["fec_cycle"], states=STATE_CODES.values())
+    print(f"   {len(candidates)} FEC candidates")
+    write_json(output, candidates)
+
+
+def merge_step(config):
+    """Combine the CSV, scraped and FEC data, resolve duplicate candidates and precompute normalized dates."""
+    from csv_to_json import merge_data
+    from dates import annotate_state_dates
+    from election_records import merge_election_data
+    from entity_resolution import resolve_election_candidates
+    from fec_bulk import attach_fec_candidates
+
+    ingested = read_json(build_artifact(config, "ingest.json"))
+    scraped = read_json(build_artifact(config, "scraped.json"))
+    dead_links = read_json(build_artifact(config, "links.json"))["deadUrls"]
+    merged = merge_election_data(
+        merge_data(ingested["elections"], ingested["logistics"], ingested["general"], config["election_day"],
+                   dead_links, ingested.get("curated")),
+        scraped,
+        source_names=["csv", "scraped"],
+    )
+    attach_fec_candidates(merged, read_json(build_artifact(config, "fec.json")), source="fec")
+    # Candidates a single source listed twice under different spellings
+    resolver = resolve_election_candidates(merged)
+    if resolver.merged:
+        print(f"   Merged {resolver.merged} duplicate candidates ({resolver.comparisons} comparisons)")
+    for state_data in merged.values():
+        annotate_state_dates(state_data)
+    write_json(build_artifact(config, "merged.json"), merged)
+
+
+def count_elections(election_data):
+    """Number of elections listed across every state."""
+    return sum(len(state_data.get("elections", [])) for state_data in election_data.values())
+
+
+def validate_step(config):
+    """Check the merged data has every required field, and lists elections if the published data does."""
+    from run_scraper import validate_scraped_data
+
+    merged = read_json(build_artifact(config, "merged.json"))
+    if not validate_scraped_data(merged):
+        raise ValueError("Merged election data failed validation")
+    if not count_elections(merged):
+        # Missing inputs would otherwise wipe the published elections (and the search index and feeds)
+        for target in config["publish_targets"]:
+            try:
+                published = count_elections(read_json(target).get("electionData", {}))
+            except (OSError, ValueError):
+                continue
+            if published:
+                raise ValueError(f"Merged data lists no elections but {target} lists {published}; "
+                                 f"check the cycle's inputs in cycles.py")
+    write_json(build_artifact(config, "validated.json"), {"valid": True, "states": len(merged)})
+
+
+def export_step(config):
+    """Produce the final elections.json structure, with precomputed lookup indexes.
+
+    The same data is also written in the columnar v2 format (elections.v2.json).
+    """
+    from columnar_export import encode_election_data, write_columnar
+    from indexes import build_indexes
+
+    merged = read_json(build_artifact(config, "merged.json"))
+    last_updated = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
+    indexes = build_indexes(merged)
+    cycle = cycle_summary(config["cycle"])
+    exported = build_artifact(config, "elections.json")
+    write_json(exported, {
+        "lastUpdated": last_updated,
+        "cycle": cycle,
+        "electionData": merged,
+        "indexes": indexes,
+    }, indent=2)
+
+    columnar = build_artifact(config, COLUMNAR_FILE)
+    write_columnar(columnar, encode_election_data(merged, last_updated, indexes, cycle))
+    print(f"   v2 export: {columnar.stat().st_size} bytes (elections.json: {exported.stat().st_size})")
+
+
+def search_step(config):
+    """Write the sharded client-side search index for the site."""
+    from search_index import write_search_index
+
+    merged = read_json(build_artifact(config, "merged.json"))
+    manifest = write_search_index(merged, config["search_dir"])
+    print(f"   {len(manifest['shards'])} search shards in {config['search_dir']}")
+
+
+def calendar_step(config):
+    """Write the per-state and national calendar feeds and the date-sorted timeline."""
+    from calendar_feeds import write_calendar_feeds
+
+    merged = read_json(build_artifact(config, "merged.json"))
+    result = write_calendar_feeds(merged, config["calendar_dir"], cycle_summary(config["cycle"]))
+    print(f"   {len(result['written'])} calendar feeds rewritten, {result['unchanged']} unchanged "
+          f"in {config['calendar_dir']}")
+
+
+def publish_step(config):
+    """Copy the exported file to the site directories."""
+    if config["backup"]:
+        from run_scraper import backup_existing_data
+        backup_existing_data()
+
+    exported = build_artifact(config, "elections.json")
+    columnar = build_artifact(config, COLUMNAR_FILE)
+    for target in config["publish_targets"]:
+        Path(target).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(exported, target)
+        shutil.copyfile(columnar, columnar_target(target))
+        print(f"   Written to: {target}")
+
+
+def shard_inputs(config):
+    """The partial files of a sharded scrape, when the scrape step merges one."""
+    if not config["scrape_shards"]:
+        return []
+    from sharding import shard_paths
+    return shard_paths("advanced_scraper", config["scrape_shards"], config["cycle"], config["shard_dir"])
+
+
+def build_steps(config):
+    """Return the election data build as a list of steps."""
+    return [
+        Step("ingest", ingest_step,
+             inputs=declared_inputs(config["elections_csv"], config["logistics_csv"], config["general_csv"],
+                                    config["curated_json"]) + script_inputs("csv_to_json", "cycles"),
+             outputs=[build_artifact(config, "ingest.json")],
+             params={"election_day": config["election_day"]}),
+        Step("scrape", scrape_step,
+             inputs=declared_inputs(config["logistics_csv"], config["scrape_queue"], *shard_inputs(config))
+             + script_inputs("advanced_election_scraper", "scrape_queue", "work_queue", "sharding"),
+             outputs=[build_artifact(config, "scraped.json")],
+             params={"scrape": config["scrape"], "cycle": config["cycle"], "shards": config["scrape_shards"],
+                     "queue": str(config["scrape_queue"]) if config["scrape_queue"] else None},
+             max_age=config["scrape_max_age"] if config["scrape"] else None),
+        Step("links", links_step,
+             inputs=declared_inputs(config["logistics_csv"]) + script_inputs("link_checker"),
+             outputs=[build_artifact(config, "links.json")],
+             params={"check_links": config["check_links"]},
+             max_age=config["links_max_age"] if config["check_links"] else None),
+        Step("fec", fec_step,
+             inputs=declared_inputs(config["fec_candidates"], config["fec_committees"])
+             + script_inputs("csv_to_json", "fec_bulk"),
+             outputs=[build_artifact(config, "fec.json")],
+             params={"cycle": config["fec_cycle"]}),
+        Step("merge", merge_step,
+             inputs=script_inputs("csv_to_json", "dates", "election_records", "entity_resolution", "fec_bulk"),
+             params={"election_day": config["election_day"]},
+             deps=["ingest", "scrape", "links", "fec"],
+             outputs=[build_artifact(config, "merged.json")]),
+        Step("validate", validate_step,
+             inputs=script_inputs("run_scraper"),
+             deps=["merge"],
+             outputs=[build_artifact(config, "validated.json")]),
+        Step("export", export_step,
+             inputs=script_inputs("columnar_export", "indexes", "cycles"),
+             deps=["merge", "validate"],
+             outputs=[build_artifact(config, "elections.json"), build_artifact(config, COLUMNAR_FILE)]),
+        Step("search", search_step,
+             inputs=script_inputs("search_index"),
+             deps=["merge", "validate"],
+             outputs=[Path(config["search_dir"]) / "manifest.json"]),
+        Step("calendar", calendar_step,
+             inputs=script_inputs("calendar_feeds", "cycles"),
+             deps=["merge", "validate"],
+             outputs=[Path(config["calendar_dir"]) / "manifest.json"]),
+        Step("publish", publish_step,
+             deps=["export"],
+             outputs=config["publish_targets"] + [columnar_target(target) for target in config["publish_targets"]]),
+    ]
+
+
+def build_cycle(config, force=(), dry_run=False):
+    """Build one cycle, unless it is frozen and already published.
+
+    Returns:
+        The run_pipeline results, or None if the cycle was skipped
+    """
+    if config["frozen"] and all(Path(target).exists() for target in config["publish_targets"]):
+        print(f"🧊 {config['cycle_label']}: frozen, keeping {config['publish_targets'][0]}")
+        return None
+
+    print(f"🗳️  {config['cycle_label']}")
+    return run_pipeline(build_steps(config), config, state_file=config["state_file"], force=force, dry_run=dry_run)
+
+
+def main():
+    """Run the election data build, rerunning only stale steps."""
+    args = sys.argv[1:]
+    if '--help' in args:
+        print(__doc__)
+        return 0
+
+    force = []
+    if '--force' in args:
+        index = args.index('--force')
+        if index + 1 < len(args):
+            force = args[index + 1].split(',')
+
+    cycle_ids = sorted(CYCLES, key=int)
+    if '--cycle' in args:
+        index = args.index('--cycle')
+        if index + 1 < len(args):
+            cycle_ids = args[index + 1].split(',')
+
+    scrape_shards = None
+    if '--scrape-shards' in args:
+        index = args.index('--scrape-shards')
+        if index + 1 < len(args):
+            scrape_shards = int(args[index + 1])
+
+    started = time.time()
+    try:
+        for cycle_id in cycle_ids:
+            cycle = get_cycle(cycle_id)
+            # Frozen cycles are never scraped again
+            config = default_config(cycle, scrape='--scrape' in args and not cycle["frozen"],
+                                    check_links='--check-links' in args and not cycle["frozen"],
+                                    scrape_shards=scrape_shards if not cycle["frozen"] else None)
+            build_cycle(config, force=force, dry_run='--dry-run' in args)
+        if '--dry-run' not in args:
+            write_cycles_manifest()
+    except Exception as e:
+        print(f"❌ Pipeline failed: {e}")
+        return 1
+    print(f"🏁 Pipeline finished in {time.time() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
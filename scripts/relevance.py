@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Page Relevance
+Scores how much a fetched page is about elections, in one pass over its text.
+
+Every term of a weighted vocabulary (offices, election terms, months and the
+cycle's year) is matched at once with an Aho-Corasick automaton, instead of
+scanning the page once per keyword. The result is a score plus the position of
+every hit, so pages can be ranked and filtered before the more expensive
+extraction runs. Generic words that every government page contains ("vote")
+carry little weight; a page has to mention specific races or dates to pass.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from cycles import get_cycle
+from page_parsers import HTML_TAG
+
+# Elements whose contents are never shown as page text (an unclosed one runs to the end of the page)
+NON_TEXT_ELEMENTS = re.compile(r"<(script|style|noscript)\b[^>]*>.*?(?:</\1\s*>|$)", re.IGNORECASE | re.DOTALL)
+
+# Weight of each term; matched case-insensitively on word boundaries
+OFFICE_TERMS = {
+    "governor": 3.0, "lieutenant governor": 3.0, "attorney general": 3.0, "secretary of state": 2.0,
+    "treasurer": 2.0, "comptroller": 2.0, "mayor": 2.0, "state senate": 3.0, "state house": 3.0,
+    "house of delegates": 3.0, "general assembly": 2.0, "legislature": 1.5, "u.s. senate": 3.0,
+    "u.s. house": 3.0, "congressional district": 3.0, "supreme court": 2.0, "city council": 2.0,
+    "school board": 2.0,
+}
+ELECTION_TERMS = {
+    "general election": 4.0, "primary election": 4.0, "special election": 4.0, "runoff": 3.0,
+    "election day": 3.0, "upcoming elections": 4.0, "election calendar": 4.0, "election dates": 4.0,
+    "candidates": 2.0, "candidate": 1.5, "ballot": 1.5, "sample ballot": 3.0, "ballot measure": 3.0,
+    "referendum": 3.0, "early voting": 2.0, "absentee": 1.5, "mail-in": 1.5, "polling place": 1.5,
+    "registration deadline": 3.0, "incumbent": 2.0, "election": 1.0, "elections": 1.0, "primary": 1.0,
+    "primaries": 1.0, "runoffs": 3.0, "ballots": 1.5, "vote": 0.25, "voter": 0.25, "voters": 0.25,
+    "voting": 0.25, "polls": 0.5,
+}
+DATE_TERMS = {
+    month: 0.5 for month in (
+        "january", "february", "march", "april", "may", "june", "july", "august",
+        "september", "october", "november", "december",
+    )
+}
+CYCLE_YEAR_WEIGHT = 1.0
+
+# Repeated mentions of a term count up to this many times
+MAX_REPEATS = 3
+# Pages scoring below this are not worth extracting
+RELEVANCE_THRESHOLD = 8.0
+
+Hit = namedtuple("Hit", "start end term weight")
+Relevance = namedtuple("Relevance", "score hits")
+
+
+class PatternMatcher:
+    """Aho-Corasick automaton over a weighted vocabulary."""
+
+    def __init__(self, vocabulary):
+        """Build the trie and its failure links.
+
+        Args:
+            vocabulary: Dict of term -> weight (terms are matched case-insensitively)
+        """
+        self.weights = {term.lower(): weight for term, weight in vocabulary.items()}
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+
+        for term in self.weights:
+            node = 0
+            for char in term:
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.outputs[node].append(term)
+
+        # Breadth-first, so a node's failure target is always finished before it
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def find(self, text):
+        """Every whole-word occurrence of a vocabulary term in the text, in order."""
+        text = text.lower()
+        hits = []
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for term in self.outputs[node]:
+                start = position - len(term) + 1
+                end = position + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                    hits.append(Hit(start, end, term, self.weights[term]))
+        hits.sort(key=lambda hit: (hit.start, -hit.end))
+        return hits
+
+    def score(self, text):
+        """Relevance of the text: the weight of each term found, counting repeats up to MAX_REPEATS."""
+        hits = self.find(text)
+        counts = {}
+        for hit in hits:
+            counts[hit.term] = counts.get(hit.term, 0) + 1
+        score = sum(self.weights[term] * min(count, MAX_REPEATS) for term, count in counts.items())
+        return Relevance(round(score, 2), hits)
+
+
+@lru_cache(maxsize=None)
+def cycle_matcher(cycle_id=None):
+    """The matcher for a cycle's pages: the shared vocabulary plus the cycle's year."""
+    cycle = get_cycle(cycle_id)
+    return PatternMatcher({**DATE_TERMS, **OFFICE_TERMS, **ELECTION_TERMS, str(cycle["year"]): CYCLE_YEAR_WEIGHT})
+
+
+def page_text(html):
+    """Rough text of an HTML page or fragment, good enough for scoring.
+
+    Scripts, styles and noscript fallbacks are dropped first: they are not what a reader
+    sees, and analytics or framework code can mention "election" and dates many times.
+    """
+    return HTML_TAG.sub(" ", NON_TEXT_ELEMENTS.sub(" ", html))
+
+
+def score_page(text, cycle=None):
+    """Relevance of a page's text (or HTML) to the cycle's elections."""
+    if "<" in text:
+        text = page_text(text)
+    return cycle_matcher(get_cycle(cycle)["id"]).score(text)
+
+
+def is_relevant(score, threshold=RELEVANCE_THRESHOLD):
+    """Whether a page with this relevance score is worth extracting."""
+    return score >= threshold
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Run Metrics
+Collects per-page and per-run measurements during a scrape and writes them to
+logs/ so runs can be compared over time.
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent.parent
+LOG_DIR = BASE_DIR / "logs"
+
+
+class RunMetrics:
+    def __init__(self, name="scraper"):
+        """Start an empty set of metrics for one run."""
+        self.name = name
+        self.started = datetime.now()
+        self.pages = []
+        self.counters = {}
+        self.timings = {}
+        self.events = []
+        self.browser = {}
+
+    def record_page(self, page):
+        """Record the metrics dict for one fetched page."""
+        self.pages.append(page)
+
+    def increment(self, counter, amount=1):
+        """Increase a named counter."""
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def record_event(self, kind, **details):
+        """Record something that happened during the run, e.g. a browser recycle."""
+        self.events.append({"kind": kind, "at": datetime.now().isoformat(timespec="seconds"), **details})
+
+    def record_browser(self, stats):
+        """Record the browser's lifecycle numbers (launches, peak memory) at the end of the run."""
+        self.browser = dict(stats)
+
+    def record_timing(self, name, seconds):
+        """Record the duration of a named step in seconds."""
+        self.timings[name] = round(seconds, 3)
+
+    def summary(self):
+        """Return the run totals as a dict."""
+        blocked = {}
+        for page in self.pages:
+            for kind, count in page.get("blocked", {}).items():
+                blocked[kind] = blocked.get(kind, 0) + count
+        return {
+            "name": self.name,
+            "started": self.started.isoformat(),
+            "pages": len(self.pages),
+            "bytes": sum(page.get("bytes", 0) for page in self.pages),
+            "blockedRequests": blocked,
+            "bytesSavedEst": sum(page.get("bytesSavedEst", 0) for page in self.pages),
+            "timeSavedMsEst": sum(page.get("timeSavedMsEst", 0) for page in self.pages),
+            "counters": dict(self.counters),
+            "timings": dict(self.timings),
+            "events": len(self.events),
+            "browser": dict(self.browser),
+        }
+
+    def describe(self):
+        """Return a one-line, human-readable summary of the run."""
+        summary = self.summary()
+        return (
+            f"Run metrics: {summary['pages']} pages, {summary['bytes'] / 1024:.0f} KB transferred, "
+            f"~{summary['bytesSavedEst'] / 1024:.0f} KB and ~{summary['timeSavedMsEst'] / 1000:.1f}s "
+            f"saved by the lean browser profile"
+            + (f", {summary['counters']['browser_recycles']} browser recycles"
+               if summary["counters"].get("browser_recycles") else "")
+            + (f", {summary['counters']['browser_relaunches']} browser relaunches"
+               if summary["counters"].get("browser_relaunches") else "")
+            + (f", {summary['browser']['launches']} browser launches (peak {summary['browser']['peakRssMb']:.0f} MB)"
+               if summary["browser"].get("launches") else "")
+        )
+
+    def save(self, output_file=None):
+        """Write the summary and per-page details to logs/."""
+        if output_file is None:
+            LOG_DIR.mkdir(exist_ok=True)
+            output_file = LOG_DIR / f"{self.name}_metrics_{self.started.strftime('%Y%m%d_%H%M%S')}.json"
+        try:
+            with open(output_file, 'w') as f:
+                json.dump({"summary": self.summary(), "pages": self.pages, "events": self.events}, f, indent=2)
+            logger.info(f"Run metrics written to {output_file}")
+        except OSError as e:
+            logger.error(f"Failed to write run metrics: {e}")
+        return output_file
@@ -9,6 +9,7 @@ import sys
 import json
 import logging
 import subprocess
+import importlib.util
 from datetime import datetime
 from pathlib import Path
 
@@ -17,6 +18,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from advanced_election_scraper import AdvancedElectionScraper
 
+REQUIRED_MODULES = ["selenium", "requests", "bs4", "webdriver_manager"]
+
 def setup_logging():
     """Set up logging configuration."""
     base_dir = Path(__file__).parent.parent
@@ -40,17 +43,16 @@ def check_dependencies():
     """Check if all required dependencies are installed."""
     logger = logging.getLogger(__name__)
     
-    try:
-        import selenium
-        import requests
-        import bs4
-        from webdriver_manager.chrome import ChromeDriverManager
-        logger.info("All dependencies are installed")
-        return True
-    except ImportError as e:
-        logger.error(f"Missing dependency: {e}")
+    # find_spec locates the packages without importing them, so this check stays
+    # cheap; the scraper imports selenium itself when it first launches Chrome.
+    missing = [name for name in REQUIRED_MODULES if importlib.util.find_spec(name) is None]
+    if missing:
+        logger.error(f"Missing dependency: {', '.join(missing)}")
         logger.info("Please install dependencies with: pip install -r requirements.txt")
         return False
+    
+    logger.info("All dependencies are installed")
+    return True
 
 def backup_existing_data():
     """Create a backup of the existing elections.json file."""
@@ -123,7 +125,7 @@ def run_scraper():
     
     try:
         # Initialize and run scraper
-        scraper = AdvancedElectionScraper(headless=True)
+        scraper = AdvancedElectionScraper()
         scraper.run_comprehensive_scraper()
         
         # Validate the updated data
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Scrape Queue
+Runs a scrape as jobs on a WorkQueue (work_queue.py), so any number of worker
+processes, on this machine or others sharing the queue file, pull the next job
+as soon as they are free:
+
+- state_site: one state election website (ElectionScraper, in Chrome)
+- ballotpedia_state: one state's Ballotpedia page (through the MediaWiki API)
+- ballotpedia_source: one overview source of the advanced scraper (Senate, House)
+
+The orchestrator seeds the jobs from state_election_sites and the Ballotpedia
+sources, starts the workers, and once the queue drains runs the pipeline for the
+cycle with the queue's results as its scrape step, through to publish.
+
+Usage:
+    python scrape_queue.py --workers 4     Seed, run 4 workers, then build and publish
+    python scrape_queue.py --worker        Join a running queue as one more worker
+    python scrape_queue.py --status        Show job counts and failures
+    python scrape_queue.py --cycle 2026    Cycle to scrape (default: the current one)
+"""
+
+import multiprocessing
+import sys
+import time
+
+from election_records import merge_records
+from work_queue import QUEUE_FILE, WorkQueue, worker_name
+
+STATE_SITE = "state_site"
+BALLOTPEDIA_STATE = "ballotpedia_state"
+BALLOTPEDIA_SOURCE = "ballotpedia_source"
+# Job kinds in the order their results are merged, matching a run in one process
+JOB_ORDER = [STATE_SITE, BALLOTPEDIA_STATE, BALLOTPEDIA_SOURCE]
+
+# Seconds an idle worker waits before looking for work again (retries and expired leases)
+IDLE_POLL = 2
+
+
+def seed_jobs(queue, scraper, kinds=JOB_ORDER):
+    """Add a job for every state site, Ballotpedia state page and advanced source.
+
+    Args:
+        queue: WorkQueue to fill
+        scraper: ElectionScraper providing the state sites and Ballotpedia page list
+        kinds: Job kinds to seed
+
+    Returns:
+        Number of new jobs
+    """
+    from advanced_election_scraper import SOURCE_ORDER
+
+    jobs = []
+    if STATE_SITE in kinds:
+        jobs += [(STATE_SITE, state_code, {"url": url}) for state_code, url in scraper.state_election_sites.items()]
+    if BALLOTPEDIA_STATE in kinds:
+        state_pages = scraper.ballotpedia_state_pages(f"{scraper.cycle['year']} elections")
+        jobs += [(BALLOTPEDIA_STATE, state_code, {"title": title}) for state_code, title in state_pages.items()]
+    if BALLOTPEDIA_SOURCE in kinds:
+        jobs += [(BALLOTPEDIA_SOURCE, source, {}) for source in SOURCE_ORDER]
+    return queue.add_many(jobs)
+
+
+class QueueWorker:
+    def __init__(self, queue, cycle=None, logistics_csv=None, api_url=None):
+        """A worker running scrape jobs from a queue.
+
+        Args:
+            queue: WorkQueue to pull from
+            cycle: Election cycle id (default: the current cycle)
+            logistics_csv: State websites and deadlines (default: the cycle's, or the latest declared)
+            api_url: Ballotpedia MediaWiki API endpoint (default: ballotpedia.org's)
+        """
+        self.queue = queue
+        self.cycle = cycle
+        self.logistics_csv = logistics_csv
+        self.api_url = api_url
+        self.name = worker_name()
+        self._scraper = None
+        self._advanced = None
+
+    @property
+    def scraper(self):
+        """ElectionScraper for state sites and Ballotpedia state pages (Chrome starts on first use)."""
+        if self._scraper is None:
+            from ballotpedia_api import API_URL, BallotpediaClient
+            from election_scraper import ElectionScraper
+            self._scraper = ElectionScraper(headless=True, logistics_csv=self.logistics_csv, cycle=self.cycle,
+                                            ballotpedia_client=BallotpediaClient(api_url=self.api_url or API_URL))
+        return self._scraper
+
+    @property
+    def advanced(self):
+        """AdvancedElectionScraper for the overview sources."""
+        if self._advanced is None:
+            from advanced_election_scraper import AdvancedElectionScraper
+            self._advanced = AdvancedElectionScraper(logistics_csv=self.logistics_csv, ballotpedia_api_url=self.api_url,
+                                                     cycle=self.cycle)
+        return self._advanced
+
+    def run_job(self, job):
+        """Run one job and return its [state_code, record] pairs."""
+        if job.kind == STATE_SITE:
+            record = self.scraper.scrape_state_site(job.key, job.payload["url"])
+            return [[job.key, record]] if record else []
+
+        if job.kind == BALLOTPEDIA_STATE:
+            from page_parsers import parse_state_elections_wikitext
+            title = job.payload["title"]
+            wikitext = self.scraper.ballotpedia.page_wikitext([title]).get(title)
+            if wikitext is None:
+                raise LookupError(f"Ballotpedia page {title!r} not found")
+            record = parse_state_elections_wikitext(wikitext, job.key, self.scraper.state_context(job.key))
+            return [[job.key, record]] if record else []
+
+        if job.kind == BALLOTPEDIA_SOURCE:
+            client = self.advanced.new_client()
+            try:
+                return [[state_code, record]
+                        for state_code, record in self.advanced.scrape_sources()[job.key](client=client)]
+            finally:
+                client.close()
+
+        raise ValueError(f"Unknown job kind {job.kind!r}")
+
+    def run(self, kinds=None, idle_poll=IDLE_POLL):
+        """Run jobs until the queue is drained.
+
+        Returns:
+            Number of jobs this worker completed
+        """
+        completed = 0
+        try:
+            while True:
+                job = self.queue.claim(self.name, kinds)
+                if job is None:
+                    if self.queue.is_drained():
+                        break
+                    # Jobs are waiting on a retry delay or leased by other workers
+                    time.sleep(idle_poll)
+                    continue
+
+                print(f"▶️  {self.name}: {job.kind} {job.key} (attempt {job.attempts})")
+                try:
+                    with self.queue.keep_leased(job, self.name):
+                        result = self.run_job(job)
+                except Exception as e:
+                    print(f"❌ {job.kind} {job.key}: {e}")
+                    self.queue.fail(job, e, self.name)
+                    continue
+                if self.queue.complete(job, result, self.name):
+                    completed += 1
+        finally:
+            self.close()
+        return completed
+
+    def close(self):
+        """Close the state-site scraper's browser and session (the overview sources close their own)."""
+        if self._scraper is not None:
+            self._scraper.close()
+
+
+def run_worker(queue_path=QUEUE_FILE, cycle=None, logistics_csv=None, api_url=None, kinds=None):
+    """Entry point of a worker process."""
+    with WorkQueue(queue_path) as queue:
+        return QueueWorker(queue, cycle, logistics_csv, api_url).run(kinds)
+
+
+def merge_queue_results(queue):
+    """Merge the results of every finished job, in JOB_ORDER (then the order jobs were added)."""
+    pairs = []
+    for kind in JOB_ORDER:
+        for _, _, result in queue.results(kind):
+            pairs += [(state_code, record) for state_code, record in result]
+    return merge_records(pairs)
+
+
+def orchestrate(config, workers=4, queue_path=QUEUE_FILE, kinds=JOB_ORDER, api_url=None, fresh=True):
+    """Seed the queue, run worker processes until it drains, then build and publish the cycle.
+
+    Args:
+        config: Pipeline config (pipeline.default_config) of the cycle to scrape
+        workers: Worker processes to start here (more can join with --worker)
+        queue_path: Queue file
+        kinds: Job kinds to seed
+        api_url: Ballotpedia MediaWiki API endpoint (default: ballotpedia.org's)
+        fresh: Clear jobs left from an earlier run first
+
+    Returns:
+        The pipeline results
+    """
+    from election_scraper import ElectionScraper
+    from ballotpedia_api import API_URL, BallotpediaClient
+    from pipeline import build_cycle
+
+    with WorkQueue(queue_path) as queue:
+        if fresh:
+            queue.clear()
+        seeder = ElectionScraper(headless=True, logistics_csv=config["logistics_csv"], cycle=config["cycle"],
+                                 ballotpedia_client=BallotpediaClient(api_url=api_url or API_URL))
+        try:
+            print(f"🧾 Seeded {seed_jobs(queue, seeder, kinds)} jobs into {queue_path}")
+        finally:
+            seeder.close()
+
+        processes = [multiprocessing.Process(target=run_worker, name=f"scrape-worker-{index}",
+                                             args=(queue_path, config["cycle"], config["logistics_csv"], api_url))
+                     for index in range(workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        counts = queue.counts()
+        print(f"📊 Queue: {counts}")
+        if not queue.is_drained():
+            raise RuntimeError("Every worker exited before the queue drained")
+        for kind, key, error in queue.failures():
+            print(f"   ✗ {kind} {key}: {error}")
+
+    config = {**config, "scrape_queue": queue_path}
+    return build_cycle(config)
+
+
+def main():
+    """Run the scrape queue from the command line."""
+    from pipeline import default_config
+
+    args = sys.argv[1:]
+    if '--help' in args:
+        print(__doc__)
+        return 0
+    cycle = args[args.index('--cycle') + 1] if '--cycle' in args[:-1] else None
+    config = default_config(cycle)
+
+    if '--status' in args:
+        with WorkQueue() as queue:
+            print(f"📊 Queue: {queue.counts()}")
+            for kind, key, error in queue.failures():
+                print(f"   ✗ {kind} {key}: {error}")
+        return 0
+
+    if '--worker' in args:
+        print(f"👷 Completed {run_worker(cycle=config['cycle'], logistics_csv=config['logistics_csv'])} jobs")
+        return 0
+
+    workers = int(args[args.index('--workers') + 1]) if '--workers' in args[:-1] else 4
+    try:
+        orchestrate(config, workers=workers)
+    except Exception as e:
+        print(f"❌ Queued scrape failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
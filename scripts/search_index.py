@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Search Index Builder
+Builds the client-side search index for the site: an inverted index from words in
+election titles, stakes, candidate names and state names to the elections that
+contain them. The index is split into small shards by the first letters of each
+word, so a search only downloads the shard for what was typed instead of the whole
+of electionData.
+
+Usage:
+    python search_index.py [elections.json] [output dir]
+    (defaults: docs/elections.json and docs/search)
+
+Output (in the search directory):
+    manifest.json   {"version", "prefixLength", "shards": [...]}
+    docs.json       [[state code, election index or -1, label], ...]
+    <prefix>.json   {"token": [doc id, ...], ...} for every token starting with prefix
+"""
+
+import json
+import re
+import sys
+import unicodedata
+from pathlib import Path
+
+INDEX_VERSION = 1
+PREFIX_LENGTH = 2
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = {"and", "for", "in", "of", "on", "or", "the", "to", "a", "an", "at", "by", "is", "s"}
+
+
+def tokenize(text):
+    """Split text into lowercase, accent-free search tokens."""
+    if not text:
+        return []
+    folded = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii").lower()
+    return [token for token in TOKEN_PATTERN.findall(folded)
+            if len(token) >= PREFIX_LENGTH and token not in STOP_WORDS]
+
+
+def election_text(election):
+    """The searchable text of one election."""
+    parts = [election.get("title"), election.get("stakes"), election.get("chamberImpact")]
+    parts.extend(candidate.get("name") for candidate in election.get("candidates", []))
+    return " ".join(part for part in parts if part)
+
+
+def build_search_index(election_data):
+    """Build the document table and inverted index for an electionData dict.
+
+    Every election is a document; so is every state, so state names match even
+    when a state has no elections listed. The state name is indexed with each of
+    its elections, which lets "jersey city mayor" or "virginia governor" match.
+
+    Returns:
+        (docs, index) where docs is a list of [state code, election index or -1,
+        label] and index maps each token to a sorted list of doc ids
+    """
+    docs = []
+    index = {}
+
+    def add(doc_id, text):
+        for token in set(tokenize(text)):
+            index.setdefault(token, []).append(doc_id)
+
+    for state_code in sorted(election_data):
+        state_data = election_data[state_code]
+        state_name = state_data.get("stateName", state_code)
+
+        docs.append([state_code, -1, state_name])
+        add(len(docs) - 1, f"{state_name} {state_code}")
+
+        for position, election in enumerate(state_data.get("elections", [])):
+            docs.append([state_code, position, f"{election.get('title', 'Election')} — {state_name}"])
+            add(len(docs) - 1, f"{election_text(election)} {state_name} {state_code}")
+
+    return docs, index
+
+
+def shard_index(index, prefix_length=PREFIX_LENGTH):
+    """Group an inverted index into shards keyed by token prefix."""
+    shards = {}
+    for token in sorted(index):
+        shards.setdefault(token[:prefix_length], {})[token] = index[token]
+    return shards
+
+
+def write_search_index(election_data, output_dir):
+    """Write the sharded search index for electionData to output_dir.
+
+    Shard files from a previous build whose prefix no longer occurs are removed.
+
+    Returns:
+        The manifest that was written
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    docs, index = build_search_index(election_data)
+    shards = shard_index(index)
+
+    for old_file in output_dir.glob("*.json"):
+        if old_file.stem not in shards and old_file.name not in ("manifest.json", "docs.json"):
+            old_file.unlink()
+
+    for prefix, postings in shards.items():
+        with open(output_dir / f"{prefix}.json", 'w', encoding='utf-8') as f:
+            json.dump(postings, f, separators=(",", ":"), ensure_ascii=False)
+
+    with open(output_dir / "docs.json", 'w', encoding='utf-8') as f:
+        json.dump(docs, f, separators=(",", ":"), ensure_ascii=False)
+
+    manifest = {"version": INDEX_VERSION, "prefixLength": PREFIX_LENGTH, "shards": sorted(shards)}
+    with open(output_dir / "manifest.json", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(",", ":"))
+
+    return manifest
+
+
+def main():
+    """Rebuild the search index from a published elections.json."""
+    base_dir = Path(__file__).parent.parent
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else base_dir / "docs" / "elections.json"
+    output_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else base_dir / "docs" / "search"
+
+    with open(source, 'r', encoding='utf-8') as f:
+        election_data = json.load(f).get("electionData", {})
+
+    manifest = write_search_index(election_data, output_dir)
+    print(f"✅ Wrote {len(manifest['shards'])} search shards to {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
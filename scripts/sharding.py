@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Scrape Sharding
+Splits a scrape run across several workers (or machines) with --shard i/N.
+
+Each unit of work, a (source, state) pair or a whole source, is assigned to a
+shard by a stable hash of its name, so every worker agrees on the split without
+talking to the others and the same unit always lands on the same shard. Each
+worker writes its records to its own partial file:
+
+    .cache/shards/<cycle>/<scraper>.<i>-of-<N>.jsonl
+
+Once every shard is done (and, across machines, the partial files are copied
+into one directory), merge_shards() folds them together with the usual merge
+logic, in source order, so the result does not depend on which worker scraped
+what.
+"""
+
+import hashlib
+from pathlib import Path
+
+from election_records import merge_records, read_records
+
+BASE_DIR = Path(__file__).parent.parent
+SHARD_DIR = BASE_DIR / ".cache" / "shards"
+
+
+def stable_hash(key):
+    """A hash of a string that is the same in every process and on every machine."""
+    return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "big")
+
+
+class Shard:
+    def __init__(self, index=0, count=1):
+        """One worker's share of a scrape.
+
+        Args:
+            index: This worker's shard, from 0 to count - 1
+            count: Total number of shards (1: no sharding)
+        """
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"Invalid shard {index}/{count}: expected 0 <= i < N")
+        self.index = index
+        self.count = count
+
+    @classmethod
+    def parse(cls, spec):
+        """Parse an "i/N" command-line value such as "0/4"."""
+        try:
+            index, count = (int(part) for part in spec.split("/"))
+        except (AttributeError, ValueError):
+            raise ValueError(f"Invalid shard {spec!r}: expected i/N, e.g. 0/4")
+        return cls(index, count)
+
+    @property
+    def is_sharded(self):
+        return self.count > 1
+
+    def owns(self, *key):
+        """Whether this shard scrapes a unit of work, named by e.g. (source, state_code)."""
+        return stable_hash(":".join(key)) % self.count == self.index
+
+    def path(self, name, cycle, directory=SHARD_DIR):
+        """This shard's partial file."""
+        return shard_paths(name, self.count, cycle, directory)[self.index]
+
+    def __str__(self):
+        return f"{self.index}/{self.count}"
+
+
+def shard_paths(name, count, cycle, directory=SHARD_DIR):
+    """The partial files of every shard of a scraper's run."""
+    return [Path(directory) / str(cycle) / f"{name}.{index}-of-{count}.jsonl" for index in range(count)]
+
+
+def merge_shards(name, count, cycle, source_order=(), directory=SHARD_DIR):
+    """Merge the partial files of every shard into per-state data.
+
+    Records are merged in source_order (then shard order), matching a run in one
+    process, where the sources are scraped one after another.
+
+    Returns:
+        (merged data, list of missing partial files)
+    """
+    entries = []
+    missing = []
+    for path in shard_paths(name, count, cycle, directory):
+        if not path.exists():
+            missing.append(path)
+            continue
+        entries.extend(read_records(path, with_source=True))
+
+    rank = {source: position for position, source in enumerate(source_order)}
+    entries.sort(key=lambda entry: rank.get(entry[0], len(rank)))
+    return merge_records((state_code, record) for _, state_code, record in entries), missing
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+State Site Extractors
+Declarative configs for reading upcoming elections from state election websites.
+Each state can declare which page lists its elections, which part of that page
+to read (region), which elements are election entries (item) and where the title
+and date are inside an entry. States without a config, or whose config no longer
+matches the page, use the generic extractor.
+
+Configs are compiled once (CSS selectors via soupsieve, regular expressions) and
+cached per state. The scraper only pulls the HTML of the matched region out of
+the browser rather than the whole page text, and the extraction itself works on
+that HTML, so it can be tested without Chrome.
+"""
+
+import re
+from datetime import date
+from functools import lru_cache
+
+from cycles import in_cycle
+from dates import format_long, normalize_date
+from election_model import Election, ElectionType
+from page_parsers import determine_chamber_impact
+
+# Defaults for every state; per-state configs only list what differs
+GENERIC_EXTRACTOR = {
+    # Page listing the state's elections, instead of the site in the logistics CSV
+    "page": None,
+    # Link to follow from the landing page when "page" is not set
+    "follow": r"upcoming[-_ ]?elections|election[-_ ]?(calendar|dates|schedule)|elections/calendar",
+    # Part of the page to read, first match wins
+    "region": ["main", "[role=main]", "#main-content", "#content", "article", "body"],
+    # Elements that each describe one election
+    "item": "li, tr, p, h2, h3, h4",
+    # Title and date inside an item (None: the item's text)
+    "title": None,
+    "date": None,
+    # Entries whose title does not match are not elections
+    "title_pattern": r"\b(election|primary|runoff|special|referendum|ballot)\b",
+    # Longer items are whole sections, not single entries
+    "max_item_length": 300,
+}
+
+STATE_EXTRACTORS = {
+    "VA": {
+        "page": "https://www.elections.virginia.gov/casting-a-ballot/calendars-schedules/upcoming-elections/",
+        "region": ["#main-content", "main"],
+        "item": "table tbody tr",
+        "title": "td:nth-of-type(2)",
+        "date": "td:nth-of-type(1)",
+    },
+    "NJ": {
+        "follow": r"election-information|upcoming-elections",
+        "region": [".election-calendar", "main"],
+        "item": ".election-calendar li, main li",
+    },
+    "TX": {
+        "page": "https://www.sos.state.tx.us/elections/voter/important-election-dates.shtml",
+        "region": ["#content", "main"],
+        "item": "table tr",
+        "title": "td:nth-of-type(1)",
+        "date": "td:nth-of-type(2)",
+    },
+    "CA": {
+        "page": "https://www.sos.ca.gov/elections/upcoming-elections",
+        "region": ["#main-content", "main"],
+        "item": "h2, h3, li",
+    },
+    "CO": {
+        "page": "https://www.coloradosos.gov/pubs/elections/upcomingElections.html",
+        "region": ["#main", "main"],
+    },
+}
+
+# Dates as they appear in running text: "November 4, 2025", "Nov. 4, 2025", "11/4/2025", "2025-11-04"
+MONTHS = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?"
+DATE_IN_TEXT = re.compile(
+    rf"\b{MONTHS}\s+\d{{1,2}},?\s+\d{{4}}\b|\b\d{{1,2}}/\d{{1,2}}/(?:\d{{4}}|\d{{2}})\b|\b\d{{4}}-\d{{2}}-\d{{2}}\b",
+    re.IGNORECASE,
+)
+# Leftover separators around a title once the date is removed
+TITLE_SEPARATORS = " \t-–—:|,()"
+
+# First match wins
+ELECTION_TYPES = [
+    (re.compile(r"\brunoff\b", re.IGNORECASE), ElectionType.RUNOFF),
+    (re.compile(r"\bspecial\b", re.IGNORECASE), ElectionType.SPECIAL),
+    (re.compile(r"\bprimary\b", re.IGNORECASE), ElectionType.PRIMARY),
+    (re.compile(r"\b(referendum|ballot (measure|question)s?)\b", re.IGNORECASE), ElectionType.REFERENDUM),
+]
+
+
+class CompiledExtractor:
+    """A state's extractor config with its selectors and patterns compiled."""
+
+    def __init__(self, state_code, config):
+        import soupsieve
+
+        self.state_code = state_code
+        self.is_generic = state_code is None
+        self.page = config["page"]
+        self.follow = re.compile(config["follow"], re.IGNORECASE) if config["follow"] else None
+        self.region_selectors = list(config["region"])
+        self.regions = [soupsieve.compile(selector) for selector in self.region_selectors]
+        self.item = soupsieve.compile(config["item"])
+        self.title = soupsieve.compile(config["title"]) if config["title"] else None
+        self.date = soupsieve.compile(config["date"]) if config["date"] else None
+        self.title_pattern = re.compile(config["title_pattern"], re.IGNORECASE) if config["title_pattern"] else None
+        self.max_item_length = config["max_item_length"]
+
+    def page_url(self, landing_url, links=()):
+        """The page to read: the configured page, a followed link, or the landing page."""
+        if self.page:
+            return self.page
+        if self.follow:
+            for link in links:
+                if link and self.follow.search(link):
+                    return link
+        return landing_url
+
+    def select_region(self, soup):
+        """The first configured region found in the page (the whole page if none is)."""
+        for region in self.regions:
+            match = region.select_one(soup)
+            if match is not None:
+                return match
+        return None
+
+    def extract(self, html, cycle=None):
+        """Return the Election records listed in a page (or region) of HTML.
+
+        Args:
+            html: Page source, or just the outerHTML of the region
+            cycle: Only keep elections in this cycle's year (default: keep every dated entry)
+        """
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, "html.parser")
+        region = self.select_region(soup) or soup
+
+        elections = []
+        seen = set()
+        for item in self.item.select(region):
+            text = item.get_text(" ", strip=True)
+            if not text or len(text) > self.max_item_length:
+                continue
+
+            date_text = self.field_text(item, self.date)
+            date_match = DATE_IN_TEXT.search(date_text) if date_text else None
+            normalized = normalize_date(date_match.group(0)) if date_match else None
+            if normalized is None or normalized.iso is None:
+                continue
+            if cycle is not None and not in_cycle(cycle, normalized.iso):
+                continue
+
+            title = self.field_text(item, self.title)
+            if self.title is None or self.date is None:
+                title = title.replace(date_match.group(0), " ")
+            title = " ".join(title.split()).strip(TITLE_SEPARATORS)
+            if not title or (self.title_pattern and not self.title_pattern.search(title)):
+                continue
+
+            key = (title.lower(), normalized.iso)
+            if key in seen:
+                continue
+            seen.add(key)
+            elections.append(election_record(title, normalized))
+
+        return elections
+
+    @staticmethod
+    def field_text(item, selector):
+        """Text of a field inside an item, or the item's own text."""
+        if selector is None:
+            return item.get_text(" ", strip=True)
+        match = selector.select_one(item)
+        return match.get_text(" ", strip=True) if match is not None else ""
+
+
+def classify_election(title):
+    """Election type from an entry's title."""
+    for pattern, election_type in ELECTION_TYPES:
+        if pattern.search(title):
+            return election_type
+    return ElectionType.GENERAL
+
+
+def election_record(title, normalized_date):
+    """Build the Election record for one extracted entry."""
+    election_date = date.fromisoformat(normalized_date.iso)
+    return Election(
+        title=title,
+        date=format_long(election_date),
+        type=classify_election(title),
+        candidates=[],
+        stakes=title,
+        chamberImpact=determine_chamber_impact(title),
+        competitive=False
+    )
+
+
+def get_extractor(state_code=None):
+    """Compiled extractor for a state (None or an unknown state: the generic one)."""
+    return compile_extractor(state_code if state_code in STATE_EXTRACTORS else None)
+
+
+@lru_cache(maxsize=None)
+def compile_extractor(state_code):
+    """Compile a state's config over the generic defaults, once per state."""
+    return CompiledExtractor(state_code, {**GENERIC_EXTRACTOR, **STATE_EXTRACTORS.get(state_code, {})})
+
+
+def region_selectors(state_code=None):
+    """Region selectors to try in the browser: the state's, then the generic ones."""
+    selectors = get_extractor(state_code).region_selectors + get_extractor().region_selectors
+    return list(dict.fromkeys(selectors))
+
+
+def extract_elections(state_code, html, cycle=None):
+    """Extract a state's elections, falling back to the generic extractor if its config finds none."""
+    elections = get_extractor(state_code).extract(html, cycle)
+    if not elections and not get_extractor(state_code).is_generic:
+        elections = get_extractor().extract(html, cycle)
+    return elections
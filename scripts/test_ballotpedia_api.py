@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the Ballotpedia MediaWiki API client and the scrapers that use
+it, against a local stand-in for api.php.
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from advanced_election_scraper import AdvancedElectionScraper
+from ballotpedia_api import BallotpediaClient, MediaWikiError
+from election_scraper import ElectionScraper
+
+LOGISTICS_CSV = Path(__file__).parent.parent / "data" / "2025 Off-Year Elections - Logistics.csv"
+
+STATE_PAGE = """Intro text with {{Infobox|year=2024}} markup.
+== Governor Elections ==
+The candidates running are [[Abigail Spanberger]] (D) and [[Winsome Earle-Sears|Winsome Sears]] (R).<ref>Source</ref>
+=== Polls ===
+A candidate Other Person (I) appears after the section ends.
+== About ==
+Nothing here.
+"""
+
+PAGES = {
+    "Virginia elections, 2026": STATE_PAGE,
+    "New Jersey elections, 2026": STATE_PAGE.replace("Governor", "Mayoral"),
+    "Redirected page": None,
+    "United States Senate elections, 2026": """== Overview ==
+Text.
+=== Ohio 2026 ===
+* '''[[Jon Husted]]''' (R) (incumbent)
+* [[Sherrod Brown]] (D)
+=== Florida 2026 ===
+* [[Ashley Moody]] - R
+""",
+    "United States House of Representatives elections, 2026": """== Special elections ==
+* Texas District 18: [[Christian Menefee]] (D) vs. [[Amanda Edwards]] (D)
+== Tennessee ==
+* 7th Congressional District (competitive): [[Matt Van Epps]] (R), [[Aftyn Behn]] (D)
+* District 5: no candidates listed
+""",
+}
+REDIRECTS = {"Redirected page": "Virginia elections, 2026"}
+OVERVIEW_LINKS = ["Virginia elections, 2026", "New Jersey elections, 2026", "Missing elections, 2026", "Main Page"]
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    """Answers the subset of api.php the client uses."""
+
+    requests_seen = []
+    # Titles answered with an API error, and titles answered only after a delay (seconds)
+    failing_titles = set()
+    slow_titles = {}
+    # Pages answered ahead of the requested ones, under titles nobody asked for
+    unrequested_pages = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        FakeApiHandler.requests_seen.append(params)
+        titles = params.get("titles", "").split("|")
+        time.sleep(max([FakeApiHandler.slow_titles.get(title, 0) for title in titles]))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(self.answer(params)).encode())
+
+    def answer(self, params):
+        if FakeApiHandler.failing_titles & set(params.get("titles", "").split("|")):
+            return {"error": {"code": "internal_api_error", "info": "Database query error"}}
+        if params.get("action") == "parse":
+            return {"error": {"code": "missingtitle", "info": "The page you specified doesn't exist."}}
+
+        titles = params["titles"].split("|")
+        if params.get("prop") == "links":
+            # Two links per response, to exercise "continue"
+            offset = int(params.get("plcontinue", 0))
+            data = {"query": {"pages": [{"title": titles[0],
+                                         "links": [{"title": t} for t in OVERVIEW_LINKS[offset:offset + 2]]}]}}
+            if offset + 2 < len(OVERVIEW_LINKS):
+                data["continue"] = {"plcontinue": str(offset + 2), "continue": "||"}
+            return data
+
+        normalized = [{"from": t, "to": t[0].upper() + t[1:]} for t in titles if t[0].islower()]
+        titles = [t[0].upper() + t[1:] for t in titles]
+        redirects = [{"from": t, "to": REDIRECTS[t]} for t in titles if t in REDIRECTS]
+        pages = [{"title": title, "revisions": [{"slots": {"main": {"content": content}}}]}
+                 for title, content in FakeApiHandler.unrequested_pages.items()]
+        for title in titles:
+            title = REDIRECTS.get(title, title)
+            if PAGES.get(title) is None:
+                pages.append({"title": title, "missing": True})
+            else:
+                pages.append({"title": title, "revisions": [{"slots": {"main": {"content": PAGES[title]}}}]})
+        return {"query": {"normalized": normalized, "redirects": redirects, "pages": pages}}
+
+
+def start_server():
+    """Start the stand-in API on a free port and return (server, api_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeApiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api.php"
+
+
+def test_client_batching():
+    """Titles should be fetched in batches, with redirects and normalization mapped back."""
+    print("🔍 Testing batched page fetches...")
+
+    server, api_url = start_server()
+    try:
+        with BallotpediaClient(api_url=api_url, batch_size=2) as client:
+            titles = ["virginia elections, 2026", "Redirected page", "Nonexistent", "New Jersey elections, 2026"]
+            wikitext = client.page_wikitext(titles)
+            assert set(wikitext) == {"virginia elections, 2026", "Redirected page", "New Jersey elections, 2026"}
+            assert wikitext["Redirected page"] == STATE_PAGE
+            assert client.requests_made == 2
+
+            assert client.links("2026 elections") == OVERVIEW_LINKS
+            assert client.requests_made == 4
+
+            try:
+                client.sections("Nonexistent")
+            except MediaWikiError as e:
+                assert "missingtitle" in str(e)
+            else:
+                raise AssertionError("API error was not raised")
+    finally:
+        server.shutdown()
+
+    print("✅ Batching, redirects and continuation work")
+
+
+def test_state_pages():
+    """ElectionScraper should parse state pages fetched through the API, without Chrome."""
+    print("🔍 Testing Ballotpedia state pages via the API...")
+
+    server, api_url = start_server()
+    # A page the API returns that matches no requested title is ignored, not fatal
+    FakeApiHandler.unrequested_pages = {"Ohio elections, 2026": STATE_PAGE}
+    try:
+        client = BallotpediaClient(api_url=api_url)
+        assert set(client.page_wikitext(["Virginia elections, 2026"])) == {"Virginia elections, 2026"}
+        scraper = ElectionScraper(logistics_csv=LOGISTICS_CSV, parse_workers=0, cycle="2026",
+                                  ballotpedia_client=client)
+        data = scraper.scrape_ballotpedia_elections()
+        assert not scraper.browser.running
+        scraper.close()
+    finally:
+        FakeApiHandler.unrequested_pages = {}
+        server.shutdown()
+
+    # An API failure mid-scrape reaches the caller instead of ending the scrape early and quietly
+    server, api_url = start_server()
+    FakeApiHandler.failing_titles = {"New Jersey elections, 2026"}
+    try:
+        scraper = ElectionScraper(logistics_csv=LOGISTICS_CSV, parse_workers=0, cycle="2026",
+                                  ballotpedia_client=BallotpediaClient(api_url=api_url, batch_size=1))
+        scraped = []
+        try:
+            for state_code, record in scraper.iter_ballotpedia_elections():
+                scraped.append(state_code)
+        except MediaWikiError:
+            pass
+        else:
+            raise AssertionError("A failed page fetch ended the Ballotpedia scrape quietly")
+        assert scraped == ["VA"]
+        scraper.close()
+    finally:
+        FakeApiHandler.failing_titles = set()
+        server.shutdown()
+
+    assert set(data) == {"VA", "NJ"}
+    governor = data["VA"]["elections"][0]
+    assert governor["title"] == "Governor Elections"
+    assert [c["name"] for c in governor["candidates"]] == ["Abigail Spanberger", "Winsome Sears"]
+    assert data["NJ"]["elections"][0]["chamberImpact"] == "Local"
+    # Dated on the cycle's election day; the 2025 CSV deadlines are not reused for 2026
+    assert governor["date"] == "November 3, 2026"
+    assert data["VA"]["registrationDeadline"] == "October 04, 2026"
+
+    print("✅ State pages parsed from wikitext")
+
+
+def test_senate_and_house_races():
+    """The advanced scraper's sources should read every race from the overview pages."""
+    print("🔍 Testing Senate and House sources via the API...")
+
+    server, api_url = start_server()
+    try:
+        scraper = AdvancedElectionScraper(logistics_csv=LOGISTICS_CSV, ballotpedia_api_url=api_url, cycle="2026")
+        data = scraper.collect_election_data()
+    finally:
+        server.shutdown()
+
+    assert set(data) == {"OH", "FL", "TX", "TN"}
+    ohio = data["OH"]["elections"][0]
+    assert [c["name"] for c in ohio["candidates"]] == ["Jon Husted", "Sherrod Brown"]
+    assert data["FL"]["elections"][0]["candidates"][0]["party"] == "Republican"
+
+    texas = data["TX"]["elections"][0]
+    assert texas["title"] == "U.S. House - District 18"
+    assert texas["competitive"] is False
+    tennessee = data["TN"]["elections"]
+    assert [e["title"] for e in tennessee] == ["U.S. House - District 7"]
+    assert tennessee[0]["competitive"] is True
+    assert texas["date"] == "November 3, 2026"
+    assert scraper.metrics.counters["api_requests"] == 2
+
+    print("✅ Senate and House races parsed from wikitext")
+
+
+def test_failing_and_slow_sources():
+    """A source that fails or overruns its budget is reported, and the other sources still finish."""
+    print("🔍 Testing concurrent source failures...")
+
+    senate = "United States Senate elections, 2026"
+    house = "United States House of Representatives elections, 2026"
+    server, api_url = start_server()
+    FakeApiHandler.failing_titles = {senate}
+    try:
+        scraper = AdvancedElectionScraper(logistics_csv=LOGISTICS_CSV, ballotpedia_api_url=api_url, cycle="2026")
+        # The error reaches the caller (a queued ballotpedia_source job fails and is retried)
+        try:
+            list(scraper.iter_ballotpedia_senate_races())
+        except MediaWikiError:
+            pass
+        else:
+            raise AssertionError("A failing source ended quietly")
+
+        data = scraper.collect_election_data()
+        assert set(data) == {"TX", "TN"}
+        assert scraper.metrics.counters["source_failures"] == 1
+        assert "source_timeouts" not in scraper.metrics.counters
+
+        # The House page now takes longer than the source's budget
+        FakeApiHandler.slow_titles = {house: 3}
+        scraper = AdvancedElectionScraper(logistics_csv=LOGISTICS_CSV, ballotpedia_api_url=api_url, cycle="2026")
+        started = time.time()
+        data = scraper.collect_election_data(timeouts={"ballotpedia_house": 0.5})
+        assert time.time() - started < 2.5
+        assert data == {}
+        assert scraper.metrics.counters["source_failures"] == 1
+        assert scraper.metrics.counters["source_timeouts"] == 1
+    finally:
+        FakeApiHandler.failing_titles = set()
+        FakeApiHandler.slow_titles = {}
+        server.shutdown()
+
+    print("✅ Failed and overdue sources reported")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Ballotpedia API Tests\n")
+
+    tests = [test_client_batching, test_state_pages, test_senate_and_house_races, test_failing_and_slow_sources]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test script to verify chromedriver resolution: the CHROMEDRIVER_PATH override,
+the on-disk cache and its invalidation when Chrome is updated, and that offline
+runs without a driver fail instead of downloading one.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+
+from browser import load_driver_cache, resolve_chromedriver
+
+
+def write_stub(path, output):
+    """An executable that prints a version line, the way Chrome and chromedriver do."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"#!/bin/sh\necho '{output}'\n", encoding='utf-8')
+    path.chmod(0o755)
+    return str(path)
+
+
+class StubEnvironment:
+    """Runs a test with only stub binaries on PATH and webdriver_manager replaced by a recorder."""
+
+    def __init__(self, tmp):
+        self.bin_dir = Path(tmp) / "bin"
+        self.bin_dir.mkdir()
+        self.cache_file = Path(tmp) / "chromedriver.json"
+        self.downloads = []
+
+    def __enter__(self):
+        self.saved_env = {key: os.environ.get(key) for key in ("PATH", "CHROMEDRIVER_PATH", "ELECTIONS_OFFLINE")}
+        os.environ["PATH"] = str(self.bin_dir)
+        os.environ.pop("CHROMEDRIVER_PATH", None)
+        os.environ.pop("ELECTIONS_OFFLINE", None)
+
+        downloads = self.downloads
+
+        class ChromeDriverManager:
+            def install(self):
+                downloads.append("chromedriver")
+                raise AssertionError("chromedriver was downloaded")
+
+        module = types.ModuleType("webdriver_manager.chrome")
+        module.ChromeDriverManager = ChromeDriverManager
+        self.saved_modules = {name: sys.modules.get(name) for name in ("webdriver_manager", "webdriver_manager.chrome")}
+        sys.modules["webdriver_manager"] = types.ModuleType("webdriver_manager")
+        sys.modules["webdriver_manager.chrome"] = module
+        return self
+
+    def __exit__(self, *exc):
+        for key, value in self.saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        for name, module in self.saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+    def chrome(self, version):
+        return write_stub(self.bin_dir / "google-chrome", f"Google Chrome {version}")
+
+    def chromedriver(self, version, directory=None):
+        return write_stub((directory or self.bin_dir) / "chromedriver", f"ChromeDriver {version} (abc123)")
+
+
+def test_override_and_cache():
+    """CHROMEDRIVER_PATH wins; otherwise a cached driver is reused while Chrome is unchanged."""
+    print("🔍 Testing chromedriver override and cache...")
+
+    with tempfile.TemporaryDirectory() as tmp, StubEnvironment(tmp) as env:
+        chrome = env.chrome("120.0.6099.109")
+        local_driver = env.chromedriver("120.0.6099.71")
+
+        os.environ["CHROMEDRIVER_PATH"] = "/opt/drivers/chromedriver"
+        assert resolve_chromedriver(cache_file=env.cache_file) == "/opt/drivers/chromedriver"
+        assert not env.cache_file.exists()
+        del os.environ["CHROMEDRIVER_PATH"]
+
+        # The first run finds the matching driver on PATH and caches it
+        assert resolve_chromedriver(cache_file=env.cache_file) == local_driver
+        entry = load_driver_cache(env.cache_file)
+        assert entry["driver_version"] == "120.0.6099.71" and entry["chrome_binary"] == chrome
+
+        # A cache hit is returned without looking at PATH again
+        cached_driver = env.chromedriver("120.0.6099.71", Path(tmp) / "cached")
+        entry["driver_path"] = cached_driver
+        env.cache_file.write_text(json.dumps(entry), encoding='utf-8')
+        assert resolve_chromedriver(cache_file=env.cache_file) == cached_driver
+        assert env.downloads == []
+
+    print("✅ Override and cache hit resolved")
+
+
+def test_cache_invalidated_by_chrome_update():
+    """Once Chrome moves to a new major version, the cached driver is replaced."""
+    print("🔍 Testing cache invalidation...")
+
+    with tempfile.TemporaryDirectory() as tmp, StubEnvironment(tmp) as env:
+        chrome = env.chrome("120.0.6099.109")
+        cached_driver = env.chromedriver("120.0.6099.71", Path(tmp) / "cached")
+        env.cache_file.write_text(json.dumps({
+            "driver_path": cached_driver, "driver_version": "120.0.6099.71", "chrome_binary": chrome,
+            "chrome_mtime": os.path.getmtime(chrome), "chrome_version": "120.0.6099.109",
+        }), encoding='utf-8')
+        assert resolve_chromedriver(cache_file=env.cache_file) == cached_driver
+
+        # A Chrome update at the same major version keeps the cache, restamped with the new version
+        env.chrome("120.0.6099.200")
+        later = time.time() + 60
+        os.utime(chrome, (later, later))
+        assert resolve_chromedriver(cache_file=env.cache_file) == cached_driver
+        entry = load_driver_cache(env.cache_file)
+        assert entry["chrome_version"] == "120.0.6099.200" and entry["chrome_mtime"] == later
+
+        # Restamped, the next run trusts the cache without asking Chrome for its version again
+        env.chrome("999.0.0.0")
+        os.utime(chrome, (later, later))
+        assert resolve_chromedriver(cache_file=env.cache_file) == cached_driver
+
+        # A new major version drops it in favor of a matching driver on PATH
+        env.chrome("121.0.6167.85")
+        os.utime(chrome, (later + 60, later + 60))
+        local_driver = env.chromedriver("121.0.6167.85")
+        assert resolve_chromedriver(cache_file=env.cache_file) == local_driver
+        entry = load_driver_cache(env.cache_file)
+        assert entry["driver_path"] == local_driver and entry["chrome_version"] == "121.0.6167.85"
+        assert env.downloads == []
+
+    print("✅ Chrome updates invalidate the cache")
+
+
+def test_offline_without_driver():
+    """Offline with no usable driver raises a clear error and downloads nothing."""
+    print("🔍 Testing offline resolution without a driver...")
+
+    with tempfile.TemporaryDirectory() as tmp, StubEnvironment(tmp) as env:
+        env.chrome("121.0.6167.85")
+        env.chromedriver("120.0.6099.71")  # too old for this Chrome
+        os.environ["ELECTIONS_OFFLINE"] = "1"
+        try:
+            resolve_chromedriver(cache_file=env.cache_file)
+        except RuntimeError as e:
+            assert "Offline" in str(e) and "121.0.6167.85" in str(e) and "CHROMEDRIVER_PATH" in str(e)
+        else:
+            raise AssertionError("Offline resolution without a driver did not fail")
+        assert env.downloads == [] and not env.cache_file.exists()
+
+    print("✅ Offline runs fail without downloading")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Browser Setup Tests\n")
+
+    tests = [test_override_and_cache, test_cache_invalidated_by_chrome_update, test_offline_without_driver]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
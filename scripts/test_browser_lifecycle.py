@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the browser manager recycles Chrome after enough pages or
+memory, relaunches dead sessions, and reports both in the run metrics.
+"""
+
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+from browser_lifecycle import BrowserManager, is_dead_session_error, process_tree, process_tree_rss
+from run_metrics import RunMetrics
+
+# A parent process whose child holds about 64 MB, standing in for chromedriver and a renderer
+MEMORY_HOG = """
+import subprocess, sys
+child = subprocess.Popen([sys.executable, "-c", "import time; data = bytearray(64 * 1024 * 1024); time.sleep(60)"])
+print(child.pid, flush=True)
+child.wait()
+"""
+
+
+class FakeDriver:
+    """Records pages and can fail the way a crashed Chrome session does."""
+
+    def __init__(self, pid=None, fail_with=None):
+        self.visited = []
+        self.quit_called = False
+        self.fail_with = list(fail_with or [])
+        self.service = SimpleNamespace(process=SimpleNamespace(pid=pid)) if pid else None
+
+    def get(self, url):
+        if self.fail_with:
+            raise self.fail_with.pop(0)
+        self.visited.append(url)
+
+    def execute_script(self, script):
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+class DeadSessionError(Exception):
+    pass
+
+
+class SlowPageError(Exception):
+    pass
+
+
+def start_memory_hog():
+    """Start the stand-in browser process tree and return (process, child_pid)."""
+    process = subprocess.Popen([sys.executable, "-c", MEMORY_HOG], stdout=subprocess.PIPE, text=True)
+    child_pid = int(process.stdout.readline())
+    time.sleep(0.5)  # let the child allocate its memory
+    return process, child_pid
+
+
+def test_recycles_after_pages():
+    """The driver should be replaced every max_pages pages, and the old one quit."""
+    print("🔍 Testing recycling by page count...")
+
+    drivers = []
+    metrics = RunMetrics("test")
+    manager = BrowserManager(lambda: drivers.append(FakeDriver()) or drivers[-1], metrics=metrics, max_pages=3)
+    assert not manager.running and not drivers  # nothing launched until a page is needed
+
+    for page in range(7):
+        manager.get(f"https://example.gov/{page}")
+    assert [len(driver.visited) for driver in drivers] == [3, 3, 1]
+    assert drivers[0].quit_called and drivers[1].quit_called and not drivers[2].quit_called
+    assert metrics.counters["browser_recycles"] == 2
+    assert [event["reason"] for event in metrics.events] == ["pages", "pages"]
+    assert "2 browser recycles" in metrics.describe()
+
+    manager.quit()
+    assert drivers[2].quit_called and not manager.running
+
+    print("✅ Browser recycled after max_pages")
+
+
+def test_recycles_on_memory():
+    """The process tree's RSS, children included, should trigger a recycle above the ceiling."""
+    print("🔍 Testing the memory ceiling...")
+
+    process, child_pid = start_memory_hog()
+    try:
+        assert child_pid in process_tree(process.pid)
+        rss = process_tree_rss(process.pid)
+        assert rss is not None and rss > 60 * 1024 * 1024, rss
+
+        metrics = RunMetrics("test")
+        drivers = []
+        manager = BrowserManager(lambda: drivers.append(FakeDriver(process.pid)) or drivers[-1], metrics=metrics,
+                                 max_pages=None, max_rss_mb=32, rss_check_every=2)
+        manager.get("https://example.gov/1")
+        manager.get("https://example.gov/2")
+        assert len(drivers) == 1
+        manager.get("https://example.gov/3")  # memory is checked every 2 pages
+        assert len(drivers) == 2 and drivers[0].quit_called
+        assert metrics.events[0]["reason"] == "memory" and metrics.events[0]["rssMb"] > 60
+        assert manager.peak_rss_mb > 60
+
+        # A browser that will not quit is killed, renderers included
+        stuck = FakeDriver(process.pid)
+        stuck.quit = lambda: (_ for _ in ()).throw(DeadSessionError("chrome not reachable"))
+        manager.factory = lambda: stuck
+        manager.quit()
+        manager.get("https://example.gov/4")
+        manager.quit()
+        process.wait(timeout=10)
+        time.sleep(0.2)
+        assert process_tree_rss(child_pid) in (None, 0)
+    finally:
+        process.kill()
+
+    print("✅ Browser recycled above the memory ceiling")
+
+
+def test_relaunches_dead_sessions():
+    """A dead session is relaunched and the page retried; a slow page on a live one is not."""
+    print("🔍 Testing dead session relaunch...")
+
+    assert is_dead_session_error(DeadSessionError("Message: invalid session id"))
+    assert is_dead_session_error(ConnectionRefusedError())
+    assert not is_dead_session_error(DeadSessionError("Message: timeout: Timed out receiving message from renderer"))
+
+    metrics = RunMetrics("test")
+    drivers = [FakeDriver(fail_with=[DeadSessionError("Message: tab crashed")]), FakeDriver()]
+    launches = iter(drivers)
+    manager = BrowserManager(lambda: next(launches), metrics=metrics)
+
+    driver = manager.get("https://example.gov/crash")
+    assert driver is drivers[1] and drivers[1].visited == ["https://example.gov/crash"]
+    assert drivers[0].quit_called
+    assert metrics.counters == {"browser_relaunches": 1}
+    assert metrics.events[0]["reason"] == "dead_session"
+
+    drivers[1].fail_with = [SlowPageError("Message: timeout: Timed out receiving message from renderer")]
+    try:
+        manager.get("https://example.gov/slow")
+    except SlowPageError:
+        pass
+    else:
+        raise AssertionError("A timeout on a live session was swallowed")
+    assert manager.driver is drivers[1] and metrics.counters["browser_relaunches"] == 1
+
+    print("✅ Dead sessions relaunched")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Browser Lifecycle Tests\n")
+
+    tests = [test_recycles_after_pages, test_recycles_on_memory, test_relaunches_dead_sessions]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
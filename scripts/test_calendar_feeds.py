@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the calendar feeds are valid iCalendar files, that the
+timeline is sorted by date, and that only feeds of changed states are rewritten.
+"""
+
+import copy
+import json
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from calendar_feeds import FEED_VERSION, events_digest, fold_line, render_ics, state_events, write_calendar_feeds
+from cycles import CYCLES, calendar_dir, output_dir
+
+CYCLE = {"id": "2026", "label": "2026 Elections"}
+FIRST_BUILD = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+SECOND_BUILD = datetime(2026, 4, 1, 12, 0, tzinfo=timezone.utc)
+
+ELECTION_DATA = {
+    "VA": {
+        "stateName": "Virginia",
+        "registrationWebsite": "https://vote.elections.virginia.gov/",
+        "registrationDeadline": "10/13/2026",
+        "electionInfoUrl": "https://www.elections.virginia.gov/",
+        "elections": [
+            {"title": "U.S. Senate Primary", "date": "06/16/2026", "type": "Primary Election",
+             "stakes": "Open seat; candidates: Warner, Sears", "dateISO": "2026-06-16"},
+            {"title": "General Election", "date": "November 3, 2026", "type": "General Election", "stakes": ""},
+        ],
+        "keyDates": {"primary": {"iso": "2026-06-16", "display": "Jun 16, 2026"},
+                     "general": {"iso": "2026-11-03", "display": "Nov 3, 2026"}},
+    },
+    "NJ": {
+        "stateName": "New Jersey",
+        "registrationWebsite": "https://voter.svrs.nj.gov/register",
+        "registrationDeadline": "same-day",
+        "elections": [{"title": "Primary Election", "date": "06/02/2026", "type": "Primary Election"}],
+    },
+    "AL": {
+        "stateName": "Alabama",
+        "registrationWebsite": "",
+        "registrationDeadline": "06/01/2026",
+        "elections": [],
+        "keyDates": {"primary": {"iso": "2026-05-19", "display": "May 19, 2026"}},
+    },
+}
+
+
+def read_feed(path):
+    """A feed's text with its CRLF line endings intact."""
+    return path.read_bytes().decode("utf-8")
+
+
+def unfold(text):
+    """iCalendar content lines with folding undone."""
+    return text.replace("\r\n ", "").split("\r\n")
+
+
+def test_ics_feed():
+    """Feeds are CRLF iCalendar with all-day events, escaped text and folded lines."""
+    print("🔍 Testing iCalendar output...")
+
+    events = state_events("VA", ELECTION_DATA["VA"])
+    # The key dates duplicate the elections, so they add nothing
+    assert [(e["date"], e["kind"]) for e in events] == [("2026-06-16", "primary"), ("2026-10-13", "registration"),
+                                                         ("2026-11-03", "general")]
+
+    ics = render_ics(events, "Virginia — 2026 Elections", FIRST_BUILD)
+    assert ics.startswith("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n") and ics.endswith("END:VCALENDAR\r\n")
+    assert "\n" not in ics.replace("\r\n", "")
+    assert all(len(line.encode("utf-8")) <= 75 for line in ics.split("\r\n"))
+    lines = unfold(ics)
+    assert lines.count("BEGIN:VEVENT") == 3
+    assert "DTSTART;VALUE=DATE:20261103" in lines and "DTEND;VALUE=DATE:20261104" in lines
+    assert "DESCRIPTION:Open seat\\; candidates: Warner\\, Sears" in lines
+    assert "DTSTAMP:20260301T120000Z" in lines
+    uids = [line for line in lines if line.startswith("UID:")]
+    assert len(set(uids)) == 3
+
+    # A date change keeps the event's UID, so calendar apps move it instead of adding another
+    moved = copy.deepcopy(ELECTION_DATA["VA"])
+    moved["registrationDeadline"] = "10/12/2026"
+    assert [line for line in unfold(render_ics(state_events("VA", moved), "VA", FIRST_BUILD))
+            if line.startswith("UID:")] == uids
+
+    long_line = "DESCRIPTION:" + "Élection " * 20
+    assert fold_line(long_line).replace("\r\n ", "") == long_line
+
+    print("✅ Feeds are valid iCalendar")
+
+
+def test_incremental_rebuild():
+    """Only changed states' feeds are rewritten; the national feed and timeline follow any change."""
+    print("🔍 Testing incremental feed rebuilds...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp) / "calendar"
+        data = copy.deepcopy(ELECTION_DATA)
+
+        first = write_calendar_feeds(data, output_dir, CYCLE, now=FIRST_BUILD)
+        assert first == {"written": ["AL", "NJ", "VA"], "removed": [], "unchanged": 0}
+        assert sorted(path.name for path in output_dir.iterdir()) == [
+            "AL.ics", "NJ.ics", "VA.ics", "all.ics", "manifest.json", "timeline.json"]
+
+        timeline = json.loads((output_dir / "timeline.json").read_text(encoding="utf-8"))
+        assert timeline["cycle"] == "2026"
+        assert [(e["date"], e["state"], e["kind"]) for e in timeline["events"]] == [
+            ("2026-05-19", "AL", "primary"), ("2026-06-01", "AL", "registration"), ("2026-06-02", "NJ", "primary"),
+            ("2026-06-16", "VA", "primary"), ("2026-10-13", "VA", "registration"), ("2026-11-03", "VA", "general")]
+        assert unfold(read_feed(output_dir / "all.ics")).count("BEGIN:VEVENT") == 6
+
+        # Nothing changed: nothing is rewritten
+        assert write_calendar_feeds(data, output_dir, CYCLE, now=SECOND_BUILD)["written"] == []
+        assert "DTSTAMP:20260301T120000Z" in read_feed(output_dir / "all.ics")
+
+        # A non-date change leaves the feed alone; a new date rewrites only that state's feed
+        data["VA"]["elections"][0]["competitive"] = True
+        data["NJ"]["elections"][0]["date"] = "06/09/2026"
+        second = write_calendar_feeds(data, output_dir, CYCLE, now=SECOND_BUILD)
+        assert second == {"written": ["NJ"], "removed": [], "unchanged": 2}
+        assert "DTSTAMP:20260301T120000Z" in read_feed(output_dir / "VA.ics")
+        assert "DTSTART;VALUE=DATE:20260609" in read_feed(output_dir / "NJ.ics")
+        assert "DTSTART;VALUE=DATE:20260609" in read_feed(output_dir / "all.ics")
+
+        # A deleted feed is rebuilt, and a state that left the data loses its feed
+        (output_dir / "VA.ics").unlink()
+        del data["AL"]
+        third = write_calendar_feeds(data, output_dir, CYCLE, now=SECOND_BUILD)
+        assert third == {"written": ["VA"], "removed": ["AL"], "unchanged": 1}
+        assert not (output_dir / "AL.ics").exists()
+        manifest = json.loads((output_dir / "manifest.json").read_text(encoding="utf-8"))
+        assert sorted(manifest["states"]) == ["NJ", "VA"]
+
+    print("✅ Only changed feeds rewritten")
+
+
+def test_published_feeds_match_data():
+    """The committed feeds are current: a build from the published data would rewrite none of them."""
+    print("🔍 Testing the published calendar feeds...")
+
+    for cycle_id in CYCLES:
+        with open(output_dir(cycle_id) / "elections.json", encoding="utf-8") as f:
+            published = json.load(f)
+        manifest = json.loads((calendar_dir(cycle_id) / "manifest.json").read_text(encoding="utf-8"))
+        assert manifest["version"] == FEED_VERSION and manifest["cycle"] == cycle_id == published["cycle"]["id"]
+        election_data = published["electionData"]
+        assert manifest["states"] == {state_code: events_digest(state_events(state_code, state_data))
+                                      for state_code, state_data in election_data.items()}, cycle_id
+        assert all((calendar_dir(cycle_id) / f"{state_code}.ics").exists() for state_code in election_data)
+
+    print("✅ Published feeds match the published data")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Calendar Feed Tests\n")
+
+    tests = [test_ics_feed, test_incremental_rebuild, test_published_feeds_match_data]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
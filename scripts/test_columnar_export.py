@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the columnar v2 export decodes back to elections.json exactly.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from columnar_export import benchmark, decode_election_data, decode_table, encode_election_data, encode_table
+from pipeline import build_steps, run_pipeline
+from test_pipeline import make_config
+
+ELECTIONS_JSON = Path(__file__).parent.parent / "docs" / "elections.json"
+
+
+def test_round_trip():
+    """Every state, election and extra field should survive encoding."""
+    print("🔍 Testing v2 round trip...")
+
+    with open(ELECTIONS_JSON, encoding='utf-8') as f:
+        data = json.load(f)
+    document = encode_election_data(data["electionData"], data["lastUpdated"], data.get("indexes"), data.get("cycle"))
+    decoded = decode_election_data(json.loads(json.dumps(document)))
+    assert decoded == data
+    assert json.dumps(decoded) == json.dumps(data)
+
+    # Repeated values are stored once
+    elections = document["states"]["columns"]["elections"]["table"]["columns"]
+    assert "dict" in elections["chamberImpact"] and len(elections["chamberImpact"]["dict"]) <= 4
+
+    print("✅ v2 decodes to the same data")
+
+
+def test_irregular_rows():
+    """Missing keys, key order, nulls and True/1 should be preserved."""
+    print("🔍 Testing irregular rows...")
+
+    rows = [{"a": 1, "b": True}, {"b": 1, "a": None}, {"c": []}, {"a": 1, "b": True, "c": [{"x": "y"}]}]
+    assert decode_table(json.loads(json.dumps(encode_table(rows)))) == rows
+    assert [list(row) for row in decode_table(encode_table(rows))] == [list(row) for row in rows]
+    assert decode_table(encode_table(rows))[1]["b"] is not True
+    assert decode_table(encode_table([])) == []
+
+    print("✅ Irregular rows round-trip")
+
+
+def test_pipeline_and_benchmark():
+    """The pipeline should publish a v2 file next to elections.json, and the benchmark should compare them."""
+    print("🔍 Testing v2 export in the pipeline...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(Path(tmp))
+        run_pipeline(build_steps(config), config, state_file=Path(tmp) / "state.json")
+
+        published = config["publish_targets"][0]
+        v2_file = published.with_name("elections.v2.json")
+        with open(published, encoding='utf-8') as f:
+            v1 = json.load(f)
+        with open(v2_file, encoding='utf-8') as f:
+            assert decode_election_data(json.load(f)) == v1
+
+        results = benchmark(published, repeat=2)
+        assert results["v2"]["bytes"] < results["v1-min"]["bytes"] < results["v1"]["bytes"]
+        assert all(result["decodeMs"] >= 0 for result in results.values())
+
+    print("✅ Pipeline publishes the v2 export")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Columnar Export Tests\n")
+
+    tests = [test_round_trip, test_irregular_rows, test_pipeline_and_benchmark]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script to verify an interrupted crawl resumes from its journal: completed
+URLs are skipped and their records replayed, failed URLs are retried a limited
+number of times, and a crawl that finished starts over.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from crawl_journal import COMPLETED, FAILED, PENDING, CrawlJournal
+
+JOBS = [("VA", "https://va.example/"), ("NJ", "https://nj.example/"), ("OH", "https://oh.example/")]
+
+
+def test_replay_after_crash():
+    """Replay rebuilds each URL's state and skips a truncated last line."""
+    print("🔍 Testing journal replay...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "journal.jsonl"
+        journal = CrawlJournal(path)
+        journal.add_pending(JOBS)
+        journal.mark_completed("https://va.example/", "VA", {"stateName": "Virginia", "elections": []})
+        journal.mark_completed("https://nj.example/", "NJ", None)  # read, but listed no elections
+        journal.close()
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"url": "https://oh.example/", "state": "OH", "sta')  # crash mid-write
+
+        journal = CrawlJournal(path, resume=True)
+        assert journal.counts() == {PENDING: 1, COMPLETED: 2, FAILED: 0}
+        assert journal.should_skip("https://va.example/") and journal.should_skip("https://nj.example/")
+        assert not journal.should_skip("https://oh.example/")
+        assert list(journal.completed_records()) == [("VA", {"stateName": "Virginia", "elections": []})]
+
+        # Resumed events are appended after the truncated line and replay cleanly
+        journal.add_pending(JOBS)
+        journal.mark_completed("https://oh.example/", "OH", {"stateName": "Ohio", "elections": []})
+        journal.close()
+        events = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    pass
+        assert len(events) == 6
+        assert (events[-1]["url"], events[-1]["status"]) == ("https://oh.example/", COMPLETED)
+
+    print("✅ Journal replayed")
+
+
+def test_failed_urls_are_retried():
+    """A failed URL is retried on resume until it has failed max_attempts times."""
+    print("🔍 Testing failed URL retries...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "journal.jsonl"
+        journal = CrawlJournal(path, max_attempts=2)
+        journal.add_pending(JOBS)
+        journal.mark_completed("https://va.example/", "VA", {"stateName": "Virginia", "elections": []})
+        journal.mark_failed("https://nj.example/", "NJ", TimeoutError("page load timed out"))
+        assert not journal.should_skip("https://nj.example/")
+        journal.close()
+
+        journal = CrawlJournal(path, resume=True, max_attempts=2)
+        assert journal.entries["https://nj.example/"]["attempts"] == 1
+        assert journal.entries["https://nj.example/"]["error"] == "page load timed out"
+        assert not journal.should_skip("https://nj.example/")
+        journal.mark_failed("https://nj.example/", "NJ", "page load timed out")
+        assert journal.should_skip("https://nj.example/")
+        journal.close()
+
+        # Retries used up, but OH is still pending: the crawl is not finished
+        journal = CrawlJournal(path, resume=True, max_attempts=2)
+        assert journal.should_skip("https://nj.example/") and not journal.is_finished()
+        assert journal.counts() == {PENDING: 1, COMPLETED: 1, FAILED: 1}
+        journal.close()
+
+    print("✅ Failed URLs retried up to the limit")
+
+
+def test_finished_crawl_starts_over():
+    """Resuming a crawl that finished starts a fresh one instead of skipping every URL."""
+    print("🔍 Testing resume after a finished crawl...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "journal.jsonl"
+        journal = CrawlJournal(path, max_attempts=1)
+        journal.add_pending(JOBS)
+        for state, url in JOBS[:2]:
+            journal.mark_completed(url, state, {"stateName": state, "elections": []})
+        journal.mark_failed(JOBS[2][1], JOBS[2][0], "HTTP 500")
+        assert journal.is_finished()
+        journal.close()
+
+        journal = CrawlJournal(path, resume=True, max_attempts=1)
+        assert journal.entries == {} and list(journal.completed_records()) == []
+        assert not any(journal.should_skip(url) for _, url in JOBS)
+        assert journal.previous_path().exists()
+        journal.add_pending(JOBS)
+        journal.close()
+        assert len(path.read_text(encoding='utf-8').splitlines()) == 3
+
+    print("✅ Finished crawls start over")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Crawl Journal Tests\n")
+
+    tests = [test_replay_after_crash, test_failed_urls_are_retried, test_finished_crawl_starts_over]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the build is partitioned by election cycle and frozen cycles are left alone.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from csv_to_json import merge_data, parse_elections_csv
+from cycles import CYCLES, current_cycle_id, get_cycle, in_cycle, latest_input, output_dir, write_cycles_manifest
+from pipeline import build_artifact, build_cycle, default_config, read_json
+from test_pipeline import make_config
+
+
+def test_declarations():
+    """The newest cycle should be current and older ones publish under docs/cycles/."""
+    print("🔍 Testing cycle declarations...")
+
+    assert current_cycle_id() == max(CYCLES, key=int)
+    current = get_cycle()
+    assert current["current"] and output_dir().name == "docs"
+    assert current["year"] == int(current["electionDate"][:4])
+
+    older = [cycle_id for cycle_id in CYCLES if cycle_id != current["id"]]
+    for cycle_id in older:
+        assert output_dir(cycle_id).parts[-2:] == ("cycles", cycle_id)
+
+    try:
+        get_cycle("1999")
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("Unknown cycle was accepted")
+
+    # Reference data carries over from the newest earlier cycle that has it
+    assert latest_input("logistics_csv", "2026") == CYCLES["2025"]["logistics_csv"]
+    assert in_cycle("2026", "10/04/26") and not in_cycle("2026", "10/21/25") and in_cycle("2026", "same-day")
+
+    print("✅ Cycles are declared correctly")
+
+
+def test_dates_follow_cycle():
+    """CSV dates and default deadlines should come from the cycle, not fixed years."""
+    print("🔍 Testing cycle dates...")
+
+    elections = parse_elections_csv(CYCLES["2025"]["elections_csv"], "November 7, 2028")
+    dates = {election["date"] for state in elections.values() for election in state["elections"]}
+    assert "November 7, 2028" in dates
+    assert all(date.endswith("2028") for date in dates)
+
+    general = {"VA": {"keyDates": {"registrationDeadline": {"iso": "2026-05-25", "display": "May 25, 2026"}},
+                      "generalRaces": []}}
+    merged = merge_data({}, {}, general, "November 3, 2026")
+    assert merged["VA"]["registrationDeadline"] == "2026-05-25"
+    assert merged["OH"]["registrationDeadline"] == "November 3, 2026"
+
+    print("✅ Dates follow the cycle")
+
+
+def test_frozen_cycle_is_skipped():
+    """A frozen cycle is built once, then never rebuilt, even when its inputs change."""
+    print("🔍 Testing frozen cycles...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        config = make_config(workdir)
+        config["frozen"] = True
+
+        # Not published yet: built once
+        results = build_cycle(config)
+        assert results and set(results.values()) == {"ran"}
+        published = config["publish_targets"][0]
+        with open(published, encoding='utf-8') as f:
+            exported = json.load(f)
+        assert exported["cycle"]["id"] == "2025"
+        before = published.read_bytes()
+
+        with open(config["elections_csv"], 'a', encoding='utf-8') as f:
+            f.write("Wyoming,YES,,,\n")
+        assert build_cycle(config) is None
+        assert published.read_bytes() == before
+
+        # Unfrozen, the same change is picked up
+        config["frozen"] = False
+        assert build_cycle(config)["ingest"] == "ran"
+
+    print("✅ Frozen cycles are not rebuilt")
+
+
+def current_cycle_config(workdir, **overrides):
+    """The current cycle's real inputs, with every output under workdir."""
+    return default_config(build_dir=workdir / "build", publish_targets=[workdir / "docs" / "elections.json"],
+                          search_dir=workdir / "docs" / "search", calendar_dir=workdir / "docs" / "calendar",
+                          state_file=workdir / "state.json", backup=False, **overrides)
+
+
+def test_current_cycle_inputs():
+    """The current cycle rebuilds its curated elections, and an empty build never replaces published ones."""
+    print("🔍 Testing the current cycle's inputs...")
+
+    config = default_config()
+    assert config["logistics_csv"] == latest_input("logistics_csv")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        config = current_cycle_config(workdir)
+        build_cycle(config)
+        built = read_json(config["publish_targets"][0])["electionData"]
+        with open(config["curated_json"], encoding='utf-8') as f:
+            curated = json.load(f)
+        for state_code, state_data in curated.items():
+            for field in ("registrationWebsite", "registrationDeadline", "electionInfoUrl", "electionsOver"):
+                assert built[state_code].get(field) == state_data.get(field), (state_code, field)
+            assert ([(e["title"], e["date"]) for e in built[state_code]["elections"]] ==
+                    [(e["title"], e["date"]) for e in state_data["elections"]]), state_code
+        # Without the curated data nothing lists elections: the build stops before replacing the published file
+        published = config["publish_targets"][0].read_bytes()
+        empty = current_cycle_config(workdir, curated_json=None)
+        try:
+            build_cycle(empty)
+        except ValueError as e:
+            assert "lists no elections" in str(e)
+        else:
+            raise AssertionError("An empty build replaced the published elections")
+        assert config["publish_targets"][0].read_bytes() == published
+
+        # Deadlines from the carried-over logistics CSV belong to its own cycle and are dropped
+        logistics = read_json(build_artifact(empty, "ingest.json"))["logistics"]
+        assert logistics["VA"]["registrationWebsite"].startswith("http")
+        assert all(in_cycle(empty["cycle"], info.get("registrationDeadline", "same-day")) for info in logistics.values())
+
+    print("✅ The current cycle rebuilds its published data")
+
+
+def test_current_cycle_link_check():
+    """The links step checks the logistics CSV the current cycle carries over."""
+    print("🔍 Testing the current cycle's link check...")
+
+    import link_checker
+
+    checked = []
+    dead_url = "https://dead.example/register"
+
+    def fake_check_links(logistics_csv=None, refresh=False, checker=None):
+        checked.append(logistics_csv)
+        return {"deadUrls": [dead_url], "dead": [], "byField": {}}
+
+    originals = link_checker.check_links, link_checker.write_report
+    link_checker.check_links = fake_check_links
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            link_checker.write_report = lambda report: workdir / "link_report.json"
+            config = current_cycle_config(workdir, check_links=True)
+            build_cycle(config)
+            assert checked == [latest_input("logistics_csv")] and checked[0] is not None
+            assert read_json(build_artifact(config, "links.json")) == {"deadUrls": [dead_url]}
+    finally:
+        link_checker.check_links, link_checker.write_report = originals
+
+    print("✅ Carried-over links are checked")
+
+
+def test_manifest():
+    """The cycles manifest should list each cycle's data and search paths."""
+    print("🔍 Testing cycles manifest...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = write_cycles_manifest(Path(tmp) / "cycles.json")
+
+    assert manifest["current"] == current_cycle_id()
+    by_id = {cycle["id"]: cycle for cycle in manifest["cycles"]}
+    assert by_id[current_cycle_id()]["data"] == "elections.json"
+    assert by_id["2025"]["data"] == "cycles/2025/elections.json"
+    assert by_id["2025"]["search"] == "cycles/2025/search/"
+
+    print("✅ Manifest lists every cycle")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Election Cycle Tests\n")
+
+    tests = [test_declarations, test_dates_follow_cycle, test_frozen_cycle_is_skipped, test_current_cycle_inputs,
+             test_current_cycle_link_check, test_manifest]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script to verify date normalization.
+"""
+
+import sys
+
+from dates import SAME_DAY, UNPARSED, annotate_state_dates, date_info, normalize_date
+
+
+def test_formats():
+    """Every input format we see should normalize to the same ISO date."""
+    print("🔍 Testing date formats...")
+
+    for value in ["2025-11-04", "11/4/25", "11/04/2025", "November 4, 2025", "Nov 4, 2025", " Nov. 4, 2025 "]:
+        normalized = normalize_date(value)
+        assert normalized.iso == "2025-11-04", value
+        assert normalized.display == "Nov 4, 2025", value
+        assert normalized.flag is None, value
+
+    print("✅ All formats normalize to 2025-11-04")
+
+
+def test_special_values():
+    """Same-day, unparsed and empty values should be flagged rather than dropped."""
+    print("🔍 Testing special values...")
+
+    for value in ["same-day", "Any time Before", "Election Day"]:
+        normalized = normalize_date(value)
+        assert normalized.flag == SAME_DAY, value
+        assert normalized.iso is None
+
+    unparsed = normalize_date("Varies by county")
+    assert unparsed.flag == UNPARSED
+    assert unparsed.display == "Varies by county"
+    assert normalize_date("2/30/26").flag == UNPARSED
+
+    assert normalize_date("") is None
+    assert normalize_date(None) is None
+    assert date_info("  ") is None
+    assert date_info("same-day") == {"iso": None, "display": "Same-day registration", "flag": SAME_DAY}
+
+    print("✅ Special values are flagged")
+
+
+def test_cache_and_annotate():
+    """Repeated values share one parsed object and records get ISO/display fields."""
+    print("🔍 Testing caching and record annotation...")
+
+    assert normalize_date("10/21/25") is normalize_date("10/21/25")
+
+    state = {
+        "registrationDeadline": "10/21/25",
+        "elections": [{"title": "Governor", "date": "November 4, 2025"}],
+    }
+    annotate_state_dates(state)
+    assert state["registrationDeadline"] == "10/21/25"
+    assert state["registrationDeadlineISO"] == "2025-10-21"
+    assert state["registrationDeadlineDisplay"] == "Oct 21, 2025"
+    assert "registrationDeadlineFlag" not in state
+    assert state["elections"][0]["dateISO"] == "2025-11-04"
+    assert state["elections"][0]["dateDisplay"] == "Nov 4, 2025"
+
+    print("✅ Records are annotated with normalized dates")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Date Normalization Tests\n")
+
+    tests = [test_formats, test_special_values, test_cache_and_annotate]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the discovery crawler finds election pages below a state's
+root URL while staying on the site, within its budgets and robots.txt.
+"""
+
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from discovery_crawler import BloomFilter, DiscoveryCrawler, canonicalize_url, make_seen_set
+
+ELECTIONS_LISTING = """<h1>Upcoming Elections</h1><ul>
+<li>August 4, 2026 - Primary Election for Governor, State Senate and State House</li>
+<li>November 3, 2026 - General Election, early voting begins October 17</li>
+<li>Registration deadline: October 5, 2026</li></ul>"""
+
+SITE = {
+    "/robots.txt": "User-agent: *\nDisallow: /private/\n",
+    "/": """<a href="/about">About the office</a> <a href="/voters/">Voters and elections</a>
+<a href="https://other.example/elections">Elsewhere</a> <a href="mailto:clerk@example.gov">Mail</a>
+<a href="/forms/guide.pdf">Guide</a> <a href="/private/elections">Staff</a>""",
+    "/about": "<p>Our office registers businesses. <a href='/about?utm_source=x#team'>Team</a></p>",
+    "/voters/": """<p>Register to vote.</p> <a href="/voters/faq">FAQ</a>
+<a href="/voters/upcoming-elections">Upcoming elections</a> <a href="/voters/upcoming-elections#top">Top</a>""",
+    "/voters/faq": "<p>Questions about voter ID.</p> <a href='/voters/deep/archive'>Archive</a>",
+    "/voters/upcoming-elections": ELECTIONS_LISTING + " <a href='/voters/deep/results'>Results</a>",
+    "/voters/deep/results": "<p>General election results 2026 " + ELECTIONS_LISTING + "</p>",
+    "/voters/deep/archive": ELECTIONS_LISTING,
+    "/private/elections": ELECTIONS_LISTING,
+}
+
+
+class FakeSiteHandler(BaseHTTPRequestHandler):
+    """Serves SITE and records every path requested."""
+
+    requested = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        FakeSiteHandler.requested.append(path)
+        body = SITE.get(path)
+        self.send_response(200 if body is not None else 404)
+        self.send_header("Content-Type", "text/plain" if path == "/robots.txt" else "text/html; charset=utf-8")
+        self.end_headers()
+        self.wfile.write((body or "Not found").encode())
+
+
+def start_server():
+    """Start the stand-in site on a free port and return (server, root_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def test_canonical_urls():
+    """Equivalent URLs should canonicalize to the same string."""
+    print("🔍 Testing URL canonicalization...")
+
+    canonical = "https://vote.example.gov/elections?a=1&b=2"
+    for url in ["HTTPS://Vote.Example.gov:443/elections?b=2&a=1#calendar",
+                "https://vote.example.gov//elections?utm_source=mail&a=1&b=2&empty=",
+                "https://vote.example.gov/elections?a=1&b=2&gclid=abc"]:
+        assert canonicalize_url(url) == canonical, url
+    assert canonicalize_url("../faq", "http://example.gov:8080/a/b/") == "http://example.gov:8080/a/faq"
+    assert canonicalize_url("http://example.gov") == "http://example.gov/"
+    assert canonicalize_url("mailto:clerk@example.gov") is None
+    assert canonicalize_url("javascript:void(0)") is None
+
+    print("✅ URLs are canonicalized")
+
+
+def test_bloom_filter():
+    """The Bloom filter has no false negatives and a low false-positive rate."""
+    print("🔍 Testing the Bloom filter...")
+
+    bloom = BloomFilter(5000, error_rate=0.01)
+    for i in range(5000):
+        bloom.add(f"https://example.gov/page/{i}")
+    assert all(f"https://example.gov/page/{i}" in bloom for i in range(5000))
+    false_positives = sum(f"https://example.gov/other/{i}" in bloom for i in range(5000))
+    assert false_positives < 5000 * 0.03, false_positives
+    assert len(bloom) == 5000
+
+    assert isinstance(make_seen_set(100), set)
+    assert isinstance(make_seen_set(10_000_000), BloomFilter)
+
+    print("✅ Bloom filter works")
+
+
+def test_discovery():
+    """The crawler should find the listing pages, politely and within its budgets."""
+    print("🔍 Testing discovery crawl...")
+
+    server, root = start_server()
+    FakeSiteHandler.requested = []
+    try:
+        crawler = DiscoveryCrawler(cycle="2026", crawl_delay=0, top_k=2)
+        candidates = crawler.discover(root)
+
+        requested = FakeSiteHandler.requested
+        assert requested.count("/robots.txt") == 1
+        assert "/private/elections" not in requested  # robots.txt
+        assert "/forms/guide.pdf" not in requested
+        assert len(requested) == len(set(requested))  # fragments and tracking params fetched once
+        assert crawler.metrics.counters["discovery_robots_blocked"] == 1
+
+        # Most relevant first; the agency and FAQ pages are not candidates
+        assert [urlsplit(c.url).path for c in candidates] == ["/voters/deep/results", "/voters/upcoming-elections"]
+        assert candidates[1].depth == 2 and candidates[0].score >= candidates[1].score
+
+        # Depth and page budgets
+        shallow = DiscoveryCrawler(cycle="2026", crawl_delay=0, max_depth=1)
+        FakeSiteHandler.requested = []
+        assert shallow.discover(root) == []
+        assert "/voters/upcoming-elections" not in FakeSiteHandler.requested
+
+        limited = DiscoveryCrawler(cycle="2026", crawl_delay=0, max_pages=2)
+        FakeSiteHandler.requested = []
+        limited.discover(root)
+        assert len([path for path in FakeSiteHandler.requested if path != "/robots.txt"]) == 2
+        # Within a depth the "Voters" link outranks "About the office"
+        assert FakeSiteHandler.requested[-1] == "/voters/"
+
+        results = crawler.discover_all({"OH": root, "XX": "not a url"})
+        assert results["XX"] == [] and len(results["OH"]) == 2
+        assert crawler.robots.fetches == 1  # robots.txt stays cached across states
+        crawler.close()
+    finally:
+        server.shutdown()
+
+    print("✅ Discovery finds the election pages")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Discovery Crawler Tests\n")
+
+    tests = [test_canonical_urls, test_bloom_filter, test_discovery]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
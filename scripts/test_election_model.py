@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the slotted election model converts losslessly to and from
+the elections.json shape.
+"""
+
+import json
+import pickle
+import sys
+from pathlib import Path
+
+from election_model import Candidate, Chamber, Election, ElectionType, Party, StateRecord, load_state_records, to_json
+
+ELECTIONS_JSON = Path(__file__).parent.parent / "docs" / "elections.json"
+
+STATE = {
+    "stateName": "Virginia",
+    "registrationWebsite": "https://www.elections.virginia.gov/",
+    "registrationDeadline": "October 14, 2025",
+    "elections": [{
+        "title": "Governor",
+        "date": "November 4, 2025",
+        "type": "General Election",
+        "candidates": [{"name": "Jane Smith", "party": "Democratic", "incumbent": False, "fecId": "S6VA00093"}],
+        "stakes": "Open seat gubernatorial race.",
+        "chamberImpact": "State",
+        "competitive": True,
+        "dateISO": "2025-11-04",
+    }],
+    "keyDates": {"primary": {"iso": "2025-06-17"}},
+}
+
+
+def test_round_trip():
+    """Records should serialize back to exactly the JSON they were built from."""
+    print("🔍 Testing lossless round trip...")
+
+    record = StateRecord.from_dict(json.loads(json.dumps(STATE)))
+    assert record.to_dict() == STATE
+    assert list(record.to_dict()) == list(STATE)
+    assert json.loads(json.dumps(record, default=to_json)) == STATE
+    assert record == STATE
+
+    # Fields the model does not know are kept aside, not dropped
+    assert record.extra == {"keyDates": STATE["keyDates"]}
+    assert record["elections"][0]["candidates"][0]["fecId"] == "S6VA00093"
+
+    with open(ELECTIONS_JSON, encoding='utf-8') as f:
+        live = json.load(f)["electionData"]
+    assert json.loads(json.dumps(load_state_records(live), default=to_json)) == live
+
+    print("✅ Round trip is lossless")
+
+
+def test_interning():
+    """Repeated values should be shared enum members or interned strings."""
+    print("🔍 Testing shared values...")
+
+    first, second = (Election.from_dict(election) for election in [STATE["elections"][0], dict(STATE["elections"][0])])
+    assert first.type is ElectionType.GENERAL and first["chamberImpact"] is Chamber.STATE
+    assert first["type"] == "General Election" and f"{first['type']}" == "General Election"
+    assert first.title is second.title
+    assert first.candidates[0].party is Party.DEMOCRATIC
+
+    # Values outside the enums pass through unchanged
+    assert Candidate(name="Pat Doe", party="Working Families").to_dict()["party"] == "Working Families"
+    assert first.normalized_date.iso == "2025-11-04"
+
+    print("✅ Values are shared")
+
+
+def test_dict_access():
+    """Records should support the dict operations the scripts use."""
+    print("🔍 Testing dict-style access...")
+
+    record = StateRecord(stateName="Ohio", elections=[])
+    assert "registrationWebsite" not in record and record.get("registrationWebsite") is None
+    assert record.setdefault("registrationDeadline", "") == ""
+    record["elections"] = [{"title": "U.S. Senate"}]
+    assert isinstance(record["elections"][0], Election)
+    record["generalRaces"] = ["Senate"]
+    assert list(record.keys()) == ["stateName", "registrationDeadline", "elections", "generalRaces"]
+    assert list(record) == list(record.keys()) and len(record) == 4
+    assert dict(record) == {key: record[key] for key in record.keys()}
+    assert len(Election()) == 0 and not Election()
+    try:
+        hash(record)
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("A mutable record was hashable")
+
+    try:
+        record["missing"]
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("Unknown key did not raise KeyError")
+
+    assert not hasattr(record, "__dict__")
+    assert pickle.loads(pickle.dumps(record)) == record
+
+    print("✅ Dict-style access works")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Election Model Tests\n")
+
+    tests = [test_round_trip, test_interning, test_dict_access]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script to verify candidates listed by several sources under different
+spellings are recognized as one person, compared only within their blocks, and
+merged with the provenance of each field.
+"""
+
+import json
+import sys
+
+from election_model import to_json
+from election_records import merge_election_data
+from entity_resolution import CandidateResolver, normalize_name, resolve_election_candidates, same_person
+from fec_bulk import attach_fec_candidates
+
+
+def person(name):
+    return normalize_name(name)
+
+
+def test_name_normalization():
+    """Case, accents, titles, suffixes, nicknames, initials and "Last, First" order are normalized."""
+    print("🔍 Testing name normalization...")
+
+    assert person("SPANBERGER, ABIGAIL D.") == person("Abigail D Spanberger")
+    assert person("Abby Spanberger").first == "abigail"
+    assert person("Dr. José O'Brien") == person("jose obrien")
+    smith = person('Robert "Bob" Smith, Jr.')
+    assert (smith.first, smith.nickname, smith.last, smith.suffix) == ("robert", "robert", "smith", "jr")
+    assert person("Smith III") == ("", (), "smith", "iii", None)  # a last name alone
+    assert person("") is None and person("(R)") is None
+
+    print("✅ Names normalized")
+
+
+def test_same_person():
+    """Plausible variants match; different people with the same last name do not."""
+    print("🔍 Testing name matching...")
+
+    matches = [
+        ("Abigail Spanberger", "Abby Spanberger"),
+        ("Abigail Spanberger", "A. Spanberger"),
+        ("Winsome Sears", "Winsome Earle-Sears"),
+        ("Jim Smith", "James R. Smith"),
+        ("Robert (Bob) Casey Jr.", "Bob Casey"),
+        ("Katherine Clark", "Kat Clark"),
+    ]
+    for a, b in matches:
+        assert same_person(person(a), person(b)), (a, b)
+
+    different = [
+        ("John Smith Jr.", "John Smith Sr."),
+        ("John Smith", "Jane Smith"),
+        ("James R. Smith", "James T. Smith"),
+        ("Winsome Sears", "Winsome Jones"),
+    ]
+    for a, b in different:
+        assert not same_person(person(a), person(b)), (a, b)
+
+    print("✅ Names matched")
+
+
+def test_blocking():
+    """Only candidates sharing a state, office and last-name key are compared."""
+    print("🔍 Testing the blocking index...")
+
+    last_names = ["Adams", "Baker", "Clark", "Davis", "Evans", "Foster", "Garcia", "Hughes", "Irwin", "Jones"]
+    resolver = CandidateResolver()
+    mentions = 0
+    for state_code in ("VA", "NJ", "OH", "TX"):
+        for office in ("Governor", "U.S. Senate", "U.S. House District 1", "Attorney General", "Mayor"):
+            for last in last_names:
+                for name in (f"John {last}", f"J. {last}"):
+                    resolver.add({"name": name, "party": "Democratic", "incumbent": False}, state_code, office)
+                    mentions += 1
+    assert len(resolver.entities) == mentions // 2
+    assert resolver.merged == mentions // 2
+    assert resolver.comparisons == mentions // 2  # each repeat is compared with its one match, nothing else
+    assert resolver.comparisons < mentions * (mentions - 1) // 2 / 100
+
+    # Same name, different race or party: different people
+    resolver.add({"name": "John Adams", "party": "Republican"}, "VA", "Governor")
+    resolver.add({"name": "John Adams", "party": "Democratic"}, "VA", "Lieutenant Governor")
+    assert len(resolver.entities) == mentions // 2 + 2
+
+    print("✅ Comparisons stay within blocks")
+
+
+def test_merge_with_provenance():
+    """Merging sources keeps one candidate per person and records where each field came from."""
+    print("🔍 Testing merged candidates...")
+
+    def state(*candidates, title="U.S. Senate"):
+        return {"VA": {"stateName": "Virginia", "registrationWebsite": "", "registrationDeadline": "",
+                       "elections": [{"title": title, "date": "November 3, 2026", "type": "General Election",
+                                      "candidates": list(candidates), "stakes": "", "chamberImpact": "Senate",
+                                      "competitive": True}]}}
+
+    csv = state({"name": "Mark Warner", "party": "Democratic", "incumbent": False})
+    scraped = state({"name": "Mark R. Warner", "party": "Democratic", "incumbent": True},
+                    {"name": "Winsome Sears", "party": "Republican", "incumbent": False},
+                    {"name": "Winsome Earle-Sears", "party": "", "incumbent": False})
+    merged = merge_election_data(csv, scraped, source_names=["csv", "scraped"])
+
+    candidates = merged["VA"]["elections"][0]["candidates"]
+    assert [c["name"] for c in candidates] == ["Mark R. Warner", "Winsome Earle-Sears"]
+    warner = candidates[0]
+    assert warner["incumbent"] is True and warner["sources"] == ["csv", "scraped"]
+    assert warner["provenance"] == {"name": "scraped", "party": "csv", "incumbent": "scraped"}
+    assert candidates[1]["party"] == "Republican"
+
+    fec = [{"name": "Mark Warner", "party": "Democratic", "incumbent": True, "fecId": "S6VA00093", "state": "VA",
+            "office": "Senate", "district": None, "committee": "FRIENDS OF MARK WARNER"},
+           {"name": "Jane Doe", "party": "Libertarian", "incumbent": False, "fecId": "S6VA00101", "state": "VA",
+            "office": "Senate", "district": None, "committee": None}]
+    assert attach_fec_candidates(merged, fec, source="fec") == 1
+    candidates = merged["VA"]["elections"][0]["candidates"]
+    assert [c["name"] for c in candidates] == ["Mark R. Warner", "Winsome Earle-Sears", "Jane Doe"]
+    assert candidates[0]["fecId"] == "S6VA00093" and candidates[0]["provenance"]["fecId"] == "fec"
+    assert candidates[0]["sources"] == ["csv", "fec", "scraped"]
+
+    # Round-trips through JSON with the extra fields
+    restored = json.loads(json.dumps(merged, default=to_json))
+    assert restored["VA"]["elections"][0]["candidates"][0]["provenance"]["incumbent"] == "scraped"
+
+    # A single source listing someone twice
+    data = state({"name": "Tim Kaine", "party": "Democratic"}, {"name": "Timothy Kaine", "party": "Democratic"})
+    resolver = resolve_election_candidates(data)
+    assert [c["name"] for c in data["VA"]["elections"][0]["candidates"]] == ["Timothy Kaine"]
+    assert resolver.merged == 1
+
+    print("✅ Candidates merged with provenance")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Entity Resolution Tests\n")
+
+    tests = [test_name_normalization, test_same_person, test_blocking, test_merge_with_provenance]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script to verify FEC bulk file ingestion against the fixture files.
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+from fec_bulk import (attach_fec_candidates, current_cycle, format_candidate_name,
+                      iter_candidates, load_fec_candidates)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "fec"
+CN_FILE = FIXTURES / "cn.txt"
+CM_FILE = FIXTURES / "cm.txt"
+
+
+def test_filtering():
+    """Only House/Senate candidates of the cycle and our states should be kept."""
+    print("🔍 Testing cycle, state and office filters...")
+
+    ids = [row["CAND_ID"] for row in iter_candidates(CN_FILE, 2026, {"TX", "TN", "VA"})]
+    # 2025 specials belong to the 2026 cycle; 2024, presidential and PR rows do not
+    assert "H6TN07090" in ids
+    assert "H4TX18001" not in ids
+    assert "P60000001" not in ids
+    assert "H6PR00001" not in ids
+    assert len(ids) == 9
+
+    assert [row["CAND_ID"] for row in iter_candidates(CN_FILE, 2026, {"VA"})] == ["S6VA00093", "S6VA00111"]
+    assert current_cycle(date(2025, 3, 1)) == 2026
+    assert current_cycle(date(2026, 11, 3)) == 2026
+
+    print("✅ Filters keep only matching candidates")
+
+
+def test_candidate_records():
+    """Candidates should have display names, parties and committee names."""
+    print("🔍 Testing candidate records...")
+
+    assert format_candidate_name("SPANBERGER, ABIGAIL DAVIS MS.") == "Abigail Spanberger"
+    assert format_candidate_name("WHITMIRE, JOHN MR. JR") == "John Whitmire Jr"
+    assert format_candidate_name("VAN EPPS, MATTHEW III") == "Matthew Van Epps III"
+
+    candidates = {c["fecId"]: c for c in load_fec_candidates(CN_FILE, CM_FILE, cycle=2026, states={"TX", "TN", "VA"})}
+    cornyn = candidates["S6TX00123"]
+    assert cornyn["name"] == "John Cornyn"
+    assert cornyn["party"] == "Republican"
+    assert cornyn["incumbent"] is True
+    assert cornyn["office"] == "Senate" and cornyn["district"] is None
+    assert cornyn["committee"] == "TEXANS FOR SENATOR JOHN CORNYN INC"
+    assert candidates["H6TX18101"]["district"] == 18
+    assert candidates["S6VA00111"]["committee"] is None
+
+    print("✅ Candidate records are correct")
+
+
+def test_attach():
+    """Candidates should land on the matching House district or Senate race."""
+    print("🔍 Testing attachment to elections...")
+
+    election_data = {
+        "TX": {"elections": [
+            {"title": "U.S. House - 18 (inner city Houston and the surrounding area)", "chamberImpact": "House", "candidates": []},
+            {"title": "U.S. Senate", "chamberImpact": "Senate", "candidates": [{"name": "John Cornyn", "party": "Republican"}]},
+            {"title": "Fort Worth Mayoral", "chamberImpact": "Local", "candidates": []},
+        ]},
+        "TN": {"elections": [
+            {"title": "U.S. House - 7 (Middle-West Tennessee)", "chamberImpact": "House", "candidates": []},
+        ]},
+    }
+    candidates = load_fec_candidates(CN_FILE, CM_FILE, cycle=2026, states={"TX", "TN"})
+    attached = attach_fec_candidates(election_data, candidates)
+
+    house, senate, mayor = election_data["TX"]["elections"]
+    assert [c["name"] for c in house["candidates"]] == ["Christian Menefee", "John Whitmire Jr"]
+    assert [c["name"] for c in senate["candidates"]] == ["John Cornyn", "James Talarico"]
+    assert mayor["candidates"] == []
+    assert len(election_data["TN"]["elections"][0]["candidates"]) == 2
+    assert attached == 5
+
+    print("✅ Candidates are attached to the right races")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running FEC Bulk Ingestion Tests\n")
+
+    tests = [test_filtering, test_candidate_records, test_attach]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the precomputed export indexes.
+"""
+
+import sys
+
+from indexes import build_indexes
+
+SAMPLE_DATA = {
+    "VA": {
+        "stateName": "Virginia",
+        "generalRaces": ["Senate"],
+        "elections": [
+            {"title": "Governor", "chamberImpact": "State", "dateISO": "2025-11-04"},
+            {"title": "House of Delegates", "chamberImpact": "House", "dateISO": "2025-11-04"},
+        ],
+    },
+    "AL": {
+        "stateName": "Alabama",
+        "generalRaces": ["Senate", "Governor"],
+        "elections": [{"title": "Mayor", "chamberImpact": "Local", "dateISO": None}],
+    },
+    "NJ": {
+        "stateName": "New Jersey",
+        "generalRaces": ["Senate"],
+        "elections": [
+            {"title": "Governor", "chamberImpact": "State", "dateISO": "2025-11-04"},
+            {"title": "Special", "chamberImpact": "State", "dateISO": "2025-06-10"},
+        ],
+    },
+    "ND": {"stateName": "North Dakota", "generalRaces": ["Court"], "elections": []},
+}
+
+
+def test_type_and_name_indexes():
+    """States should be grouped by race type and chamber, sorted by name."""
+    print("🔍 Testing type, chamber and name indexes...")
+
+    indexes = build_indexes(SAMPLE_DATA)
+    assert indexes["statesByName"] == ["AL", "NJ", "ND", "VA"]
+    assert indexes["byType"] == {"Senate": ["AL", "NJ", "VA"], "Governor": ["AL"], "Court": ["ND"]}
+    assert indexes["byChamber"] == {"Local": ["AL"], "State": ["NJ", "VA"], "House": ["VA"]}
+
+    print("✅ Type, chamber and name indexes are correct")
+
+
+def test_elections_by_date():
+    """Elections should be ordered by ISO date with undated ones last."""
+    print("🔍 Testing date index...")
+
+    entries = build_indexes(SAMPLE_DATA)["electionsByDate"]
+    assert entries[0] == ["NJ", 1, "2025-06-10"]
+    assert entries[-1] == ["AL", 0, None]
+    assert [entry[2] for entry in entries[1:-1]] == ["2025-11-04"] * 3
+
+    print("✅ Elections are ordered by date")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Export Index Tests\n")
+
+    tests = [test_type_and_name_indexes, test_elections_by_date]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the link checker finds dead links concurrently, politely and
+with cached results, and that dead registration links fall back to the defaults.
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from csv_to_json import DEFAULT_REGISTRATION_SITES, merge_data
+from link_checker import DEFAULT_FIELD, LinkChecker, check_links, collect_links, link_rot_report
+
+LOGISTICS_CSV = Path(__file__).parent.parent / "data" / "2025 Off-Year Elections - Logistics.csv"
+
+
+class FakeSiteHandler(BaseHTTPRequestHandler):
+    """A site with live, dead, HEAD-refusing and redirecting pages that tracks concurrency."""
+
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    requests_seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def answer(self, method):
+        with FakeSiteHandler.lock:
+            FakeSiteHandler.in_flight += 1
+            FakeSiteHandler.max_in_flight = max(FakeSiteHandler.max_in_flight, FakeSiteHandler.in_flight)
+            FakeSiteHandler.requests_seen.append((method, self.path))
+        time.sleep(0.02)
+        # Counted as finished before answering, since the client may start its next request once it has the answer
+        with FakeSiteHandler.lock:
+            FakeSiteHandler.in_flight -= 1
+
+        if self.path == "/moved":
+            status, headers = 301, {"Location": "/ok"}
+        elif self.path.startswith("/ok") or self.path == "/no-head" and method == "GET":
+            status, headers = 200, {}
+        elif self.path == "/no-head":
+            status, headers = 405, {}
+        else:
+            status, headers = 404, {}
+
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        if method == "GET":
+            self.wfile.write(b"ok")
+
+    def do_HEAD(self):
+        self.answer("HEAD")
+
+    def do_GET(self):
+        self.answer("GET")
+
+
+def start_server():
+    """Start the stand-in site on a free port and return (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_collect_links():
+    """Every link in the logistics CSV, including ones inside notes, plus the defaults."""
+    print("🔍 Testing link collection...")
+
+    links = collect_links(LOGISTICS_CSV)
+    alabama = {link["field"]: link["url"] for link in links if link["state"] == "AL"}
+    assert alabama["electionsWebsite"] == "https://www.sos.alabama.gov/alabama-votes"
+    assert alabama["absenteeForms"].endswith("GenericAbsenteeAppFillable.pdf")
+    assert alabama[DEFAULT_FIELD] == DEFAULT_REGISTRATION_SITES["AL"]
+    assert len(links) > 150
+    assert len(collect_links(None)) == len(DEFAULT_REGISTRATION_SITES)
+
+    print("✅ Links collected")
+
+
+def test_checks():
+    """HEAD then GET, redirects followed, per-host limits, and a cache that expires."""
+    print("🔍 Testing link checks...")
+
+    server, base = start_server()
+    FakeSiteHandler.requests_seen = []
+    FakeSiteHandler.max_in_flight = 0
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_file = Path(tmp) / "links.json"
+            checker = LinkChecker(concurrency=8, per_host=2, cache_file=cache_file, timeout=5)
+            urls = [f"{base}/ok/{i}" for i in range(10)] + [f"{base}/no-head", f"{base}/dead", f"{base}/moved",
+                                                             "http://127.0.0.1:9/unreachable"]
+            results = checker.check_all(urls)
+
+            assert all(results[f"{base}/ok/{i}"]["ok"] for i in range(10))
+            assert results[f"{base}/no-head"]["ok"] and results[f"{base}/no-head"]["method"] == "GET"
+            assert not results[f"{base}/dead"]["ok"] and results[f"{base}/dead"]["status"] == 404
+            assert results[f"{base}/moved"]["finalUrl"] == f"{base}/ok"
+            assert not results["http://127.0.0.1:9/unreachable"]["ok"]
+            assert results["http://127.0.0.1:9/unreachable"]["error"]
+            assert ("GET", "/ok/0") not in FakeSiteHandler.requests_seen  # HEAD was enough
+            assert FakeSiteHandler.max_in_flight <= 2, FakeSiteHandler.max_in_flight
+            checker.close()
+
+            # Cached: live and dead links are not requested again within their TTLs
+            cached = LinkChecker(cache_file=cache_file)
+            cached.check_all(urls)
+            assert cached.requests_made == 0
+
+            # Dead links expire sooner than live ones
+            expiring = LinkChecker(cache_file=cache_file, dead_ttl=0)
+            expiring.check_all(urls)
+            assert expiring.requests_made == 4  # HEAD and GET for the dead and the unreachable link
+            expiring.close()
+
+            links = [{"state": "VA", "field": "checkRegistration", "url": f"{base}/dead"},
+                     {"state": "VA", "field": DEFAULT_FIELD, "url": f"{base}/ok/1"}]
+            report = link_rot_report(links, results)
+            assert report["deadUrls"] == [f"{base}/dead"]
+            assert report["byField"]["checkRegistration"] == {"checked": 1, "dead": 1}
+    finally:
+        server.shutdown()
+
+    print("✅ Links checked")
+
+
+class CannedChecker(LinkChecker):
+    """Answers every link as live without a request, and records whether it was closed."""
+
+    closed = False
+
+    def check_all(self, urls, refresh=False):
+        return {url: {"url": url, "ok": True, "status": 200, "error": None} for url in urls}
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+def test_callers_checker_stays_open():
+    """check_links closes only a checker it created, not one the caller passed in."""
+    print("🔍 Testing checker ownership...")
+
+    checker = CannedChecker(cache_file=None)
+    report = check_links(LOGISTICS_CSV, checker=checker)
+    assert report["deadUrls"] == [] and report["links"] == len(collect_links(LOGISTICS_CSV))
+    assert not checker.closed
+    check_links(LOGISTICS_CSV, checker=checker)  # still usable
+    checker.close()
+
+    print("✅ Caller's checker left open")
+
+
+def test_dead_link_fallback():
+    """A dead CSV registration link is replaced by the state's default, unless that is dead too."""
+    print("🔍 Testing dead link fallback...")
+
+    logistics = {"VA": {"registrationWebsite": "https://dead.example/register", "registrationDeadline": "10/14/25"},
+                 "NJ": {"registrationWebsite": "https://dead.example/nj", "registrationDeadline": "10/14/25"},
+                 "OH": {"registrationWebsite": "https://live.example/oh", "registrationDeadline": "10/6/25"}}
+    dead = ["https://dead.example/register", "https://dead.example/nj", DEFAULT_REGISTRATION_SITES["NJ"]]
+    merged = merge_data({}, logistics, None, "November 4, 2025", dead_links=dead)
+    assert merged["VA"]["registrationWebsite"] == DEFAULT_REGISTRATION_SITES["VA"]
+    assert merged["NJ"]["registrationWebsite"] == "https://dead.example/nj"
+    assert merged["OH"]["registrationWebsite"] == "https://live.example/oh"
+    assert merge_data({}, logistics, None, "")["VA"]["registrationWebsite"] == "https://dead.example/register"
+
+    print("✅ Dead links fall back to the defaults")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Link Checker Tests\n")
+
+    tests = [test_collect_links, test_checks, test_callers_checker_stays_open, test_dead_link_fallback]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Test script to verify JSON responses are captured from Chrome's performance log,
+that the endpoints carrying election data are learned, and that later runs call
+them over plain HTTP instead of rendering the site.
+"""
+
+import json
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import election_scraper
+from election_scraper import ElectionScraper
+from network_capture import Captured, EndpointStore, capture_json_responses, elections_from_json, json_requests
+from test_state_extractors import LOGISTICS_CSV, FakeDriver
+
+CALENDAR = {
+    "state": "Ohio",
+    "data": {"events": [
+        {"id": 1, "stateName": "Ohio", "eventName": "General Election", "eventDate": "2026-11-03T00:00:00"},
+        {"id": 2, "title": "Primary Election", "description": "Statewide", "start": "May 5, 2026"},
+        {"id": 3, "title": "General Election", "date": "11/3/2026"},
+        {"id": 4, "title": "2024 General Election", "date": "2024-11-05"},
+        {"id": 5, "title": "Office closed", "note": "no date"},
+    ]},
+}
+
+
+def log_entry(method, **params):
+    """One Chrome performance log entry."""
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+def network_log(api_url):
+    """The performance log of a page that loaded the calendar JSON, a script and an image."""
+    return [
+        log_entry("Network.requestWillBeSent", requestId="1",
+                  request={"url": api_url, "method": "GET",
+                           "headers": {"Accept": "application/json", "Cookie": "session=1"}}),
+        log_entry("Network.responseReceived", requestId="1", type="XHR",
+                  response={"url": api_url, "status": 200, "mimeType": "application/json"}),
+        log_entry("Network.requestWillBeSent", requestId="2",
+                  request={"url": "https://oh.example/app.js", "method": "GET"}),
+        log_entry("Network.responseReceived", requestId="2", type="Script",
+                  response={"status": 200, "mimeType": "application/javascript"}),
+        log_entry("Network.requestWillBeSent", requestId="3",
+                  request={"url": "https://oh.example/banner.json", "method": "GET"}),
+        log_entry("Network.responseReceived", requestId="3", type="Fetch",
+                  response={"status": 404, "mimeType": "application/json"}),
+    ]
+
+
+class CapturingDriver(FakeDriver):
+    """A FakeDriver with a performance log and DevTools response bodies."""
+
+    def __init__(self, pages, log, bodies):
+        super().__init__(pages)
+        self.log = log
+        self.bodies = bodies
+        self.pending_log = []
+
+    def get(self, url):
+        super().get(url)
+        self.pending_log = list(self.log.get(url, []))
+
+    def get_log(self, kind):
+        entries, self.pending_log = self.pending_log, []
+        return entries
+
+    def execute_cdp_cmd(self, command, params):
+        assert command == "Network.getResponseBody"
+        return {"body": self.bodies[params["requestId"]], "base64Encoded": False}
+
+
+class UnusableDriver:
+    """Fails the test if the browser is used at all."""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"The browser was used ({name})")
+
+
+class CalendarHandler(BaseHTTPRequestHandler):
+    """Serves the calendar JSON, or a 404 once it has moved."""
+
+    requests_seen = []
+    moved = False
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        CalendarHandler.requests_seen.append((self.path, self.headers.get("Accept")))
+        body = json.dumps(CALENDAR).encode("utf-8")
+        self.send_response(404 if CalendarHandler.moved else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_capture_and_parse():
+    """Only successful JSON XHR/fetch responses are captured; objects with a title and date become elections."""
+    print("🔍 Testing response capture and JSON parsing...")
+
+    api_url = "https://oh.example/api/calendar"
+    requests_found = json_requests(network_log(api_url))
+    assert list(requests_found) == ["1"]
+    assert requests_found["1"]["headers"] == {"Accept": "application/json"}  # cookies are not replayed
+
+    driver = CapturingDriver({}, {}, {"1": json.dumps(CALENDAR)})
+    captured = capture_json_responses(driver, network_log(api_url))
+    assert [response.url for response in captured] == [api_url] and captured[0].data == CALENDAR
+
+    elections = elections_from_json(CALENDAR, "2026")
+    assert [(e.title, e.date) for e in elections] == [("General Election", "November 3, 2026"),
+                                                      ("Primary Election", "May 5, 2026")]
+    assert len(elections_from_json(CALENDAR)) == 3  # without a cycle the 2024 entry is kept too
+    assert elections_from_json({"items": []}, "2026") == []
+
+    print("✅ JSON responses captured and parsed")
+
+
+def test_learn_then_call_directly():
+    """A capture run learns the endpoint; the next run reads it without Chrome, and falls back when it breaks."""
+    print("🔍 Testing learned endpoints...")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CalendarHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_url = f"http://127.0.0.1:{server.server_address[1]}/api/calendar?year=2026"
+    CalendarHandler.requests_seen = []
+    CalendarHandler.moved = False
+
+    settle = election_scraper.PAGE_SETTLE_SECONDS
+    election_scraper.PAGE_SETTLE_SECONDS = 0
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoints_file = Path(tmp) / "endpoints.json"
+            # The page itself is an empty shell filled in by JavaScript
+            shell = "<html><body><main><div id='app'></div></main></body></html>"
+            driver = CapturingDriver({"https://oh.example/": shell}, {"https://oh.example/": network_log(api_url)},
+                                     {"1": json.dumps(CALENDAR)})
+
+            scraper = ElectionScraper(logistics_csv=LOGISTICS_CSV, cycle="2026", browser_profile={"enabled": False},
+                                      capture_network=True, endpoints=EndpointStore(endpoints_file))
+            scraper.browser.factory = lambda: driver
+            record = scraper.scrape_state_site("OH", "https://oh.example/")
+            scraper.close()
+            assert [e.title for e in record["elections"]] == ["General Election", "Primary Election"]
+            assert scraper.metrics.counters["endpoints_learned"] == 1
+            assert scraper.metrics.summary()["browser"]["launches"] == 1
+            assert "1 browser launches" in scraper.metrics.describe()
+            learned = EndpointStore(endpoints_file).get("OH")
+            assert learned[0]["url"] == api_url and learned[0]["elections"] == 2
+            assert CalendarHandler.requests_seen == []  # learning only read what the browser loaded
+
+            # A later run calls the endpoint directly and never starts the browser
+            scraper = ElectionScraper(logistics_csv=LOGISTICS_CSV, cycle="2026",
+                                      endpoints=EndpointStore(endpoints_file))
+            scraper.browser.factory = UnusableDriver
+            record = scraper.scrape_state_site("OH", "https://oh.example/")
+            assert not scraper.browser.running
+            assert [e.title for e in record["elections"]] == ["General Election", "Primary Election"]
+            assert CalendarHandler.requests_seen == [("/api/calendar?year=2026", "application/json")]
+            assert scraper.metrics.counters == {"endpoint_hits": 1}
+            scraper.close()
+            assert scraper.metrics.summary()["browser"]["launches"] == 0
+
+            # Once the endpoint breaks, the site is rendered again and the endpoint forgotten
+            CalendarHandler.moved = True
+            rendered = FakeDriver({"https://oh.example/": "<html><body><main><ul>"
+                                   "<li>General Election - November 3, 2026</li></ul></main></body></html>"})
+            scraper = ElectionScraper(logistics_csv=LOGISTICS_CSV, cycle="2026", browser_profile={"enabled": False},
+                                      endpoints=EndpointStore(endpoints_file))
+            scraper.browser.factory = lambda: rendered
+            record = scraper.scrape_state_site("OH", "https://oh.example/")
+            scraper.close()
+            assert rendered.visited == ["https://oh.example/"]
+            assert scraper.metrics.counters["endpoint_misses"] == 1
+            assert EndpointStore(endpoints_file).get("OH") == []
+    finally:
+        election_scraper.PAGE_SETTLE_SECONDS = settle
+        server.shutdown()
+
+    print("✅ Learned endpoints replace rendering")
+
+
+def test_stores_share_the_file():
+    """Stores opened by separate workers merge their saves instead of overwriting each other's."""
+    print("🔍 Testing shared endpoint stores...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        endpoints_file = Path(tmp) / "endpoints.json"
+        captured = [Captured("https://oh.example/api", "GET", None, {}, CALENDAR)]
+        first = EndpointStore(endpoints_file)
+        first.learn("OH", captured, "2026")
+        first.save()
+
+        # Two workers read the file, then each learns or forgets a different state
+        second, third = EndpointStore(endpoints_file), EndpointStore(endpoints_file)
+        second.learn("PA", captured, "2026")
+        third.learn("VA", captured, "2026")
+        third.forget("OH")
+        second.save()
+        third.save()
+        assert sorted(EndpointStore(endpoints_file).endpoints) == ["PA", "VA"]
+        assert sorted(third.endpoints) == ["PA", "VA"]
+
+        # A store that learned nothing leaves the others' endpoints alone
+        EndpointStore(endpoints_file).save()
+
+        def learn_and_save(state_code):
+            store = EndpointStore(endpoints_file)
+            store.learn(state_code, captured, "2026")
+            store.save()
+
+        threads = [threading.Thread(target=learn_and_save, args=(state,)) for state in ("NJ", "NY", "GA", "TX")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(EndpointStore(endpoints_file).endpoints) == ["GA", "NJ", "NY", "PA", "TX", "VA"]
+        assert sorted(path.name for path in Path(tmp).iterdir()) == ["endpoints.json", "endpoints.json.lock"]
+
+    print("✅ Saves merge across stores")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Network Capture Tests\n")
+
+    tests = [test_capture_and_parse, test_learn_then_call_directly, test_stores_share_the_file]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script to verify state pages are parsed correctly, inline and in a process pool.
+"""
+
+import sys
+
+from page_parsers import parse_in_pool, parse_state_elections_html
+
+SAMPLE_PAGE = """
+<html><body><div class="mw-content-ltr">
+  <h2>Governor Elections</h2>
+  <p>The following candidates are running: Abigail Spanberger (D) and Winsome Sears (R).</p>
+  <h3>Polls</h3>
+  <p>Candidate Other Person (I) appears after the section ends.</p>
+  <h2>Mayoral Races</h2>
+  <p>No declared contenders yet.</p>
+</div></body></html>
+"""
+
+CONTEXT = {"stateName": "Virginia", "registrationWebsite": "https://vote.virginia.gov/", "registrationDeadline": "10/14/25"}
+
+
+def test_parse_state_page():
+    """Races with candidates become election records; sections stop at the next heading."""
+    print("🔍 Testing state page parsing...")
+
+    record = parse_state_elections_html(SAMPLE_PAGE, "VA", CONTEXT)
+    assert record["stateName"] == "Virginia"
+    assert len(record["elections"]) == 1
+
+    election = record["elections"][0]
+    assert election["title"] == "Governor Elections"
+    assert election["chamberImpact"] == "State"
+    assert [c["name"] for c in election["candidates"]] == ["Abigail Spanberger", "Winsome Sears"]
+    assert [c["party"] for c in election["candidates"]] == ["Democratic", "Republican"]
+
+    assert parse_state_elections_html("<html><body><h2>About</h2></body></html>", "VA", CONTEXT) is None
+    print("✅ State page parsed correctly")
+
+
+def test_parse_in_pool():
+    """The process pool should return the same records as parsing inline."""
+    print("🔍 Testing process-pool parsing...")
+
+    pages = [(code, SAMPLE_PAGE, CONTEXT) for code in ["VA", "NJ", "NY", "PA", "GA"]]
+    inline = {key: result for key, result, error in parse_in_pool(iter(pages), workers=0)}
+    pooled = {key: result for key, result, error in parse_in_pool(iter(pages), workers=2)}
+    assert pooled == inline
+    assert len(pooled) == 5
+
+    errors = [error for key, result, error in parse_in_pool([("XX", None, CONTEXT)], workers=0)]
+    assert errors[0] is not None
+    print("✅ Pool results match inline parsing")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Page Parser Tests\n")
+
+    tests = [test_parse_state_page, test_parse_in_pool]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the build pipeline only reruns stale steps.
+"""
+
+import ast
+import inspect
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from pipeline import SCRIPTS_DIR, Step, build_steps, default_config, run_pipeline, script_inputs, topological_order
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def make_config(workdir, cycle="2025"):
+    """Build a pipeline config for a cycle that only touches files under workdir."""
+    elections_csv = workdir / "elections.csv"
+    logistics_csv = workdir / "logistics.csv"
+    general_csv = workdir / "general.csv"
+    shutil.copyfile(DATA_DIR / "2025 Off-Year Elections - Elections.csv", elections_csv)
+    shutil.copyfile(DATA_DIR / "2025 Off-Year Elections - Logistics.csv", logistics_csv)
+    shutil.copyfile(DATA_DIR.parent / "general_election.csv", general_csv)
+    return default_config(
+        cycle,
+        elections_csv=elections_csv,
+        logistics_csv=logistics_csv,
+        general_csv=general_csv,
+        build_dir=workdir / "build",
+        publish_targets=[workdir / "docs" / "elections.json"],
+        search_dir=workdir / "docs" / "search",
+        calendar_dir=workdir / "docs" / "calendar",
+        state_file=workdir / "state.json",
+        backup=False,
+    )
+
+
+def test_noop_rebuild():
+    """A second run with unchanged inputs should skip every step."""
+    print("🔍 Testing no-op rebuild...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        config = make_config(workdir)
+        state_file = workdir / "state.json"
+
+        first = run_pipeline(build_steps(config), config, state_file=state_file)
+        assert set(first.values()) == {"ran"}
+        assert (workdir / "docs" / "elections.json").exists()
+
+        second = run_pipeline(build_steps(config), config, state_file=state_file)
+        assert set(second.values()) == {"up to date"}
+
+    print("✅ Unchanged inputs rerun nothing")
+
+
+def test_changed_input_reruns_downstream():
+    """Editing a CSV should rerun ingest and everything whose inputs it changes."""
+    print("🔍 Testing incremental rebuild...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        config = make_config(workdir)
+        state_file = workdir / "state.json"
+        run_pipeline(build_steps(config), config, state_file=state_file)
+
+        # Appending a blank line does not change the parsed data, so the rebuild
+        # stops after ingest.
+        with open(config["elections_csv"], 'a', encoding='utf-8') as f:
+            f.write("\n")
+        results = run_pipeline(build_steps(config), config, state_file=state_file)
+        assert results["ingest"] == "ran"
+        assert results["merge"] == "up to date"
+
+        with open(config["elections_csv"], 'a', encoding='utf-8') as f:
+            f.write("Wyoming,YES,,,\n")
+        results = run_pipeline(build_steps(config), config, state_file=state_file)
+        assert results["ingest"] == "ran"
+        assert results["merge"] == "ran"
+        assert results["publish"] == "ran"
+        assert results["scrape"] == "up to date"
+
+    print("✅ Only stale steps rerun")
+
+
+def test_dependency_order():
+    """Steps should be ordered after their dependencies and cycles rejected."""
+    print("🔍 Testing dependency ordering...")
+
+    noop = lambda config: None
+    steps = [Step("b", noop, deps=["a"]), Step("c", noop, deps=["b"]), Step("a", noop)]
+    assert [step.name for step in topological_order(steps)] == ["a", "b", "c"]
+
+    try:
+        topological_order([Step("a", noop, deps=["b"]), Step("b", noop, deps=["a"])])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Cycle was not detected")
+
+    print("✅ Dependency order is correct")
+
+
+def test_step_inputs_cover_code():
+    """Every script a step's action imports, and the scripts those import, are among its inputs."""
+    print("🔍 Testing step inputs...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        steps = build_steps(make_config(Path(tmp)))
+    for step in steps:
+        tree = ast.parse(inspect.getsource(step.action).strip())
+        imported = {node.module for node in ast.walk(tree) if isinstance(node, ast.ImportFrom)}
+        scripts = [name for name in imported if (SCRIPTS_DIR / f"{name}.py").exists()]
+        missing = set(script_inputs(*scripts)) - set(step.inputs)
+        # publish only copies files and takes a backup, which does not change its outputs
+        assert step.name == "publish" or not missing, (step.name, sorted(path.name for path in missing))
+
+    merge = next(step for step in steps if step.name == "merge")
+    assert {"csv_to_json.py", "fec_bulk.py", "election_model.py", "entity_resolution.py"} <= {
+        path.name for path in merge.inputs}
+    # Command-line entry points that import the pipeline do not drag every script in
+    assert [path.name for path in script_inputs("search_index")] == ["search_index.py"]
+
+    print("✅ Step inputs cover the code each step runs")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Pipeline Tests\n")
+
+    tests = [test_noop_rebuild, test_changed_input_reruns_downstream, test_dependency_order,
+             test_step_inputs_cover_code]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
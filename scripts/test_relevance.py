@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script to verify pages are scored for election relevance in a single pass.
+"""
+
+import random
+import re
+import sys
+
+from relevance import PatternMatcher, is_relevant, page_text, score_page
+
+AGENCY_PAGE = """<html><body><h1>Department of Motor Vehicles</h1>
+<p>Renew your license online. You can also register to vote when you renew.</p>
+<p>Office hours: Monday to Friday. Voter information is available at the front desk.</p></body></html>"""
+
+ELECTIONS_PAGE = """<html><body><h1>Upcoming Elections</h1>
+<ul><li>August 4, 2026 - Primary Election for Governor and State Senate</li>
+<li>November 3, 2026 - General Election. Early voting begins October 17.</li>
+<li>Registration deadline: October 5, 2026</li></ul></body></html>"""
+
+# An agency page whose scripts and styles are full of election words the reader never sees
+SCRIPT_HEAVY_PAGE = """<html><head>
+<script type="text/javascript">
+  var config = {page: "general-election", events: ["Primary Election November 3, 2026", "General Election 2026"]};
+  if (a < b && "</p>") { track("upcoming elections", "election calendar", "candidates"); }
+</script>
+<STYLE>.general-election, .primary-election, .ballot-measure { color: red; }</STYLE>
+<script src="/analytics.js"></script>
+</head><body><h1>Department of Motor Vehicles</h1>
+<noscript><p>Enable JavaScript to see the 2026 General Election calendar.</p></noscript>
+<p>Renew your license online.</p>
+<script>window.electionData = {"2026": "General Election, Primary Election, Runoff"};"""
+
+
+def test_matches_every_term():
+    """The automaton should find the same whole-word hits as checking each term separately."""
+    print("🔍 Testing multi-pattern matching...")
+
+    vocabulary = {"he": 1, "she": 2, "his": 1, "hers": 3, "her": 1, "election": 1, "general election": 4}
+    matcher = PatternMatcher(vocabulary)
+
+    assert [hit.term for hit in matcher.find("She said: his and HERS")] == ["she", "his", "hers"]
+    assert matcher.find("ushers") == []  # inside another word
+    hits = matcher.find("The General Election.")
+    assert [(hit.start, hit.end, hit.term) for hit in hits] == [(4, 20, "general election"), (12, 20, "election")]
+
+    rng = random.Random(7)
+    words = ["he", "she", "his", "hers", "her", "election", "general", "x", "shehers"]
+    for _ in range(200):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 12)))
+        expected = sorted(
+            (m.start(), m.end(), term)
+            for term in vocabulary
+            for m in re.finditer(rf"(?<![a-z0-9]){re.escape(term)}(?![a-z0-9])", text)
+        )
+        assert sorted((hit.start, hit.end, hit.term) for hit in matcher.find(text)) == expected, text
+
+    print("✅ Every term is matched in one pass")
+
+
+def test_scores_rank_pages():
+    """Pages that only mention voting should score far below real election listings."""
+    print("🔍 Testing relevance scores...")
+
+    agency = score_page(AGENCY_PAGE, "2026")
+    elections = score_page(ELECTIONS_PAGE, "2026")
+    assert not is_relevant(agency.score), agency.score
+    assert is_relevant(elections.score), elections.score
+    assert "general election" in {hit.term for hit in elections.hits}
+    assert "2026" in {hit.term for hit in elections.hits}
+
+    # Hit positions point into the scored text
+    text = "Special election for Mayor"
+    hit = score_page(text).hits[0]
+    assert text[hit.start:hit.end].lower() == hit.term == "special election"
+
+    assert elections.score > agency.score
+
+    # Repeating a word does not make a page relevant
+    assert score_page("vote " * 500).score == score_page("vote vote vote").score
+
+    print("✅ Relevance ranks pages")
+
+
+def test_ignores_scripts_and_styles():
+    """Text inside script, style and noscript elements does not count toward relevance."""
+    print("🔍 Testing script-heavy pages...")
+
+    text = page_text(SCRIPT_HEAVY_PAGE)
+    assert " ".join(text.split()) == "Department of Motor Vehicles Renew your license online.", text
+    relevance = score_page(SCRIPT_HEAVY_PAGE, "2026")
+    assert not is_relevant(relevance.score) and relevance.hits == [], relevance
+
+    # Scripts inside an otherwise relevant page do not change its score
+    with_scripts = ELECTIONS_PAGE.replace("<body>", "<body><script>var runoff = 'election';</script>")
+    assert score_page(with_scripts, "2026").score == score_page(ELECTIONS_PAGE, "2026").score
+
+    print("✅ Scripts and styles ignored")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Page Relevance Tests\n")
+
+    tests = [test_matches_every_term, test_scores_rank_pages, test_ignores_scripts_and_styles]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
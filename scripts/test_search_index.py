@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the sharded search index.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from search_index import build_search_index, tokenize, write_search_index
+
+SAMPLE_DATA = {
+    "NJ": {
+        "stateName": "New Jersey",
+        "elections": [
+            {"title": "Jersey City Mayor", "stakes": "Open seat.", "chamberImpact": "Local", "candidates": []},
+            {"title": "Governor", "stakes": "Open seat gubernatorial race.", "chamberImpact": "State",
+             "candidates": [{"name": "Mikie Sherrill"}, {"name": "Jack Ciattarelli"}]},
+        ],
+    },
+    "VA": {
+        "stateName": "Virginia",
+        "elections": [
+            {"title": "Governor", "stakes": "", "chamberImpact": "State",
+             "candidates": [{"name": "Abigail Spanberger"}]},
+        ],
+    },
+}
+
+
+def search(directory, query):
+    """Answer a query the way docs/search.js does, reading only the shards it needs."""
+    manifest = json.loads((directory / "manifest.json").read_text())
+    docs = json.loads((directory / "docs.json").read_text())
+    matches = []
+    for term in tokenize(query):
+        prefix = term[:manifest["prefixLength"]]
+        shard = json.loads((directory / f"{prefix}.json").read_text()) if prefix in manifest["shards"] else {}
+        matches.append({doc_id for token, ids in shard.items() if token.startswith(term) for doc_id in ids})
+    if not matches:
+        return []
+    return [docs[doc_id][:2] for doc_id in sorted(set.intersection(*matches))]
+
+
+def test_tokenize():
+    """Tokens should be lowercase, accent-free and skip stop words."""
+    print("🔍 Testing tokenizer...")
+
+    assert tokenize("Jersey City Mayor") == ["jersey", "city", "mayor"]
+    assert tokenize("José Peña (D)") == ["jose", "pena"]
+    assert tokenize("Secretary of the Commonwealth") == ["secretary", "commonwealth"]
+    assert tokenize(None) == []
+
+    print("✅ Tokenizer is correct")
+
+
+def test_queries():
+    """Multi-word and prefix queries should find the right elections."""
+    print("🔍 Testing queries against written shards...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        manifest = write_search_index(SAMPLE_DATA, directory)
+        assert "ja" in manifest["shards"]
+
+        assert search(directory, "Jersey City mayor") == [["NJ", 0]]
+        assert search(directory, "Spanberger") == [["VA", 0]]
+        assert search(directory, "spanb") == [["VA", 0]]
+        assert search(directory, "virginia governor") == [["VA", 0]]
+        assert search(directory, "governor") == [["NJ", 1], ["VA", 0]]
+        assert search(directory, "virginia") == [["VA", -1], ["VA", 0]]
+        assert search(directory, "zebra") == []
+
+    print("✅ Queries return the expected elections")
+
+
+def test_stale_shards_removed():
+    """Rebuilding with less data should drop shards that are no longer used."""
+    print("🔍 Testing shard cleanup...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_search_index(SAMPLE_DATA, directory)
+        assert (directory / "sp.json").exists()
+
+        write_search_index({"NJ": SAMPLE_DATA["NJ"]}, directory)
+        assert not (directory / "sp.json").exists()
+        docs, index = build_search_index({"NJ": SAMPLE_DATA["NJ"]})
+        assert len(docs) == 3
+        assert index["sherrill"] == [2]
+
+    print("✅ Stale shards are removed")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Search Index Tests\n")
+
+    tests = [test_tokenize, test_queries, test_stale_shards_removed]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test script to verify sharded scrape runs split the work stably and that merging
+their partial files gives the same data as a run in one process.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from advanced_election_scraper import SOURCE_ORDER as ADVANCED_SOURCES, AdvancedElectionScraper
+from ballotpedia_api import BallotpediaClient
+from csv_to_json import STATE_CODES
+from election_model import to_json
+from election_records import RecordWriter, merge_records
+from election_scraper import SOURCE_ORDER, ElectionScraper
+from pipeline import build_artifact, build_steps, read_json, run_pipeline
+from sharding import Shard, merge_shards, shard_paths
+from test_ballotpedia_api import LOGISTICS_CSV, start_server
+from test_pipeline import make_config
+
+
+def as_json(data):
+    """Compare scraped data by its JSON form."""
+    return json.dumps(data, sort_keys=True, default=to_json)
+
+
+def test_assignment():
+    """Every unit of work belongs to exactly one shard, the same one every time."""
+    print("🔍 Testing shard assignment...")
+
+    shards = [Shard(index, 4) for index in range(4)]
+    counts = [0] * 4
+    for source in SOURCE_ORDER:
+        for state_code in STATE_CODES.values():
+            owners = [shard.index for shard in shards if shard.owns(source, state_code)]
+            assert len(owners) == 1
+            counts[owners[0]] += 1
+    assert min(counts) >= 15, counts  # 102 units split roughly evenly
+
+    assert Shard(2, 4).owns("ballotpedia", "VA") == Shard.parse("2/4").owns("ballotpedia", "VA")
+    assert Shard().owns("anything") and not Shard().is_sharded
+    for bad in ["4/4", "-1/2", "1", "a/b", "0/0"]:
+        try:
+            Shard.parse(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Accepted shard {bad!r}")
+
+    print("✅ Shards are assigned stably")
+
+
+def test_merge_matches_single_run():
+    """Merged shard results should equal an unsharded run, for both scrapers."""
+    print("🔍 Testing merged shards...")
+
+    server, api_url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            single = ElectionScraper(logistics_csv=LOGISTICS_CSV, parse_workers=0, cycle="2026",
+                                     ballotpedia_client=BallotpediaClient(api_url=api_url))
+            expected = merge_records((state, record) for _, state, record in single.iter_records(["ballotpedia"]))
+            single.close()
+
+            scraped_states = []
+            for shard in (Shard(0, 3), Shard(1, 3), Shard(2, 3)):
+                scraper = ElectionScraper(logistics_csv=LOGISTICS_CSV, parse_workers=0, cycle="2026", shard=shard,
+                                          ballotpedia_client=BallotpediaClient(api_url=api_url))
+                with RecordWriter(shard.path("election_scraper", "2026", tmp)) as writer:
+                    for source, state_code, record in scraper.iter_records(["ballotpedia"]):
+                        writer.write(state_code, record, source)
+                        scraped_states.append(state_code)
+                scraper.close()
+
+            assert sorted(scraped_states) == sorted(expected)  # each state scraped once
+            merged, missing = merge_shards("election_scraper", 3, "2026", SOURCE_ORDER, tmp)
+            assert not missing and as_json(merged) == as_json(expected)
+
+            # The advanced scraper splits whole sources
+            single = AdvancedElectionScraper(logistics_csv=LOGISTICS_CSV, ballotpedia_api_url=api_url, cycle="2026")
+            expected = merge_records(
+                (state, record) for source in ADVANCED_SOURCES
+                for state, record in single.iter_election_data(sources=[source]))
+            for shard in (Shard(0, 2), Shard(1, 2)):
+                scraper = AdvancedElectionScraper(logistics_csv=LOGISTICS_CSV, ballotpedia_api_url=api_url,
+                                                  cycle="2026", shard=shard)
+                with RecordWriter(shard.path("advanced_scraper", "2026", tmp)) as writer:
+                    for source, state_code, record in scraper.iter_election_data(with_source=True):
+                        writer.write(state_code, record, source)
+            merged, missing = merge_shards("advanced_scraper", 2, "2026", ADVANCED_SOURCES, tmp)
+            assert not missing and as_json(merged) == as_json(expected)
+
+            _, missing = merge_shards("advanced_scraper", 3, "2026", ADVANCED_SOURCES, tmp)
+            assert len(missing) == 3
+    finally:
+        server.shutdown()
+
+    print("✅ Merged shards match a single run")
+
+
+def test_pipeline_merges_shards():
+    """The pipeline's scrape step should merge the shard files and rerun when one changes."""
+    print("🔍 Testing sharded scrape in the pipeline...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        config = make_config(workdir)
+        config.update(scrape_shards=2, shard_dir=workdir / "shards")
+        try:
+            run_pipeline(build_steps(config), config, state_file=config["state_file"])
+        except FileNotFoundError as e:
+            assert "Missing scrape shard results" in str(e)
+        else:
+            raise AssertionError("Missing shards were not reported")
+
+        race = {"stateName": "Ohio", "registrationWebsite": "", "registrationDeadline": "October 6, 2025",
+                "elections": [{"title": "U.S. Senate", "date": "November 4, 2025", "type": "General Election",
+                               "candidates": [], "stakes": "", "chamberImpact": "Senate", "competitive": True}]}
+        for index, path in enumerate(shard_paths("advanced_scraper", 2, config["cycle"], config["shard_dir"])):
+            with RecordWriter(path) as writer:
+                if index == 1:
+                    writer.write("OH", race, "ballotpedia_senate")
+
+        results = run_pipeline(build_steps(config), config, state_file=config["state_file"])
+        assert results["scrape"] == "ran"
+        assert read_json(build_artifact(config, "scraped.json"))["OH"]["elections"][0]["title"] == "U.S. Senate"
+        titles = [e["title"] for e in read_json(build_artifact(config, "merged.json"))["OH"]["elections"]]
+        assert "U.S. Senate" in titles
+
+        results = run_pipeline(build_steps(config), config, state_file=config["state_file"])
+        assert results["scrape"] == "up to date"
+
+    print("✅ Pipeline merges scrape shards")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Scrape Sharding Tests\n")
+
+    tests = [test_assignment, test_merge_matches_single_run, test_pipeline_merges_shards]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
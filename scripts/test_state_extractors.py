@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the per-state site extractors produce election records from
+the relevant part of a page, with a generic fallback.
+"""
+
+import sys
+from pathlib import Path
+
+import election_scraper
+from election_scraper import ElectionScraper
+from relevance import RELEVANCE_THRESHOLD
+from state_extractors import classify_election, extract_elections, get_extractor, region_selectors
+
+LOGISTICS_CSV = Path(__file__).parent.parent / "data" / "2025 Off-Year Elections - Logistics.csv"
+
+VIRGINIA_PAGE = """<html><body>
+<nav><ul><li>Primary Election June 17, 2025 (menu link)</li></ul></nav>
+<div id="main-content">
+  <table>
+    <thead><tr><th>Date</th><th>Election</th></tr></thead>
+    <tbody>
+      <tr><td>November 4, 2025</td><td>General Election</td></tr>
+      <tr><td>06/16/2026</td><td>June Primary Election</td></tr>
+      <tr><td>January 6, 2026</td><td>Special Election - House of Delegates District 11</td></tr>
+      <tr><td>TBD</td><td>Runoff Election</td></tr>
+    </tbody>
+  </table>
+</div>
+</body></html>"""
+
+GENERIC_PAGE = """<html><body>
+<header><p>Election Day is November 3, 2026. Register to vote!</p></header>
+<main>
+  <h2>Upcoming Elections</h2>
+  <ul>
+    <li>Nov. 3, 2026 - General Election</li>
+    <li>August 4, 2026 - Statewide Primary Election</li>
+    <li>August 4, 2026 - Statewide Primary Election</li>
+    <li>October 5, 2026 - Voter registration deadline</li>
+    <li>March 10, 2026 - Municipal Runoff</li>
+  </ul>
+  <p>Contact your county clerk for more information about every election held in the state.</p>
+</main>
+</body></html>"""
+
+
+def test_state_config():
+    """A state's config should read only its region and its table columns."""
+    print("🔍 Testing a per-state extractor...")
+
+    elections = extract_elections("VA", VIRGINIA_PAGE, cycle="2026")
+    assert [(e["title"], e["date"]) for e in elections] == [
+        ("June Primary Election", "June 16, 2026"),
+        ("Special Election - House of Delegates District 11", "January 6, 2026"),
+    ]
+    assert elections[0]["type"] == "Primary Election"
+    assert elections[1]["type"] == "Special Election"
+    assert elections[1]["chamberImpact"] == "House"
+
+    # Without a cycle every dated entry is kept, but never the navigation menu
+    titles = [e["title"] for e in extract_elections("VA", VIRGINIA_PAGE)]
+    assert titles[0] == "General Election" and len(titles) == 3
+
+    print("✅ State config extracts its table")
+
+
+def test_generic_fallback():
+    """States without a config, or whose config matches nothing, use the generic extractor."""
+    print("🔍 Testing the generic extractor...")
+
+    elections = extract_elections("OH", GENERIC_PAGE, cycle="2026")
+    assert [(e["title"], e["date"]) for e in elections] == [
+        ("General Election", "November 3, 2026"),
+        ("Statewide Primary Election", "August 4, 2026"),
+        ("Municipal Runoff", "March 10, 2026"),
+    ]
+    assert get_extractor("OH").is_generic
+
+    # Virginia's table is not on this page, so its config falls back
+    assert len(extract_elections("VA", GENERIC_PAGE, cycle="2026")) == 3
+    assert classify_election("Municipal Runoff") == "Runoff Election"
+
+    print("✅ Generic fallback works")
+
+
+def test_compiled_once():
+    """Configs should be compiled once per state and shared."""
+    print("🔍 Testing extractor cache...")
+
+    assert get_extractor("VA") is get_extractor("VA")
+    assert get_extractor("ZZ") is get_extractor(None)
+    assert region_selectors("VA")[:2] == ["#main-content", "main"]
+    assert region_selectors("VA").count("main") == 1
+
+    link = get_extractor("OH").page_url("https://example.gov/", ["https://example.gov/about",
+                                                                  "https://example.gov/upcoming-elections"])
+    assert link == "https://example.gov/upcoming-elections"
+    assert get_extractor("VA").page_url("https://example.gov/").startswith("https://www.elections.virginia.gov/")
+
+    print("✅ Extractors are cached")
+
+
+class FakeDriver:
+    """Serves fixed pages and answers the scraper's scripts the way Chrome would."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.current = None
+        self.visited = []
+
+    def get(self, url):
+        self.current = url
+        self.visited.append(url)
+
+    @property
+    def page_source(self):
+        return self.pages[self.current]
+
+    def execute_script(self, script, *args):
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(self.page_source, "html.parser")
+        if script == election_scraper.PAGE_LINKS_SCRIPT:
+            return [a.get("href") for a in soup.find_all("a")]
+        if script == election_scraper.REGION_HTML_SCRIPT:
+            for selector in args[0]:
+                element = soup.select_one(selector)
+                if element is not None:
+                    return str(element)
+            return None
+        return {}
+
+    def quit(self):
+        pass
+
+
+def test_scraper_reads_region():
+    """ElectionScraper should follow the elections link and return real records."""
+    print("🔍 Testing state sites in the scraper...")
+
+    landing = "<html><body><main><a href='https://oh.example/about'>About</a>" \
+              "<a href='https://oh.example/elections/upcoming-elections'>Upcoming</a></main></body></html>"
+    driver = FakeDriver({"https://oh.example/": landing,
+                         "https://oh.example/elections/upcoming-elections": GENERIC_PAGE})
+
+    settle = election_scraper.PAGE_SETTLE_SECONDS
+    election_scraper.PAGE_SETTLE_SECONDS = 0
+    try:
+        scraper = ElectionScraper(logistics_csv=LOGISTICS_CSV, cycle="2026",
+                                  browser_profile={"enabled": False})
+        scraper.browser.factory = lambda: driver
+        scraper.state_election_sites = {"OH": "https://oh.example/"}
+        records = dict(scraper.iter_state_election_sites())
+        scraper.close()
+    finally:
+        election_scraper.PAGE_SETTLE_SECONDS = settle
+
+    assert scraper.metrics.pages[-1]["relevance"] >= RELEVANCE_THRESHOLD
+    assert driver.visited == ["https://oh.example/", "https://oh.example/elections/upcoming-elections"]
+    ohio = records["OH"]
+    assert ohio["electionWebsite"] == "https://oh.example/"
+    assert [e["title"] for e in ohio["elections"]] == ["General Election", "Statewide Primary Election",
+                                                       "Municipal Runoff"]
+
+    print("✅ Scraper produces election records")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running State Extractor Tests\n")
+
+    tests = [test_state_config, test_generic_fallback, test_compiled_once, test_scraper_reads_region]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the SQLite work queue hands each job to exactly one worker,
+reclaims expired leases, retries failures, and that a queued scrape builds the
+same data as a run in one process.
+"""
+
+import json
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from election_model import to_json
+from election_records import merge_records
+from election_scraper import ElectionScraper
+from ballotpedia_api import BallotpediaClient
+from pipeline import build_artifact, read_json
+from scrape_queue import BALLOTPEDIA_SOURCE, BALLOTPEDIA_STATE, orchestrate
+from test_ballotpedia_api import LOGISTICS_CSV, start_server
+from test_pipeline import make_config
+from work_queue import DONE, FAILED, PENDING, WorkQueue
+
+
+def drain(queue_path, worker):
+    """Claim and complete jobs until none are left (run in a child process)."""
+    with WorkQueue(queue_path) as queue:
+        while True:
+            job = queue.claim(worker)
+            if job is None:
+                return
+            queue.complete(job, {"worker": worker, "key": job.key}, worker)
+
+
+def test_claims_are_exclusive():
+    """Workers in separate processes should each get different jobs, all of them done once."""
+    print("🔍 Testing concurrent claims...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue_path = Path(tmp) / "queue.sqlite"
+        with WorkQueue(queue_path) as queue:
+            assert queue.add_many(("state_site", f"S{i:02d}", {"i": i}) for i in range(60)) == 60
+            assert queue.add_many([("state_site", "S00", {})]) == 0  # already queued
+
+        workers = [multiprocessing.Process(target=drain, args=(queue_path, f"worker-{i}")) for i in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        with WorkQueue(queue_path) as queue:
+            assert queue.counts()[DONE] == 60 and queue.is_drained()
+            results = list(queue.results("state_site"))
+            assert [key for _, key, _ in results] == [f"S{i:02d}" for i in range(60)]
+            assert all(result["key"] == key for _, key, result in results)
+
+    print("✅ Each job claimed once")
+
+
+def test_leases_and_retries():
+    """Expired leases go back to the queue; failures back off, then fail for good."""
+    print("🔍 Testing leases and retries...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with WorkQueue(Path(tmp) / "queue.sqlite", lease_seconds=0.2, max_attempts=2, retry_backoff=0.2) as queue:
+            queue.add("state_site", "VA", {"url": "https://elections.virginia.gov"})
+
+            job = queue.claim("crashed")
+            assert job.payload["url"] == "https://elections.virginia.gov" and job.attempts == 1
+            assert queue.claim("other") is None  # still leased
+            time.sleep(0.3)
+
+            # The crashed worker's lease expired: another worker gets the job
+            retried = queue.claim("other")
+            assert retried.id == job.id and retried.attempts == 2
+            assert not queue.complete(job, {}, "crashed")  # the lease is no longer theirs
+            with queue.keep_leased(retried, "other", interval=0.05):
+                time.sleep(0.4)
+            assert queue.claim("third") is None  # renewed while the job ran
+
+            assert queue.fail(retried, "timed out", "other")
+            assert queue.counts()[FAILED] == 1 and queue.failures() == [("state_site", "VA", "timed out")]
+
+            # A first failure is retried after the backoff
+            queue.add("state_site", "NJ")
+            job = queue.claim("worker")
+            queue.fail(job, ValueError("page changed"), "worker")
+            assert queue.counts()[PENDING] == 1 and not queue.is_drained()
+            assert queue.claim("worker") is None
+            time.sleep(0.25)
+            job = queue.claim("worker")
+            assert job.key == "NJ" and job.attempts == 2
+            assert queue.complete(job, [["NJ", None]], "worker") and queue.is_drained()
+
+    print("✅ Leases expire and failures are retried")
+
+
+def test_orchestrated_scrape():
+    """Queued Ballotpedia jobs should merge into the same data as a single run, then publish."""
+    print("🔍 Testing the queued scrape...")
+
+    server, api_url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            config = make_config(workdir, cycle="2026")
+            queue_path = workdir / "queue.sqlite"
+
+            results = orchestrate(config, workers=2, queue_path=queue_path, api_url=api_url,
+                                  kinds=[BALLOTPEDIA_STATE, BALLOTPEDIA_SOURCE])
+            assert results["scrape"] == "ran" and results["publish"] == "ran"
+
+            with WorkQueue(queue_path) as queue:
+                counts = queue.counts()
+                kinds = {kind for kind, _, _ in queue.results()}
+            assert counts[DONE] >= 3 and counts[FAILED] == 0, counts
+            assert kinds == {BALLOTPEDIA_STATE, BALLOTPEDIA_SOURCE}
+
+            single = ElectionScraper(logistics_csv=LOGISTICS_CSV, parse_workers=0, cycle="2026",
+                                     ballotpedia_client=BallotpediaClient(api_url=api_url))
+            expected = merge_records((state, record) for _, state, record in single.iter_records(["ballotpedia"]))
+            single.close()
+            scraped = read_json(build_artifact(config, "scraped.json"))
+            for state_code, record in expected.items():
+                titles = [e["title"] for e in json.loads(json.dumps(record, default=to_json))["elections"]]
+                assert [e["title"] for e in scraped[state_code]["elections"]][:len(titles)] == titles
+            assert Path(config["publish_targets"][0]).exists()
+    finally:
+        server.shutdown()
+
+    print("✅ Queued scrape built and published")
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Running Work Queue Tests\n")
+
+    tests = [test_claims_are_exclusive, test_leases_and_retries, test_orchestrated_scrape]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
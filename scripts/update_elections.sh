@@ -1,7 +1,9 @@
 #!/bin/bash
 
 # Election Data Update Script
-# This script updates the election data by running the web scraper
+# This script updates the election data by running the build pipeline.
+# Only stale steps rerun: the CSVs are re-parsed when they change, and the
+# scrape reruns once its last result is more than a day old.
 
 echo "🗳️  Starting Election Data Update..."
 
@@ -25,16 +27,24 @@ if [ ! -d "venv" ]; then
 fi
 
 source venv/bin/activate
-pip install -r requirements.txt --quiet
 
-# Run the scraper
-echo "🕷️  Running election scraper..."
-python run_scraper.py
+# Only reinstall when requirements.txt changed since the last install
+REQUIREMENTS_HASH=$(python -c "import hashlib; print(hashlib.sha256(open('requirements.txt', 'rb').read()).hexdigest())")
+REQUIREMENTS_STAMP="venv/.requirements.sha256"
+if [ -f "$REQUIREMENTS_STAMP" ] && [ "$(cat "$REQUIREMENTS_STAMP")" = "$REQUIREMENTS_HASH" ]; then
+    echo "Dependencies up to date"
+else
+    pip install -r requirements.txt --quiet && echo "$REQUIREMENTS_HASH" > "$REQUIREMENTS_STAMP"
+fi
+
+# Run the pipeline (extra arguments such as --force or --dry-run are passed through)
+echo "🕷️  Running election data pipeline..."
+python scripts/pipeline.py --scrape "$@"
 
-# Check if the scraper was successful
+# Check if the pipeline was successful
 if [ $? -eq 0 ]; then
     echo "✅ Election data updated successfully!"
-    echo "📊 You can now view the updated map at: electionstowatch/index.html"
+    echo "📊 You can now view the updated map at: docs/index.html"
 else
     echo "❌ Election data update failed. Check the logs for details."
     exit 1
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Work Queue
+A job queue in a local SQLite file that any number of worker processes can pull
+from. Static sharding (sharding.py) splits work up front, so one shard full of
+slow state sites finishes long after the others; with a queue each worker just
+takes the next job when it is free.
+
+- claim() atomically leases the oldest available job to one worker (inside a
+  BEGIN IMMEDIATE transaction, so two workers never get the same job).
+- A lease expires after lease_seconds unless the worker renews it, so jobs held
+  by a crashed worker go back to the queue.
+- Failed jobs are retried with exponential backoff, up to max_attempts.
+- Results are stored as JSON with the job, for the orchestrator to merge.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+
+from election_model import to_json
+
+BASE_DIR = Path(__file__).parent.parent
+QUEUE_FILE = BASE_DIR / ".cache" / "work_queue.sqlite"
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+LEASE_SECONDS = 600
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    finished REAL,
+    UNIQUE (kind, key)
+);
+CREATE INDEX IF NOT EXISTS jobs_available ON jobs (status, available_at);
+"""
+
+Job = namedtuple("Job", "id kind key payload attempts")
+
+
+def worker_name():
+    """A name for this worker process, unique across machines sharing a queue file."""
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+class WorkQueue:
+    def __init__(self, path=QUEUE_FILE, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS,
+                 retry_backoff=RETRY_BACKOFF):
+        """Open (or create) a queue file.
+
+        Args:
+            path: SQLite database file
+            lease_seconds: How long a claimed job stays with its worker without a renewal
+            max_attempts: Attempts before a job is marked failed
+            retry_backoff: Seconds before the first retry; doubled for each later one
+        """
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Autocommit mode; transactions are opened explicitly where needed
+        self.db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA busy_timeout=30000")
+        self.db.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        """An IMMEDIATE transaction: takes the write lock up front, so claims never race."""
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    def add(self, kind, key, payload=None):
+        """Add a job unless one with the same kind and key exists. Returns True if it was added."""
+        cursor = self.db.execute("INSERT OR IGNORE INTO jobs (kind, key, payload) VALUES (?, ?, ?)",
+                                 (kind, key, json.dumps(payload or {})))
+        return cursor.rowcount == 1
+
+    def add_many(self, jobs):
+        """Add (kind, key, payload) jobs in one transaction. Returns how many were new."""
+        added = 0
+        with self.transaction():
+            for kind, key, payload in jobs:
+                added += self.add(kind, key, payload)
+        return added
+
+    def claim(self, worker=None, kinds=None):
+        """Lease the next available job to a worker.
+
+        Jobs whose lease expired count as a failed attempt and are handed out
+        again, or marked failed once they reach max_attempts.
+
+        Returns:
+            A Job, or None if nothing is available right now
+        """
+        worker = worker or worker_name()
+        now = time.time()
+        kind_filter = ""
+        params = [now, now]
+        if kinds:
+            kind_filter = f" AND kind IN ({', '.join('?' for _ in kinds)})"
+            params += list(kinds)
+
+        with self.transaction():
+            self.db.execute(
+                "UPDATE jobs SET status = ?, error = 'lease expired', lease_owner = NULL, finished = ? "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, now, LEASED, now, self.max_attempts))
+            row = self.db.execute(
+                "SELECT id, kind, key, payload, attempts FROM jobs "
+                "WHERE ((status = 'pending' AND available_at <= ?) OR (status = 'leased' AND lease_expires < ?))"
+                f"{kind_filter} ORDER BY available_at, id LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            self.db.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, lease_expires = ? WHERE id = ?",
+                (LEASED, worker, now + self.lease_seconds, row[0]))
+
+        job_id, kind, key, payload, attempts = row
+        return Job(job_id, kind, key, json.loads(payload), attempts + 1)
+
+    def renew(self, job, worker=None):
+        """Extend a job's lease. Returns False if the worker no longer holds it."""
+        cursor = self.db.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+            (time.time() + self.lease_seconds, job.id, LEASED, worker or worker_name()))
+        return cursor.rowcount == 1
+
+    @contextmanager
+    def keep_leased(self, job, worker=None, interval=None):
+        """Renew a job's lease from a background thread while the block runs."""
+        worker = worker or worker_name()
+        interval = interval or self.lease_seconds / 3
+        stop = threading.Event()
+
+        def renew():
+            # SQLite connections belong to one thread, so the renewer opens its own
+            queue = WorkQueue(self.path, self.lease_seconds, self.max_attempts, self.retry_backoff)
+            try:
+                while not stop.wait(interval):
+                    queue.renew(job, worker)
+            finally:
+                queue.close()
+
+        thread = threading.Thread(target=renew, name=f"lease-{job.id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, job, result=None, worker=None):
+        """Store a job's result and mark it done. Returns False if the worker lost the lease."""
+        cursor = self.db.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_owner = NULL, finished = ? "
+            "WHERE id = ? AND status = ? AND lease_owner = ?",
+            (DONE, json.dumps(result, default=to_json), time.time(), job.id, LEASED, worker or worker_name()))
+        return cursor.rowcount == 1
+
+    def fail(self, job, error, worker=None):
+        """Record a failed attempt: retry later with backoff, or mark the job failed for good."""
+        now = time.time()
+        if job.attempts >= self.max_attempts:
+            status, available_at = FAILED, now
+        else:
+            status, available_at = PENDING, now + self.retry_backoff * 2 ** (job.attempts - 1)
+        cursor = self.db.execute(
+            "UPDATE jobs SET status = ?, available_at = ?, error = ?, lease_owner = NULL, finished = ? "
+            "WHERE id = ? AND status = ? AND lease_owner = ?",
+            (status, available_at, str(error), now if status == FAILED else None, job.id, LEASED,
+             worker or worker_name()))
+        return cursor.rowcount == 1
+
+    def counts(self):
+        """Number of jobs in each status."""
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update(self.db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return counts
+
+    def is_drained(self):
+        """Whether every job is done or has failed for good."""
+        counts = self.counts()
+        return counts[PENDING] == 0 and counts[LEASED] == 0
+
+    def results(self, kind=None):
+        """(kind, key, result) for every finished job, in the order they were added."""
+        query = "SELECT kind, key, result FROM jobs WHERE status = ?"
+        params = [DONE]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        for job_kind, key, result in self.db.execute(query + " ORDER BY id", params):
+            yield job_kind, key, json.loads(result)
+
+    def failures(self):
+        """(kind, key, error) for every job that failed for good."""
+        return self.db.execute("SELECT kind, key, error FROM jobs WHERE status = ? ORDER BY id", (FAILED,)).fetchall()
+
+    def clear(self):
+        """Remove every job, to start a new run."""
+        self.db.execute("DELETE FROM jobs")
+
+    def close(self):
+        """Close the database connection."""
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
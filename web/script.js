@@ -22,7 +22,7 @@
             return `
               <div class="election" style="opacity: 0.7;">
                 <div><strong>${e.title}</strong> <span class="badge ${badgeClass}">${e.chamberImpact}</span></div>
-                <div><small>${e.type} • ${e.date}</small></div>
+                <div><small>${e.type} • ${e.dateDisplay || e.date}</small></div>
                 <div>${e.stakes}</div>
               </div>
             `;
@@ -34,7 +34,7 @@
                 <strong>Elections Are Over</strong><br>
                 <small>The elections in ${s.stateName} have concluded. </small>
               </div>
-              <div style="margin-bottom: 0.5rem;"><small>Register by: ${s.registrationDeadline || '—'} — <a href="${s.registrationWebsite}" target="_blank" rel="noopener">Register</a></small></div>
+              <div style="margin-bottom: 0.5rem;"><small>Register by: ${s.registrationDeadlineDisplay || s.registrationDeadline || '—'} — <a href="${s.registrationWebsite}" target="_blank" rel="noopener">Register</a></small></div>
               ${elections}
             </div>
           `;
@@ -47,7 +47,7 @@
           return `
             <div class="election">
               <div><strong>${e.title}</strong> <span class="badge ${badgeClass}">${e.chamberImpact}</span></div>
-              <div><small>${e.type} • ${e.date}</small></div>
+              <div><small>${e.type} • ${e.dateDisplay || e.date}</small></div>
               <div>${e.stakes}</div>
             </div>
           `;
@@ -55,7 +55,7 @@
         return `
           <div class="state">
             <h3>${s.stateName} (${abbr})</h3>
-            <div><small>Register by: ${s.registrationDeadline} — <a href="${s.registrationWebsite}" target="_blank" rel="noopener">Register</a></small></div>
+            <div><small>Register by: ${s.registrationDeadlineDisplay || s.registrationDeadline} — <a href="${s.registrationWebsite}" target="_blank" rel="noopener">Register</a></small></div>
             ${elections}
           </div>
         `;